@@ -0,0 +1,66 @@
+const API_URL = import.meta.env.VITE_API_URL || ''
+
+export interface TrendChange {
+  keyword: string
+  keyword_id: string
+  source_id: string
+  region: string
+  current_interest: number
+  trend_score: number
+  sparkline_tail: number[]
+  data_points: number
+  last_updated: string
+}
+
+export interface MissionRunChange {
+  id: string
+  mission_id: string
+  run_number: number
+  status: 'PENDING' | 'RUNNING' | 'COMPLETED' | 'FAILED' | 'CANCELLED'
+  keywords_scanned: number
+  keywords_matched: number
+  error_message: string | null
+}
+
+export interface LiveEventHandlers {
+  trends?: (change: TrendChange) => void
+  jobs?: (job: any) => void
+  missions?: (run: MissionRunChange) => void
+  // Too many events were missed while disconnected: reload the data
+  reset?: () => void
+}
+
+/**
+ * Subscribe to live changes from /api/events (server-sent events).
+ * The browser reconnects on its own and resumes from the last event it saw.
+ * Returns a function that closes the stream.
+ */
+export function subscribeToEvents(handlers: LiveEventHandlers): () => void {
+  const topics = (['trends', 'jobs', 'missions'] as const).filter((topic) => handlers[topic])
+  const source = new EventSource(`${API_URL}/api/events?topics=${topics.join(',')}`)
+
+  for (const topic of topics) {
+    source.addEventListener(topic, (event) => {
+      handlers[topic]?.(JSON.parse((event as MessageEvent).data))
+    })
+  }
+  source.addEventListener('reset', () => handlers.reset?.())
+
+  return () => source.close()
+}
+
+/**
+ * Replace the end of a loaded sparkline with the latest points from a trend change.
+ * Positions only line up when both cover the same points (same count, same latest
+ * point); otherwise returns null and the caller should reload the row.
+ */
+export function mergeSparklineTail(
+  sparkline: number[],
+  latestTs: string | undefined,
+  change: TrendChange
+): number[] | null {
+  const tail = change.sparkline_tail
+  if (tail.length >= change.data_points) return tail
+  if (sparkline.length !== change.data_points || latestTs !== change.last_updated) return null
+  return [...sparkline.slice(0, sparkline.length - tail.length), ...tail]
+}
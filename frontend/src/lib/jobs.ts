@@ -0,0 +1,33 @@
+const API_URL = import.meta.env.VITE_API_URL || ''
+
+export interface Job<T = any> {
+  id: string
+  kind: string
+  status: 'pending' | 'running' | 'succeeded' | 'failed' | 'cancelled'
+  progress: { done: number; total: number | null; message: string | null }
+  result: T | null
+  error: string | null
+}
+
+/**
+ * Poll a background job until it finishes.
+ * Resolves with the job's result, or rejects if it failed or was cancelled.
+ */
+export async function waitForJob<T = any>(
+  jobId: string,
+  onProgress?: (job: Job<T>) => void,
+  intervalMs = 1000
+): Promise<T> {
+  while (true) {
+    const response = await fetch(`${API_URL}/api/jobs/${jobId}`)
+    if (!response.ok) throw new Error('Failed to load job')
+    const { job } = (await response.json()) as { job: Job<T> }
+    onProgress?.(job)
+
+    if (job.status === 'succeeded') return job.result as T
+    if (job.status === 'failed' || job.status === 'cancelled') {
+      throw new Error(job.error || `Job ${job.status}`)
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs))
+  }
+}
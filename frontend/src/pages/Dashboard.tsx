@@ -1,4 +1,4 @@
-import { useEffect, useState, useCallback } from 'react'
+import { useEffect, useState, useCallback, useRef } from 'react'
 import { TrendingUp, Target, Activity, Zap, ArrowRight, RefreshCw, Play, Pause, Monitor } from 'lucide-react'
 import { Link } from 'react-router-dom'
 import { StatCard } from '../components/StatCard'
@@ -9,6 +9,7 @@ import type { LogEntry } from '../types/monitor'
 import { supabase } from '../lib/supabase'
 import type { Source } from '../types/database'
 import { cn } from '../lib/utils'
+import { mergeSparklineTail, subscribeToEvents, type TrendChange } from '../lib/events'
 import { useTheme } from '../contexts/ThemeContext'
 
 const API_URL = import.meta.env.VITE_API_URL || ''
@@ -22,6 +23,8 @@ interface TrendingKeyword {
   rankChange: number | null
   sparklineData: number[]
   lastUpdated?: Date
+  // Latest point of sparklineData, when it came from the trend summary
+  latestTs?: string
   isRefreshing?: boolean
 }
 
@@ -36,7 +39,6 @@ export function Dashboard() {
   const [isLiveMonitoring, setIsLiveMonitoring] = useState(false)
   const [lastGlobalRefresh, setLastGlobalRefresh] = useState<Date | null>(null)
   const [refreshingAll, setRefreshingAll] = useState(false)
-  const [currentRefreshIndex, setCurrentRefreshIndex] = useState(-1)
   const { toasts, addToast, dismissToast } = useToasts()
   const [monitorLogs, setMonitorLogs] = useState<LogEntry[]>([])
   const [isMonitorOpen, setIsMonitorOpen] = useState(false)
@@ -129,23 +131,74 @@ export function Dashboard() {
     }
   }, [addToast, addLog, keywords])
 
-  // Refresh all keywords sequentially (to avoid rate limiting)
+  // Refresh all keywords in one batch (the API packs five keywords per Google Trends request)
   const refreshAllKeywords = useCallback(async () => {
     if (refreshingAll || keywords.length === 0) return
 
     setRefreshingAll(true)
-    for (let i = 0; i < keywords.length; i++) {
-      setCurrentRefreshIndex(i)
-      await refreshKeyword(keywords[i].keyword, keywords[i].keyword_id)
-      // Wait 15 seconds between requests to avoid rate limiting
-      if (i < keywords.length - 1) {
-        await new Promise(resolve => setTimeout(resolve, 15000))
+    const startTime = Date.now()
+    addLog('fetch', undefined, `Refreshing ${keywords.length} keywords in one batch...`)
+    setKeywords(prev => prev.map(k => ({ ...k, isRefreshing: true })))
+
+    try {
+      const response = await fetch(`${API_URL}/api/refresh-trends`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ keywords: keywords.map(k => k.keyword), region: 'US' })
+      })
+
+      if (!response.ok) {
+        throw new Error(`Failed to refresh: ${response.statusText}`)
+      }
+
+      const data = await response.json()
+      const duration = Date.now() - startTime
+      const byId = new Map<string, any>(data.trends.map((t: any) => [t.keyword_id, t]))
+
+      for (const trend of data.trends) {
+        const prev = keywords.find(k => k.keyword_id === trend.keyword_id)
+        addLog('success', trend.keyword, 'Successfully fetched and stored data', {
+          currentInterest: trend.current_interest,
+          previousInterest: prev?.currentInterest,
+          trendScore: trend.trend_score,
+          previousTrendScore: prev?.trendScore,
+          dataPoints: trend.data_points,
+          duration
+        })
+      }
+      for (const [keyword, message] of Object.entries(data.errors as Record<string, string>)) {
+        addLog('error', keyword, message, { duration })
       }
+
+      setKeywords(prev => {
+        const updated = prev.map(k => {
+          const trend = byId.get(k.keyword_id)
+          return trend ? {
+            ...k,
+            currentInterest: trend.current_interest,
+            trendScore: trend.trend_score,
+            sparklineData: trend.sparkline,
+            lastUpdated: new Date(),
+            isRefreshing: false
+          } : { ...k, isRefreshing: false }
+        })
+        // Re-sort by trend score and update ranks
+        updated.sort((a, b) => b.trendScore - a.trendScore)
+        updated.forEach((item, index) => { item.rank = index + 1 })
+        return updated
+      })
+
+      addToast('success', `Updated ${data.trends.length} keywords`, `${data.payloads} Google Trends requests`)
+      setLastGlobalRefresh(new Date())
+    } catch (err) {
+      console.error('Error refreshing keywords:', err)
+      addLog('error', undefined, err instanceof Error ? err.message : 'Unknown error', { duration: Date.now() - startTime })
+      addToast('error', 'Failed to refresh keywords', err instanceof Error ? err.message : 'Unknown error')
+      setKeywords(prev => prev.map(k => ({ ...k, isRefreshing: false })))
+    } finally {
+      setRefreshingAll(false)
     }
-    setCurrentRefreshIndex(-1)
-    setRefreshingAll(false)
-    setLastGlobalRefresh(new Date())
-  }, [keywords, refreshingAll, refreshKeyword])
+  }, [keywords, refreshingAll, addLog, addToast])
 
   // Live monitoring effect
   useEffect(() => {
@@ -158,6 +211,76 @@ export function Dashboard() {
     return () => clearInterval(interval)
   }, [isLiveMonitoring, refreshAllKeywords])
 
+  // Latest keywords, for the live event handler
+  const keywordsRef = useRef<TrendingKeyword[]>([])
+  useEffect(() => {
+    keywordsRef.current = keywords
+  }, [keywords])
+
+  // While monitoring, apply trend changes pushed by the API (from any writer,
+  // including mission runs) and log mission run progress
+  useEffect(() => {
+    if (!isLiveMonitoring) return
+    const googleTrendsId = sources.find(s => s.code === 'GOOGLE_TRENDS')?.id
+
+    const updateKeyword = (keywordId: string, fields: Partial<TrendingKeyword>) => {
+      setKeywords(prev => {
+        const updated = prev.map(k => k.keyword_id === keywordId ? { ...k, ...fields } : k)
+        updated.sort((a, b) => b.trendScore - a.trendScore)
+        updated.forEach((item, index) => { item.rank = index + 1 })
+        return updated
+      })
+    }
+
+    const reloadKeyword = async (change: TrendChange) => {
+      const params = new URLSearchParams({ region: change.region, source_id: change.source_id })
+      const response = await fetch(`${API_URL}/api/trends/${change.keyword_id}?${params}`)
+      if (!response.ok) return
+      const trend = await response.json()
+      updateKeyword(change.keyword_id, {
+        currentInterest: trend.current_interest,
+        trendScore: trend.trend_score,
+        sparklineData: trend.sparkline,
+        latestTs: trend.latest_ts,
+        lastUpdated: new Date(trend.latest_ts)
+      })
+    }
+
+    return subscribeToEvents({
+      trends: (change) => {
+        // The dashboard shows Google Trends data for the US
+        if (change.region !== 'US') return
+        if (googleTrendsId && change.source_id !== googleTrendsId) return
+        const current = keywordsRef.current.find(k => k.keyword_id === change.keyword_id)
+        if (!current) return
+
+        const sparklineData = mergeSparklineTail(current.sparklineData, current.latestTs, change)
+        if (sparklineData) {
+          updateKeyword(change.keyword_id, {
+            currentInterest: change.current_interest,
+            trendScore: change.trend_score,
+            sparklineData,
+            latestTs: change.last_updated,
+            lastUpdated: new Date(change.last_updated)
+          })
+        } else {
+          // The sparkline window moved: splicing the tail would misalign it
+          reloadKeyword(change)
+        }
+        addLog('info', change.keyword, `Live update (${change.region})`, {
+          currentInterest: change.current_interest,
+          trendScore: change.trend_score,
+          dataPoints: change.data_points
+        })
+      },
+      missions: (run) => {
+        const type = run.status === 'FAILED' ? 'error' : run.status === 'COMPLETED' ? 'success' : 'info'
+        const counts = run.keywords_scanned ? ` (${run.keywords_matched}/${run.keywords_scanned} keywords matched)` : ''
+        addLog(type, undefined, `Mission run #${run.run_number} ${run.status.toLowerCase()}${counts}`)
+      }
+    })
+  }, [isLiveMonitoring, addLog, sources])
+
   useEffect(() => {
     async function fetchData() {
       try {
@@ -369,7 +492,7 @@ export function Dashboard() {
               )}
             >
               <RefreshCw className={cn("h-4 w-4", refreshingAll && "animate-spin")} />
-              {refreshingAll ? `Refreshing ${currentRefreshIndex + 1}/${keywords.length}...` : 'Refresh All'}
+              {refreshingAll ? `Refreshing ${keywords.length} keywords...` : 'Refresh All'}
             </button>
             {/* Monitor Button */}
             <button
@@ -2,6 +2,7 @@ import { useState, useEffect, useCallback } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { ChevronRight, ChevronDown, Loader2, Search, Layers, Plus, Sparkles, Trash2, X, AlertTriangle, TrendingUp } from 'lucide-react'
 import { cn } from '../lib/utils'
+import { waitForJob } from '../lib/jobs'
 import { useTheme } from '../contexts/ThemeContext'
 
 const API_BASE = import.meta.env.VITE_API_URL || ''
@@ -621,8 +622,11 @@ export function Markets() {
         // Expand top-level nodes by default
         setExpandedNodes(new Set(data.markets.map((m: MarketNode) => m.id)))
       } else {
-        // If no data, try to seed
-        await fetch(`${API_BASE}/api/markets/seed`, { method: 'POST' })
+        // If no data, try to seed (runs as a background job)
+        const seedResponse = await fetch(`${API_BASE}/api/markets/seed`, { method: 'POST' })
+        if (!seedResponse.ok) throw new Error('Failed to seed markets')
+        const { job } = await seedResponse.json()
+        await waitForJob(job.id)
         // Reload after seeding
         const retryResponse = await fetch(`${API_BASE}/api/markets/tree`)
         const retryData = await retryResponse.json()
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react'
 import { Link } from 'react-router-dom'
 import { DollarSign, ExternalLink, TrendingUp, Building2, Plus, Play, X, Loader2, Upload, Youtube, CheckCircle, XCircle, SkipForward, ChevronUp, ChevronDown, ChevronLeft, ChevronRight, Globe, User, Search, Calendar } from 'lucide-react'
 import { cn } from '../lib/utils'
+import { waitForJob } from '../lib/jobs'
 import { useTheme } from '../contexts/ThemeContext'
 
 const API_URL = import.meta.env.VITE_API_URL || ''
@@ -223,7 +224,9 @@ export function Saas() {
       const data = await response.json()
 
       if (response.ok) {
-        setImportResults(data.results)
+        // The import runs as a background job; wait for it to finish
+        const result = await waitForJob(data.job.id)
+        setImportResults(result.results)
         fetchApps()
       } else {
         alert(data.detail || 'Failed to import channel')
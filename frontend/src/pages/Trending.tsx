@@ -1,7 +1,8 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 import { useSearchParams } from 'react-router-dom'
 import { Search, TrendingUp, TrendingDown, Minus, MapPin, ExternalLink, RefreshCw, Loader2 } from 'lucide-react'
 import { cn } from '../lib/utils'
+import { mergeSparklineTail, subscribeToEvents, type TrendChange } from '../lib/events'
 import { useTheme } from '../contexts/ThemeContext'
 
 const API_BASE = import.meta.env.VITE_API_URL || ''
@@ -18,6 +19,10 @@ const regions = [
 interface TrendData {
   keyword: string
   keyword_id: string
+  // Summary row the data was read from (searched keywords have no source_id)
+  region: string
+  source_id?: string
+  latest_ts?: string
   current_interest: number
   trend_score: number
   sparkline: number[]
@@ -65,13 +70,23 @@ export function Trending() {
     setIsLoading(true)
     setError(null)
     try {
-      const response = await fetch(`${API_BASE}/api/trends`)
-      if (!response.ok) throw new Error('Failed to fetch trends')
-      const data = await response.json()
-      setTrends(data.trends || [])
-      if (data.trends?.length > 0) {
-        setSelectedTrend(data.trends[0])
-        setInterestOverTime(convertSparklineToPoints(data.trends[0].sparkline))
+      // The list is paged: follow next_cursor until every trend is loaded
+      const loaded: TrendData[] = []
+      let cursor: string | null = null
+      do {
+        const params = new URLSearchParams({ limit: '500' })
+        if (cursor) params.set('cursor', cursor)
+        const response = await fetch(`${API_BASE}/api/trends?${params}`)
+        if (!response.ok) throw new Error('Failed to fetch trends')
+        const data = await response.json()
+        loaded.push(...(data.trends || []))
+        cursor = data.next_cursor
+      } while (cursor)
+
+      setTrends(loaded)
+      if (loaded.length > 0) {
+        setSelectedTrend(loaded[0])
+        setInterestOverTime(convertSparklineToPoints(loaded[0].sparkline))
       }
     } catch (err: any) {
       setError(err.message)
@@ -105,6 +120,7 @@ export function Trending() {
       const newTrend: TrendData = {
         keyword: data.keyword,
         keyword_id: data.keyword_id,
+        region: selectedRegion,
         current_interest: data.current_interest,
         trend_score: data.trend_score,
         sparkline: data.sparkline,
@@ -136,6 +152,76 @@ export function Trending() {
     fetchAllTrends()
   }, [fetchAllTrends])
 
+  // Latest loaded trends, for the live event handler
+  const trendsRef = useRef<TrendData[]>([])
+  useEffect(() => {
+    trendsRef.current = trends
+  }, [trends])
+
+  // Apply live changes to the loaded trends instead of re-fetching the list
+  useEffect(() => {
+    const sameRow = (a: TrendData, b: TrendData) =>
+      a.keyword_id === b.keyword_id && a.region === b.region
+
+    // Changes for another region or source of a keyword do not touch the row shown
+    const appliesTo = (trend: TrendData, change: TrendChange) =>
+      trend.keyword_id === change.keyword_id &&
+      trend.region === change.region &&
+      (!trend.source_id || trend.source_id === change.source_id)
+
+    const applyChange = (trend: TrendData, change: TrendChange): TrendData | null => {
+      const sparkline = mergeSparklineTail(trend.sparkline, trend.latest_ts, change)
+      if (!sparkline) return null
+      return {
+        ...trend,
+        current_interest: change.current_interest,
+        trend_score: change.trend_score,
+        sparkline,
+        latest_ts: change.last_updated,
+        data_points: change.data_points
+      }
+    }
+
+    const replaceTrend = (updated: TrendData) => {
+      setTrends(prev => prev.map(t => sameRow(t, updated) ? updated : t))
+      setSelectedTrend(prev => {
+        if (!prev || !sameRow(prev, updated)) return prev
+        setInterestOverTime(convertSparklineToPoints(updated.sparkline))
+        return updated
+      })
+    }
+
+    const reloading = new Set<string>()
+    const reloadTrend = async (trend: TrendData) => {
+      const key = `${trend.keyword_id}/${trend.region}`
+      if (!trend.source_id || reloading.has(key)) return
+      reloading.add(key)
+      try {
+        const params = new URLSearchParams({ region: trend.region, source_id: trend.source_id })
+        const response = await fetch(`${API_BASE}/api/trends/${trend.keyword_id}?${params}`)
+        if (response.ok) replaceTrend(await response.json())
+      } finally {
+        reloading.delete(key)
+      }
+    }
+
+    return subscribeToEvents({
+      trends: (change) => {
+        const trend = trendsRef.current.find(t => appliesTo(t, change))
+        if (!trend) return
+        const updated = applyChange(trend, change)
+        if (updated) {
+          replaceTrend(updated)
+        } else {
+          // The sparkline window moved: splicing the tail would misalign it
+          reloadTrend(trend)
+        }
+      },
+      reset: fetchAllTrends
+    })
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [fetchAllTrends])
+
   // Auto-search if query param is provided (only on mount)
   useEffect(() => {
     if (initialQuery) {
@@ -163,6 +249,7 @@ export function Trending() {
           const newTrend: TrendData = {
             keyword: data.keyword,
             keyword_id: data.keyword_id,
+            region: '',
             current_interest: data.current_interest,
             trend_score: data.trend_score,
             sparkline: data.sparkline,
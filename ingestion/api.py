@@ -1,12 +1,21 @@
 """FastAPI backend for live trend refresh and market management."""
 import os
 import json
+import base64
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Optional, List
+from uuid import UUID
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 from openai import OpenAI
 
 # Workaround for pytrends urllib3 compatibility issue
@@ -20,12 +29,64 @@ if not hasattr(urllib3.util.retry.Retry, 'DEFAULT_ALLOWED_METHODS'):
         return original_init(self, *args, **kwargs)
     urllib3.util.retry.Retry.__init__ = patched_init
 
-from pytrends.request import TrendReq
-from supabase import create_client
+from src.config import get_settings
+from src.events import KEEP_ALIVE, TOPICS, ChangeFeed, get_event_hub, sse_frame
+from src.executors import ExecutorBusyError
+from src.fetchers.batching import fetch_packed
+from src.fetchers.cache import get_trends_cache
+from src.fetchers.rate_limit import get_rate_limiter
+from src.fetchers.series import TrendSeries, lttb_indices
+from src.resources import ApiResources
+from src.responses import CompressionMiddleware, FastJSONResponse, json_response
+from src.runners.jobs import FINISHED_STATUSES, JobContext, get_job_runner
+from src.storage.keyword_cache import get_keyword_cache
+from src.storage.write_buffer import get_timeseries_buffer
+from src.utils.lru import LRUCache
+from src.utils.singleflight import SingleFlight
+from src.utils.versions import etag_matches, get_resource_versions
 
 load_dotenv()
 
-app = FastAPI(title="HyperTrending API")
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY") or os.getenv("SUPABASE_SERVICE_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Supabase client, source IDs, pytrends sessions and executors shared by all requests
+resources = ApiResources(SUPABASE_URL, SUPABASE_KEY)
+
+# Endpoints are async and run their blocking work on the executor of the
+# upstream they mostly wait on (trends, llm, youtube, db), so slow imports and
+# LLM calls cannot take the threads cheap reads need. LLM calls made by the
+# YouTube endpoints go through the llm executor with .call(); the short
+# Supabase calls inside any endpoint stay inline on its thread.
+executors = resources.executors
+
+# Long operations (channel import, bulk AI analysis, market seeding) run as
+# background jobs: the endpoint queues one and returns its ID at once
+jobs = get_job_runner()
+
+# Live updates for SSE clients: job changes are published as this process
+# makes them; trend summary and mission run changes (written by any process)
+# are read once per poll by the change feed and fanned out to every client
+hub = get_event_hub()
+jobs.store.add_listener(lambda job: hub.publish("jobs", job, key=job["id"]))
+feed = ChangeFeed.from_settings(hub, lambda: resources.supabase)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources and start the job runner and change feed; stop them at shutdown."""
+    resources.start()
+    get_resource_versions().track(
+        "trends", _trend_summary_position, get_settings().api_trends_position_seconds
+    )
+    jobs.start(retention_seconds=get_settings().job_retention_days * 86400)
+    feed.start()
+    yield
+    feed.stop()
+    jobs.stop()
+    resources.close()
+
+app = FastAPI(title="HyperTrending API", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # CORS for frontend
 app.add_middleware(
@@ -36,21 +97,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY") or os.getenv("SUPABASE_SERVICE_KEY")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Write paths and the cached resources they change. Timeseries writes bump
+# "trends" themselves when the write buffer flushes, and background jobs bump
+# theirs when they end.
+WRITE_VERSIONS = [
+    ("/api/markets", "markets"),
+    ("/api/saas", "saas"),
+]
+
+@app.middleware("http")
+async def bump_versions_on_write(request: Request, call_next):
+    """Invalidate cached GETs after a successful write."""
+    response = await call_next(request)
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        changed = {name for prefix, name in WRITE_VERSIONS if request.url.path.startswith(prefix)}
+        if changed:
+            await run_in_threadpool(get_resource_versions().bump, *changed)
+    return response
+
+# Outermost: compress large bodies (gzip, or Brotli when installed) for slow links
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=get_settings().api_compress_min_bytes,
+    gzip_level=get_settings().api_gzip_level,
+    brotli_quality=get_settings().api_brotli_quality,
+)
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+    """Shed load when an upstream's executor queue is full."""
+    return FastJSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+def not_modified(request: Request, response: Response, *resources: str) -> Optional[Response]:
+    """Stamp a GET with the resources' version, or return a 304 if the client has it.
+
+    Checked before any query, so unchanged polls never reach Supabase.
+    """
+    etag = get_resource_versions().etag(*resources)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
 
 def get_supabase():
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    return resources.supabase
+
+def _trend_summary_position():
+    """Newest keyword_trend_summary change, moved by writers on every host."""
+    rows = get_supabase().rpc("get_trend_summary_position", {}).execute().data or []
+    return rows[0] if rows else None
 
 def get_openai():
     if not OPENAI_API_KEY or OPENAI_API_KEY == "your-openai-api-key-here":
         raise HTTPException(status_code=500, detail="OpenAI API key not configured")
     return OpenAI(api_key=OPENAI_API_KEY)
 
-def get_source_id(supabase, code="GOOGLE_TRENDS"):
-    result = supabase.table("sources").select("id").eq("code", code).single().execute()
-    return result.data["id"] if result.data else None
+def get_source_id(code="GOOGLE_TRENDS"):
+    return resources.source_id(code)
 
 class RefreshResponse(BaseModel):
     keyword: str
@@ -60,99 +164,225 @@ class RefreshResponse(BaseModel):
     data_points: int
     sparkline: list[int]
     last_updated: str
+    # "live": fetched for this request; "fresh": stored data within the
+    # freshness window; "stale": stored data, refreshed in the background
+    freshness: str = "live"
 
 class RefreshRequest(BaseModel):
     keyword: str
     region: str = "US"
+    # Downsample the sparkline to this many points (default: every point)
+    points: Optional[int] = Field(None, ge=3, le=1000)
+    # Always fetch live, ignoring stored data
+    force: bool = False
 
 @app.get("/health")
-def health_check():
-    return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
+async def health_check():
+    return {
+        "status": "ok",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "resources": resources.health(),
+        "events": hub.stats(),
+    }
+
+# Concurrent refreshes of the same keyword/region share one fetch and one write
+_refresh_flight = SingleFlight()
+
+# Keys with a background refresh queued or running
+_revalidating: set[tuple] = set()
+_revalidating_lock = threading.Lock()
+
+# (keyword, region) -> epoch seconds of the Google fetch behind the data this
+# process last stored (a lower bound when the frame came from the trends cache).
+# Set once the rows are written, since keyword_trend_summary only changes then.
+_fetched_at = LRUCache(20000)
+
+# (keyword, region) -> (RefreshResponse, fetched_at) of a refresh whose rows are
+# still in the timeseries write buffer; served instead of the stored summary,
+# which does not reflect the fetch yet
+_unflushed = LRUCache(20000)
 
 @app.post("/api/refresh-trend", response_model=RefreshResponse)
+@executors.trends.offload
 def refresh_trend(request: RefreshRequest):
-    """Fetch fresh Google Trends data for a single keyword."""
-    keyword = request.keyword
-    region = request.region
+    """Get up-to-date Google Trends data for a single keyword.
+
+    Stale-while-revalidate: stored data fetched less than REFRESH_FRESH_SECONDS
+    ago is returned without calling Google; stored data up to
+    REFRESH_STALE_SECONDS old is returned while a background refresh runs (its
+    result reaches /api/events subscribers). Only missing or older data, or
+    ``force``, waits for a live fetch. ``force`` and background refreshes
+    skip the trends cache.
+    """
+    key = (request.keyword.lower().strip(), request.region)
+    result = None
+    if not request.force:
+        result = _stored_trend(request.keyword, request.region)
+    if result is not None and result.freshness == "stale":
+        revalidate_in_background(request.keyword, request.region)
+    if result is None:
+        # A blocking fetch may reuse a frame fetched within the fresh window
+        max_age = 0 if request.force else get_settings().refresh_fresh_seconds
+        result = _refresh_flight.do(
+            key + (max_age,), _refresh_trend, request.keyword, request.region, max_age
+        )
+    if request.points:
+        # The shared result is full resolution; each caller gets its own size
+        result = result.model_copy(
+            update={"sparkline": downsample_sparkline(result.sparkline, request.points)}
+        )
+    return result
+
+def _stored_trend(keyword: str, region: str) -> Optional[RefreshResponse]:
+    """Stored summary for a keyword/region if it is within the stale window.
+
+    One indexed read of keyword_trend_summary. Age is measured from when the
+    data was fetched from Google: this process's own fetch time for the key
+    if it has one, else the row's newest data point (the data cannot have
+    been fetched before it). The row's ``updated_at`` is not used, since
+    rewriting identical points bumps it. A refresh by this process whose rows
+    are not written yet is served from memory instead of the row.
+    """
+    settings = get_settings()
+    if settings.refresh_stale_seconds <= 0:
+        return None
+
+    unflushed = _unflushed.get((keyword.lower().strip(), region))
+    if unflushed is not None:
+        response, fetched_at = unflushed
+        age = time.time() - fetched_at
+        if age > settings.refresh_stale_seconds:
+            return None
+        fresh = age <= settings.refresh_fresh_seconds
+        return response.model_copy(update={"freshness": "fresh" if fresh else "stale"})
+
+    source_id = get_source_id()
+    if not source_id:
+        return None
+
+    try:
+        query = get_supabase().table("keyword_trend_summary").select(
+            "keyword_id, current_interest, trend_score, sparkline, data_points, latest_ts, "
+            "keywords!inner(keyword)"
+        )
+        keyword_id = get_keyword_cache().get(keyword)
+        if keyword_id:
+            query = query.eq("keyword_id", keyword_id)
+        else:
+            query = query.eq("keywords.normalized_keyword", keyword.lower().strip()).eq(
+                "keywords.language", "en"
+            )
+        rows = query.eq("source_id", source_id).eq("region", region).limit(1).execute().data
+    except Exception as e:
+        print(f"Error reading stored trend for {keyword}: {e}")
+        return None
+    if not rows:
+        return None
+
+    row = rows[0]
+    fetched_at = _fetched_at.get((keyword.lower().strip(), region))
+    if fetched_at is not None:
+        fetched = datetime.fromtimestamp(fetched_at, timezone.utc)
+    elif row.get("latest_ts"):
+        fetched = datetime.fromisoformat(str(row["latest_ts"]).replace("Z", "+00:00"))
+    else:
+        return None
+    age = (datetime.now(timezone.utc) - fetched).total_seconds()
+    if age > settings.refresh_stale_seconds:
+        return None
+
+    return RefreshResponse(
+        keyword=row["keywords"]["keyword"],
+        keyword_id=row["keyword_id"],
+        current_interest=row["current_interest"],
+        trend_score=float(row["trend_score"]),
+        data_points=row["data_points"],
+        sparkline=row["sparkline"],
+        last_updated=fetched.isoformat(),
+        freshness="fresh" if age <= settings.refresh_fresh_seconds else "stale",
+    )
+
+def revalidate_in_background(keyword: str, region: str) -> bool:
+    """Queue a live refresh of a keyword on the trends executor, once per key.
+
+    Returns:
+        False if the executor is too busy (the stale data is still served)
+    """
+    key = (keyword.lower().strip(), region)
+    with _revalidating_lock:
+        if key in _revalidating:
+            return True
+        _revalidating.add(key)
+
+    def revalidate():
+        try:
+            # Always from Google: the cached frame may be what is stale
+            _refresh_flight.do(key + (0,), _refresh_trend, keyword, region, 0)
+        except Exception as e:
+            print(f"Background refresh of {keyword} failed: {e}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
 
+    try:
+        executors.trends.submit(revalidate)
+    except ExecutorBusyError:
+        with _revalidating_lock:
+            _revalidating.discard(key)
+        return False
+    return True
+
+def _refresh_trend(keyword: str, region: str, max_age: float = 0) -> RefreshResponse:
+    """Fetch, store and summarize one keyword. Runs once per in-flight key.
+
+    ``max_age`` is the oldest trends cache entry that may stand in for a
+    Google fetch (0 always fetches).
+    """
     try:
         print(f"Refreshing trend for: {keyword}")
-        pytrends = TrendReq(hl='en-US', tz=360)
         supabase = get_supabase()
-        source_id = get_source_id(supabase)
+        source_id = get_source_id()
 
         if not source_id:
             raise HTTPException(status_code=500, detail="Could not find GOOGLE_TRENDS source")
 
-        # Build payload and fetch data
-        pytrends.build_payload([keyword], cat=0, timeframe='now 7-d', geo=region)
-        interest_df = pytrends.interest_over_time()
+        interest_df, fetched_at = _interest_frame([keyword], region, max_age)
 
         if interest_df.empty:
             raise HTTPException(status_code=404, detail=f"No data available for {keyword}")
 
         # Get or create keyword
-        normalized = keyword.lower().strip()
-        result = supabase.table("keywords").select("id").eq("normalized_keyword", normalized).execute()
-
-        if result.data and len(result.data) > 0:
-            keyword_id = result.data[0]["id"]
-            supabase.table("keywords").update({
-                "last_seen_at": datetime.now(timezone.utc).isoformat()
-            }).eq("id", keyword_id).execute()
-        else:
-            insert_result = supabase.table("keywords").insert({
-                "keyword": keyword,
-                "language": "en",
-            }).execute()
-            keyword_id = insert_result.data[0]["id"]
-
-        # Convert dataframe to records
-        interest_data = []
-        for idx, row in interest_df.iterrows():
-            interest_data.append({
-                "date": idx.isoformat(),
-                "value": int(row[keyword]),
-                "isPartial": bool(row.get("isPartial", False))
-            })
+        keyword_id = get_keyword_cache().get_or_create(supabase, keyword)
 
-        # Store timeseries
-        records = []
-        for point in interest_data:
-            records.append({
-                "keyword_id": keyword_id,
-                "source_id": source_id,
-                "region": region,
-                "granularity": "hour",
-                "ts": point["date"],
-                "interest_value": min(100, max(0, int(point["value"]))),
-                "is_partial": point.get("isPartial", False),
-            })
-
-        if records:
-            supabase.table("keyword_timeseries").upsert(
-                records,
-                on_conflict="keyword_id,source_id,region,granularity,ts"
-            ).execute()
+        # Convert dataframe to a columnar series
+        series = TrendSeries.from_frame(interest_df, keyword)
 
         # Calculate stats
-        values = [p["value"] for p in interest_data]
-        current = values[-1] if values else 0
-        baseline = sum(values[:len(values)//2]) / max(1, len(values)//2) if values else 0
-        trend_score = ((current - baseline) / max(1, baseline)) * 100 if baseline > 0 else current
+        current, trend_score = _series_stats(series)
 
         # Return all values for sparkline to show full 7-day trend
-        sparkline = values
+        sparkline = series.values.tolist()
 
-        return RefreshResponse(
+        response = RefreshResponse(
             keyword=keyword,
             keyword_id=keyword_id,
             current_interest=current,
             trend_score=round(trend_score, 1),
-            data_points=len(interest_data),
+            data_points=len(series),
             sparkline=sparkline,
-            last_updated=datetime.now(timezone.utc).isoformat()
+            last_updated=datetime.fromtimestamp(fetched_at, timezone.utc).isoformat()
+        )
+
+        # Store timeseries
+        records = series.to_records(
+            keyword_id=keyword_id,
+            source_id=source_id,
+            region=region,
+            granularity="hour",
         )
+        _store_refreshed(records, region, [(response, fetched_at)])
+
+        return response
 
     except HTTPException:
         raise
@@ -160,39 +390,456 @@ def refresh_trend(request: RefreshRequest):
         print(f"Error refreshing {keyword}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _interest_frame(keywords: list[str], region: str, max_age: Optional[float] = None):
+    """7-day interest_over_time for one payload (up to five keywords).
+
+    Both upstream calls draw from the host-wide rate budget, and the result is
+    served from the shared trends cache when another caller fetched it less
+    than ``max_age`` seconds ago (default: within the cache TTL; 0 always
+    fetches and replaces the cached frame).
+
+    Returns:
+        Tuple of (frame, fetched_at): fetched_at is when Google was called,
+        or the oldest it can be when the frame came from the cache
+    """
+    started = time.time()
+    loaded = False
+
+    def load_interest():
+        nonlocal loaded
+        loaded = True
+        with resources.trends.session() as pytrends:
+            limiter = get_rate_limiter()
+            limiter.acquire()
+            pytrends.build_payload(keywords, cat=0, timeframe='now 7-d', geo=region)
+            limiter.acquire()
+            return pytrends.interest_over_time()
+
+    cache = get_trends_cache()
+    if not cache:
+        return load_interest(), started
+    frame = cache.get_or_load(
+        "interest_over_time", keywords, region, 'now 7-d', 0, load_interest, max_age
+    )
+    if loaded:
+        return frame, started
+    return frame, started - (max_age if max_age is not None else cache.ttl_for('now 7-d'))
+
+class BatchRefreshRequest(BaseModel):
+    keywords: list[str] = Field(..., min_length=1, max_length=100)
+    region: str = "US"
+    # Downsample each sparkline to this many points (default: every point)
+    points: Optional[int] = Field(None, ge=3, le=1000)
+
+class BatchRefreshResponse(BaseModel):
+    trends: list[RefreshResponse]
+    # keyword -> why it could not be refreshed
+    errors: dict[str, str]
+    # Google Trends payloads used (five keywords each)
+    payloads: int
+
+@app.post("/api/refresh-trends", response_model=BatchRefreshResponse)
+@executors.trends.offload
+def refresh_trends(request: BatchRefreshRequest):
+    """Fetch fresh Google Trends data for many keywords at once.
+
+    Keywords are packed five per payload (each rescaled to its own peak, as a
+    single refresh returns it), so a 50-keyword watchlist costs about 10
+    payloads instead of 50. Keywords drowned out by a much more popular one
+    in their payload are fetched again together. All timeseries are written
+    in one batch.
+    """
+    keywords = list({k.lower().strip(): k.strip() for k in request.keywords if k.strip()}.values())
+    if not keywords:
+        raise HTTPException(status_code=400, detail="No keywords given")
+    key = ("batch", tuple(sorted(k.lower() for k in keywords)), request.region)
+    result = _refresh_flight.do(key, _refresh_trends, keywords, request.region)
+    if request.points:
+        result = result.model_copy(
+            update={
+                "trends": [
+                    trend.model_copy(
+                        update={"sparkline": downsample_sparkline(trend.sparkline, request.points)}
+                    )
+                    for trend in result.trends
+                ]
+            }
+        )
+    return result
+
+def _refresh_trends(keywords: list[str], region: str) -> BatchRefreshResponse:
+    """Fetch, store and summarize many keywords. Runs once per in-flight key."""
+    supabase = get_supabase()
+    source_id = get_source_id()
+    if not source_id:
+        raise HTTPException(status_code=500, detail="Could not find GOOGLE_TRENDS source")
+
+    # Frames another caller fetched within the fresh window are reused
+    max_age = get_settings().refresh_fresh_seconds
+    fetched_at: dict[str, float] = {}
+
+    def fetch(payload: list[str]):
+        frame, when = _interest_frame(payload, region, max_age)
+        # A keyword's frame may come from any of its rounds: keep the oldest
+        for keyword in payload:
+            fetched_at[keyword] = min(fetched_at.get(keyword, when), when)
+        return frame
+
+    packed = fetch_packed(keywords, fetch)
+    errors = dict(packed.errors)
+    fetched = [k for k in keywords if k in packed.frames]
+    print(
+        f"Refreshed {len(fetched)}/{len(keywords)} keywords "
+        f"in {packed.payloads} payloads ({region})"
+    )
+
+    try:
+        keyword_ids = get_keyword_cache().get_or_create_many(supabase, fetched)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    trends, records = [], []
+    for keyword in fetched:
+        keyword_id = keyword_ids.get(keyword)
+        if not keyword_id:
+            errors[keyword] = "Could not store keyword"
+            continue
+        series = TrendSeries.from_frame(packed.frames[keyword], keyword)
+        records.extend(
+            series.to_records(
+                keyword_id=keyword_id,
+                source_id=source_id,
+                region=region,
+                granularity="hour",
+            )
+        )
+        current, trend_score = _series_stats(series)
+        trends.append(
+            RefreshResponse(
+                keyword=keyword,
+                keyword_id=keyword_id,
+                current_interest=current,
+                trend_score=round(trend_score, 1),
+                data_points=len(series),
+                sparkline=series.values.tolist(),
+                last_updated=datetime.fromtimestamp(fetched_at[keyword], timezone.utc).isoformat(),
+            )
+        )
+
+    _store_refreshed(records, region, [(trend, fetched_at[trend.keyword]) for trend in trends])
+
+    return BatchRefreshResponse(trends=trends, errors=errors, payloads=packed.payloads)
+
+def _store_refreshed(
+    records: list[dict], region: str, refreshed: list[tuple[RefreshResponse, float]]
+):
+    """Queue refreshed timeseries behind the response, batched with other refreshes.
+
+    Until the rows are written keyword_trend_summary still holds the old
+    values, so the responses are served from memory (see :func:`_stored_trend`)
+    and the fetch time is only recorded for the stored row once they land.
+    """
+    if not records:
+        return
+    keys = [(response.keyword.lower().strip(), region) for response, _ in refreshed]
+    for key, entry in zip(keys, refreshed):
+        _unflushed.put(key, entry)
+
+    def written():
+        for key, entry in zip(keys, refreshed):
+            _fetched_at.put(key, entry[1])
+            # A newer refresh of the key may be waiting for its own write
+            if _unflushed.get(key) is entry:
+                _unflushed.pop(key)
+
+    get_timeseries_buffer().add(records, get_supabase(), on_written=written)
+
+# Downsampled sparklines keyed by (keyword_id, data_points, sparkline hash, points)
+_sparkline_cache = LRUCache(20000)
+
+def downsample_sparkline(
+    values: list[int], points: Optional[int], key: Optional[tuple] = None
+) -> list[int]:
+    """Reduce a sparkline to ``points`` values with LTTB, keeping peaks and dips.
+
+    With a ``key`` (which must identify the values, see :func:`sparkline_key`)
+    the result is cached, so repeated polls of an unchanged page skip the
+    reduction.
+    """
+    if not points or len(values) <= points:
+        return values
+    if key is not None:
+        cached = _sparkline_cache.get(key)
+        if cached is not None:
+            return cached
+    series = np.asarray(values)
+    reduced = series[lttb_indices(series, points)].tolist()
+    if key is not None:
+        _sparkline_cache.put(key, reduced)
+    return reduced
+
+def sparkline_key(row: dict, points: int) -> tuple:
+    """Cache key for a summary row's downsampled sparkline.
+
+    Built from the row itself, so writes by other processes or hosts (which
+    never bump this host's version counters) still change the key.
+    """
+    return (row["keyword_id"], row["data_points"], hash(tuple(row["sparkline"])), points)
+
+def _series_stats(series: TrendSeries) -> tuple[int, float]:
+    """Current interest and trend score (% change vs. first-half average)."""
+    if not series:
+        return 0, 0
+    values = series.values
+    current = int(values[-1])
+    half = len(values) // 2
+    baseline = int(values[:half].sum(dtype=np.int64)) / max(1, half)
+    trend_score = ((current - baseline) / max(1, baseline)) * 100 if baseline > 0 else current
+    return current, trend_score
+
+TREND_SORTS = {"trend_score", "current_interest", "last_seen_at", "data_points"}
+
+def _encode_cursor(sort_value, keyword_id: str) -> str:
+    """Opaque keyset cursor for the row after which the next page starts."""
+    raw = json.dumps([str(sort_value), keyword_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, keyword_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(Decimal(sort_value)), str(UUID(keyword_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @app.get("/api/trends")
-def get_all_trends():
-    """Get all tracked trends with their latest data."""
+@executors.db.offload
+def get_all_trends(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = "trend_score",
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    region: Optional[str] = None,
+    points: Optional[int] = Query(None, ge=3, le=1000),
+):
+    """Get one page of tracked trends with their latest data.
+
+    Sparklines and scores are read from the keyword_trend_summary read model
+    (kept current by triggers on keyword_timeseries) and sorted in the
+    database; pass the returned ``next_cursor`` to fetch the following page.
+    ``points`` downsamples each sparkline (LTTB) to that many values.
+    """
+    if sort not in TREND_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {sorted(TREND_SORTS)}")
+    cached = not_modified(request, response, "trends")
+    if cached:
+        return cached
+
+    params = {
+        "p_region": region,
+        "p_sort": sort,
+        "p_ascending": order == "asc",
+        "p_limit": limit,
+    }
+    if cursor:
+        params["p_after_value"], params["p_after_id"] = _decode_cursor(cursor)
+
     supabase = get_supabase()
+    rows = supabase.rpc("get_trends_page", params).execute().data or []
+    trends = [_trend_item(row, points) for row in rows]
+
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = _encode_cursor(rows[-1]["sort_value"], rows[-1]["keyword_id"])
+
+    return json_response(
+        {"trends": trends, "count": len(trends), "next_cursor": next_cursor}, response
+    )
+
+@app.get("/api/trends/{keyword_id}")
+@executors.db.offload
+def get_trend(
+    keyword_id: UUID,
+    request: Request,
+    response: Response,
+    region: str,
+    source_id: UUID,
+    points: Optional[int] = Query(None, ge=3, le=1000),
+):
+    """Get one keyword's summary row for a region and source, as /api/trends lists it.
+
+    Lets clients reload a row when a live change cannot be applied to it.
+    """
+    cached = not_modified(request, response, "trends")
+    if cached:
+        return cached
+
+    rows = (
+        get_supabase()
+        .table("keyword_trend_summary")
+        .select(
+            "keyword_id, source_id, region, latest_ts, current_interest, trend_score, "
+            "sparkline, data_points, keywords!inner(keyword, last_seen_at)"
+        )
+        .eq("keyword_id", str(keyword_id))
+        .eq("source_id", str(source_id))
+        .eq("region", region)
+        .limit(1)
+        .execute()
+        .data
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="Trend not found")
+
+    row = rows[0]
+    return json_response(_trend_item({**row, **row.pop("keywords")}, points), response)
+
+def _trend_item(row: dict, points: Optional[int]) -> dict:
+    """/api/trends item for a summary row joined with its keyword."""
+    return {
+        "keyword": row["keyword"],
+        "keyword_id": row["keyword_id"],
+        "region": row["region"],
+        "source_id": row["source_id"],
+        "current_interest": row["current_interest"],
+        "trend_score": float(row["trend_score"]),
+        "sparkline": downsample_sparkline(
+            row["sparkline"], points, sparkline_key(row, points) if points else None
+        ),
+        "last_updated": row["last_seen_at"],
+        "latest_ts": row["latest_ts"],
+        "data_points": row["data_points"],
+    }
 
-    # Fetch keywords
-    keywords_result = supabase.table("keywords").select("id, keyword, last_seen_at").order("last_seen_at", desc=True).execute()
-
-    trends = []
-    for kw in keywords_result.data or []:
-        # Get timeseries
-        ts_result = supabase.table("keyword_timeseries").select("ts, interest_value").eq("keyword_id", kw["id"]).order("ts").execute()
-
-        if ts_result.data and len(ts_result.data) > 0:
-            values = [d["interest_value"] for d in ts_result.data]
-            current = values[-1]
-            baseline = sum(values[:len(values)//2]) / max(1, len(values)//2)
-            trend_score = ((current - baseline) / max(1, baseline)) * 100 if baseline > 0 else current
-
-            trends.append({
-                "keyword": kw["keyword"],
-                "keyword_id": kw["id"],
-                "current_interest": current,
-                "trend_score": round(trend_score, 1),
-                "sparkline": values,  # Full 7-day data
-                "last_updated": kw["last_seen_at"],
-                "data_points": len(values)
-            })
 
-    # Sort by trend score
-    trends.sort(key=lambda x: x["trend_score"], reverse=True)
+# ============== LIVE EVENTS ==============
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@app.get("/api/events")
+async def stream_events(request: Request, topics: Optional[str] = None):
+    """Stream live changes as server-sent events, instead of polling full lists.
 
-    return {"trends": trends, "count": len(trends)}
+    Topics (comma-separated, default all):
+    - ``trends``: a keyword summary changed (current interest, trend score,
+      the sparkline's latest points); apply it to the loaded /api/trends rows
+    - ``jobs``: a background job's status or progress changed
+    - ``missions``: a mission run started, progressed or finished
+
+    Clients that reconnect send ``Last-Event-ID`` (browsers do this
+    automatically) and receive the events they missed. A ``reset`` event
+    means too many were missed: reload the data, then keep applying events.
+    """
+    wanted = TOPICS
+    if topics:
+        wanted = tuple(t.strip() for t in topics.split(",") if t.strip())
+        unknown = set(wanted) - set(TOPICS)
+        if unknown or not wanted:
+            raise HTTPException(status_code=400, detail=f"topics must be among {list(TOPICS)}")
+
+    last_event_id = request.headers.get("last-event-id")
+    sub = hub.subscribe(
+        wanted,
+        last_event_id=int(last_event_id) if last_event_id and last_event_id.isdigit() else None,
+    )
+    return StreamingResponse(
+        hub.stream(sub, heartbeat=get_settings().events_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+# ============== BACKGROUND JOBS ==============
+
+# Seconds without a job event before its stream re-reads the job (it may be
+# run by another API process, whose changes are not published here)
+JOB_EVENTS_INTERVAL = 5.0
+
+def submit_job(kind: str, params: dict) -> Response:
+    """Queue a background job and answer 202 with it (200 if an identical one is active)."""
+    job, created = jobs.submit(kind, params)
+    return FastJSONResponse(
+        {"job": job},
+        status_code=202 if created else 200,
+        headers={"Location": f"/api/jobs/{job['id']}"},
+    )
+
+@app.get("/api/jobs")
+@executors.db.offload
+def list_jobs(
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    """List background jobs, newest first."""
+    result = jobs.list_jobs(status=status, kind=kind, limit=limit)
+    return {"jobs": result, "count": len(result), "runner": jobs.stats()}
+
+@app.get("/api/jobs/{job_id}")
+@executors.db.offload
+def get_job(job_id: str):
+    """Get a job's status, progress and (once finished) result."""
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job": job}
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job(job_id: str):
+    """Stream a job's status as server-sent events until it finishes."""
+    # Subscribed before reading the job, so no change in between is missed
+    sub = hub.subscribe(["jobs"], keys=[job_id])
+    job = await run_in_threadpool(jobs.get, job_id)
+    if not job:
+        hub.unsubscribe(sub)
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        current = job
+        try:
+            yield sse_frame("jobs", current)
+            while current["status"] not in FINISHED_STATUSES and not sub.closed:
+                event = await sub.next(JOB_EVENTS_INTERVAL)
+                if event is not None:
+                    current = event.data
+                    yield event.frame
+                    continue
+                # Quiet: the job may be running in another API process
+                latest = await run_in_threadpool(jobs.get, job_id)
+                if latest is None:
+                    return
+                if latest["updated_at"] == current["updated_at"]:
+                    yield KEEP_ALIVE
+                    continue
+                current = latest
+                yield sse_frame("jobs", current)
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post("/api/jobs/{job_id}/cancel")
+@executors.db.offload
+def cancel_job(job_id: str):
+    """Cancel a job; a running job stops after the item it is working on."""
+    job = jobs.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job": job}
+
+@app.post("/api/jobs/{job_id}/resume")
+@executors.db.offload
+def resume_job(job_id: str):
+    """Resume a failed or cancelled job from its last checkpoint."""
+    try:
+        job = jobs.resume(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job": job}
 
 
 # ============== MARKETS CRUD ==============
@@ -223,15 +870,23 @@ class GenerateMarketsRequest(BaseModel):
     exclude: List[str] = []  # Existing market names to exclude
 
 @app.get("/api/markets")
-def get_markets():
+@executors.db.offload
+def get_markets(request: Request, response: Response):
     """Get all markets as a flat list."""
+    cached = not_modified(request, response, "markets")
+    if cached:
+        return cached
     supabase = get_supabase()
     result = supabase.table("markets").select("*").order("sort_order").execute()
-    return {"markets": result.data or [], "count": len(result.data or [])}
+    return json_response({"markets": result.data or [], "count": len(result.data or [])}, response)
 
 @app.get("/api/markets/tree")
-def get_markets_tree():
+@executors.db.offload
+def get_markets_tree(request: Request, response: Response):
     """Get all markets as a hierarchical tree."""
+    cached = not_modified(request, response, "markets")
+    if cached:
+        return cached
     supabase = get_supabase()
     result = supabase.table("markets").select("*").eq("is_active", True).order("sort_order").execute()
 
@@ -247,9 +902,10 @@ def get_markets_tree():
         elif market["parent_id"] in market_map:
             market_map[market["parent_id"]]["children"].append(market_map[market["id"]])
 
-    return {"markets": roots, "total": len(markets)}
+    return json_response({"markets": roots, "total": len(markets)}, response)
 
 @app.post("/api/markets")
+@executors.db.offload
 def create_market(market: MarketCreate):
     """Create a new market."""
     supabase = get_supabase()
@@ -280,6 +936,7 @@ def create_market(market: MarketCreate):
     return {"market": result.data[0] if result.data else None}
 
 @app.put("/api/markets/{market_id}")
+@executors.db.offload
 def update_market(market_id: str, market: MarketUpdate):
     """Update an existing market."""
     supabase = get_supabase()
@@ -291,6 +948,7 @@ def update_market(market_id: str, market: MarketUpdate):
     return {"market": result.data[0] if result.data else None}
 
 @app.delete("/api/markets/{market_id}")
+@executors.db.offload
 def delete_market(market_id: str):
     """Delete a market and all its children (cascade)."""
     supabase = get_supabase()
@@ -300,6 +958,7 @@ def delete_market(market_id: str):
     return {"success": True, "deleted_id": market_id}
 
 @app.post("/api/markets/bulk")
+@executors.db.offload
 def create_markets_bulk(markets: List[MarketCreate]):
     """Create multiple markets at once."""
     supabase = get_supabase()
@@ -328,6 +987,7 @@ def create_markets_bulk(markets: List[MarketCreate]):
 # ============== AI GENERATION ==============
 
 @app.post("/api/ai/generate-niches")
+@executors.llm.offload
 def generate_niches(request: GenerateNichesRequest):
     """Generate sub-niche ideas using OpenAI."""
     client = get_openai()
@@ -386,6 +1046,7 @@ Do not include any other text, just the JSON array."""
         raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
 
 @app.post("/api/ai/generate-markets")
+@executors.llm.offload
 def generate_markets(request: GenerateMarketsRequest):
     """Generate new top-level market ideas using OpenAI."""
     client = get_openai()
@@ -440,14 +1101,23 @@ Do not include any other text, just the JSON array."""
 
 
 @app.post("/api/markets/seed")
+@executors.db.offload
 def seed_markets():
+    """Seed the markets table in a background job (poll /api/jobs/{job_id})."""
+    return submit_job("markets_seed", {})
+
+@jobs.register("markets_seed", bumps=("markets",))
+def run_markets_seed(ctx: JobContext):
     """Seed the markets table with initial data from the static JSON."""
     supabase = get_supabase()
+    # Node index path -> market ID, so a resumed seed skips what it inserted
+    inserted = ctx.checkpoint.setdefault("inserted", {})
 
-    # Check if already seeded
-    existing = supabase.table("markets").select("id").limit(1).execute()
-    if existing.data:
-        return {"message": "Markets already seeded", "count": 0}
+    # Check if already seeded (unless this is a resumed seed)
+    if not inserted:
+        existing = supabase.table("markets").select("id").limit(1).execute()
+        if existing.data:
+            return {"message": "Markets already seeded", "count": 0}
 
     MARKET_DATA = {
         "name": "The 3 Core Markets",
@@ -691,30 +1361,39 @@ def seed_markets():
         ]
     }
 
-    def insert_node(node, parent_id=None, sort_order=0):
-        slug = node["name"].lower().replace(" ", "-").replace("&", "and")
-        slug = "".join(c for c in slug if c.isalnum() or c == "-")
+    def count_nodes(node):
+        return 1 + sum(count_nodes(child) for child in node.get("children", []))
 
-        data = {
-            "name": node["name"],
-            "slug": slug,
-            "parent_id": parent_id,
-            "sort_order": sort_order,
-        }
+    def insert_node(node, path, parent_id=None, sort_order=0):
+        node_id = inserted.get(path)
+        if node_id is None:
+            slug = node["name"].lower().replace(" ", "-").replace("&", "and")
+            slug = "".join(c for c in slug if c.isalnum() or c == "-")
 
-        result = supabase.table("markets").insert(data).execute()
-        node_id = result.data[0]["id"] if result.data else None
+            data = {
+                "name": node["name"],
+                "slug": slug,
+                "parent_id": parent_id,
+                "sort_order": sort_order,
+            }
+
+            result = supabase.table("markets").insert(data).execute()
+            node_id = result.data[0]["id"] if result.data else None
+            if node_id:
+                inserted[path] = node_id
+            ctx.progress(done=len(inserted), message=node["name"])
 
         count = 1
         if node.get("children") and node_id:
             for i, child in enumerate(node["children"]):
-                count += insert_node(child, node_id, i)
+                count += insert_node(child, f"{path}.{i}", node_id, i)
 
         return count
 
+    ctx.progress(total=sum(count_nodes(child) for child in MARKET_DATA["children"]))
     total = 0
     for i, child in enumerate(MARKET_DATA["children"]):
-        total += insert_node(child, None, i)
+        total += insert_node(child, str(i), None, i)
 
     return {"message": "Markets seeded successfully", "count": total}
 
@@ -749,7 +1428,14 @@ class ChannelImportRequest(BaseModel):
     analyze: bool = True  # Whether to analyze transcripts with AI
 
 @app.post("/api/saas/reanalyze-all")
+@executors.db.offload
 def reanalyze_all_saas():
+    """Re-analyze SaaS apps with null MRR in a background job (poll /api/jobs/{job_id})."""
+    get_openai()  # Fail now if OpenAI is not configured
+    return submit_job("saas_reanalyze", {})
+
+@jobs.register("saas_reanalyze", bumps=("saas",))
+def run_reanalyze_all_saas(ctx: JobContext):
     """Re-analyze all SaaS apps that have null MRR, extracting from titles."""
     import re
 
@@ -760,8 +1446,13 @@ def reanalyze_all_saas():
     result = supabase.table("saas_apps").select("*").is_("mrr", "null").execute()
     apps = result.data or []
 
-    updated = []
-    failed = []
+    # Apps handled by an earlier attempt are skipped when resuming
+    processed = ctx.checkpoint.setdefault("processed", [])
+    updated = ctx.checkpoint.setdefault("updated", [])
+    failed = ctx.checkpoint.setdefault("failed", [])
+    done_ids = set(processed)
+    apps = [app for app in apps if app.get("id") not in done_ids]
+    ctx.progress(done=len(processed), total=len(processed) + len(apps))
 
     for app in apps:
         title = app.get("youtube_title") or app.get("name") or ""
@@ -812,7 +1503,8 @@ Return JSON: {{"name": "string or null", "mrr": number or null, "category": "str
 
 Title: {title}
 """
-            response = openai_client.chat.completions.create(
+            response = executors.llm.call(
+                openai_client.chat.completions.create,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Extract business info from video titles. Return valid JSON."},
@@ -851,6 +1543,9 @@ Title: {title}
                 "error": str(e)
             })
 
+        processed.append(app_id)
+        ctx.progress(done=len(processed), message=title)
+
     return {
         "message": "Re-analysis complete",
         "updated": len(updated),
@@ -863,7 +1558,14 @@ Title: {title}
 
 
 @app.post("/api/saas/extract-niches")
+@executors.db.offload
 def extract_niches_from_transcripts():
+    """Extract niches for apps missing one in a background job (poll /api/jobs/{job_id})."""
+    get_openai()  # Fail now if OpenAI is not configured
+    return submit_job("saas_extract_niches", {})
+
+@jobs.register("saas_extract_niches", bumps=("saas",))
+def run_extract_niches(ctx: JobContext):
     """Extract niche information from transcripts for all apps missing niche."""
     supabase = get_supabase()
     openai_client = get_openai()
@@ -872,8 +1574,13 @@ def extract_niches_from_transcripts():
     result = supabase.table("saas_apps").select("id, slug, name, youtube_title, youtube_transcript, description").is_("niche", "null").not_.is_("youtube_transcript", "null").execute()
     apps = result.data or []
 
-    updated = []
-    failed = []
+    # Apps handled by an earlier attempt are skipped when resuming
+    processed = ctx.checkpoint.setdefault("processed", [])
+    updated = ctx.checkpoint.setdefault("updated", [])
+    failed = ctx.checkpoint.setdefault("failed", [])
+    done_ids = set(processed)
+    apps = [app for app in apps if app.get("id") not in done_ids]
+    ctx.progress(done=len(processed), total=len(processed) + len(apps))
 
     for app in apps:
         transcript = app.get("youtube_transcript", "")
@@ -910,7 +1617,8 @@ What is the specific NICHE or target market for this business? Examples of niche
 
 Return JSON: {{"niche": "string - the specific industry/market served, or null if general-purpose"}}
 """
-            response = openai_client.chat.completions.create(
+            response = executors.llm.call(
+                openai_client.chat.completions.create,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Extract the target niche/market from business descriptions. Return valid JSON."},
@@ -935,6 +1643,9 @@ Return JSON: {{"niche": "string - the specific industry/market served, or null i
                 "error": str(e)
             })
 
+        processed.append(app_id)
+        ctx.progress(done=len(processed), message=title)
+
     return {
         "message": "Niche extraction complete",
         "updated": len(updated),
@@ -947,6 +1658,7 @@ Return JSON: {{"niche": "string - the specific industry/market served, or null i
 
 
 @app.post("/api/saas/init-table")
+@executors.db.offload
 def init_saas_table():
     """Initialize the saas_apps table if it doesn't exist."""
     supabase = get_supabase()
@@ -1007,6 +1719,7 @@ def init_saas_table():
         raise HTTPException(status_code=500, detail=f"Database error: {error_msg}")
 
 @app.post("/api/saas/add-niche-column")
+@executors.db.offload
 def add_niche_column():
     """Add niche column to saas_apps table if it doesn't exist."""
     try:
@@ -1023,13 +1736,18 @@ def add_niche_column():
         }
 
 @app.get("/api/saas")
-def get_all_saas():
+@executors.db.offload
+def get_all_saas(request: Request, response: Response):
     """Get all SaaS apps."""
+    cached = not_modified(request, response, "saas")
+    if cached:
+        return cached
     supabase = get_supabase()
     result = supabase.table("saas_apps").select("*").eq("is_active", True).order("mrr", desc=True).execute()
-    return {"apps": result.data or [], "count": len(result.data or [])}
+    return json_response({"apps": result.data or [], "count": len(result.data or [])}, response)
 
 @app.get("/api/saas/{slug}")
+@executors.db.offload
 def get_saas_by_slug(slug: str):
     """Get a single SaaS app by slug."""
     supabase = get_supabase()
@@ -1039,6 +1757,7 @@ def get_saas_by_slug(slug: str):
     return result.data
 
 @app.post("/api/saas")
+@executors.db.offload
 def create_saas(saas: SaasCreate):
     """Create a new SaaS app."""
     supabase = get_supabase()
@@ -1060,6 +1779,7 @@ def create_saas(saas: SaasCreate):
     return result.data[0] if result.data else None
 
 @app.put("/api/saas/{slug}")
+@executors.db.offload
 def update_saas(slug: str, saas: SaasUpdate):
     """Update a SaaS app."""
     supabase = get_supabase()
@@ -1074,6 +1794,7 @@ def update_saas(slug: str, saas: SaasUpdate):
     return result.data[0]
 
 @app.delete("/api/saas/{slug}")
+@executors.db.offload
 def delete_saas(slug: str):
     """Soft delete a SaaS app."""
     supabase = get_supabase()
@@ -1083,6 +1804,7 @@ def delete_saas(slug: str):
     return {"message": "SaaS app deleted"}
 
 @app.post("/api/saas/{slug}/fetch-transcript")
+@executors.youtube.offload
 def fetch_youtube_transcript(slug: str):
     """Fetch YouTube transcript for a SaaS app."""
     supabase = get_supabase()
@@ -1120,6 +1842,7 @@ def fetch_youtube_transcript(slug: str):
         raise HTTPException(status_code=500, detail=f"Failed to fetch transcript: {str(e)}")
 
 @app.post("/api/saas/{slug}/extract-info")
+@executors.llm.offload
 def extract_saas_info(slug: str):
     """Use AI to extract SaaS info from the YouTube transcript."""
     supabase = get_supabase()
@@ -1209,6 +1932,7 @@ Transcript:
         raise HTTPException(status_code=500, detail=f"Failed to extract info: {str(e)}")
 
 @app.post("/api/saas/import-from-youtube")
+@executors.youtube.offload
 def import_saas_from_youtube(request: FetchTranscriptRequest):
     """Import a new SaaS app from a YouTube video ID."""
     supabase = get_supabase()
@@ -1259,7 +1983,8 @@ Transcript:
 {transcript_text[:6000]}
 """
 
-        response = openai_client.chat.completions.create(
+        response = executors.llm.call(
+            openai_client.chat.completions.create,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "Extract business info from this Starter Story transcript. Return valid JSON."},
@@ -1298,35 +2023,44 @@ Transcript:
         raise HTTPException(status_code=500, detail=f"Failed to import: {str(e)}")
 
 
+def _parse_channel_url(channel_url: str) -> tuple[Optional[str], Optional[str]]:
+    """Get (channel_id, channel_username) from a YouTube channel URL (None if absent).
+
+    Supports: @username, /channel/ID, /c/customname, /user/username
+    """
+    import re
+
+    channel_id = None
+    channel_username = None
+
+    if "/@" in channel_url:
+        # Handle @username format
+        match = re.search(r'/@([^/\?]+)', channel_url)
+        if match:
+            channel_username = match.group(1)
+    elif "/channel/" in channel_url:
+        match = re.search(r'/channel/([^/\?]+)', channel_url)
+        if match:
+            channel_id = match.group(1)
+    elif "/c/" in channel_url:
+        match = re.search(r'/c/([^/\?]+)', channel_url)
+        if match:
+            channel_username = match.group(1)
+    elif "/user/" in channel_url:
+        match = re.search(r'/user/([^/\?]+)', channel_url)
+        if match:
+            channel_username = match.group(1)
+
+    return channel_id, channel_username
+
 @app.get("/api/channel/videos")
+@executors.youtube.offload
 def get_channel_videos(channel_url: str, limit: int = 100):
     """Fetch video list from a YouTube channel URL."""
     import scrapetube
-    import re
 
     try:
-        # Extract channel identifier from URL
-        # Supports: @username, /channel/ID, /c/customname, /user/username
-        channel_id = None
-        channel_username = None
-
-        if "/@" in channel_url:
-            # Handle @username format
-            match = re.search(r'/@([^/\?]+)', channel_url)
-            if match:
-                channel_username = match.group(1)
-        elif "/channel/" in channel_url:
-            match = re.search(r'/channel/([^/\?]+)', channel_url)
-            if match:
-                channel_id = match.group(1)
-        elif "/c/" in channel_url:
-            match = re.search(r'/c/([^/\?]+)', channel_url)
-            if match:
-                channel_username = match.group(1)
-        elif "/user/" in channel_url:
-            match = re.search(r'/user/([^/\?]+)', channel_url)
-            if match:
-                channel_username = match.group(1)
+        channel_id, channel_username = _parse_channel_url(channel_url)
 
         if not channel_id and not channel_username:
             raise HTTPException(status_code=400, detail="Could not parse channel URL. Use format: https://www.youtube.com/@channelname")
@@ -1361,138 +2095,125 @@ def get_channel_videos(channel_url: str, limit: int = 100):
 
 
 @app.post("/api/channel/import")
+@executors.db.offload
 def import_channel_videos(request: ChannelImportRequest):
+    """Import a YouTube channel's videos in a background job (poll /api/jobs/{job_id})."""
+    channel_id, channel_username = _parse_channel_url(request.channel_url)
+    if not channel_id and not channel_username:
+        raise HTTPException(status_code=400, detail="Could not parse channel URL")
+    return submit_job("channel_import", request.model_dump())
+
+@jobs.register("channel_import", bumps=("saas",))
+def run_channel_import(ctx: JobContext):
     """Import all videos from a YouTube channel."""
     import scrapetube
     import re
     from youtube_transcript_api import YouTubeTranscriptApi
 
+    request = ChannelImportRequest(**ctx.params)
     supabase = get_supabase()
+    channel_id, channel_username = _parse_channel_url(request.channel_url)
 
-    try:
-        # Extract channel identifier
-        channel_id = None
-        channel_username = None
-
-        if "/@" in request.channel_url:
-            match = re.search(r'/@([^/\?]+)', request.channel_url)
-            if match:
-                channel_username = match.group(1)
-        elif "/channel/" in request.channel_url:
-            match = re.search(r'/channel/([^/\?]+)', request.channel_url)
-            if match:
-                channel_id = match.group(1)
-        elif "/c/" in request.channel_url:
-            match = re.search(r'/c/([^/\?]+)', request.channel_url)
-            if match:
-                channel_username = match.group(1)
-        elif "/user/" in request.channel_url:
-            match = re.search(r'/user/([^/\?]+)', request.channel_url)
-            if match:
-                channel_username = match.group(1)
+    # Fetch videos
+    def list_videos():
+        if channel_username:
+            return list(
+                scrapetube.get_channel(channel_username=channel_username, limit=request.limit)
+            )
+        return list(scrapetube.get_channel(channel_id=channel_id, limit=request.limit))
 
-        if not channel_id and not channel_username:
-            raise HTTPException(status_code=400, detail="Could not parse channel URL")
+    videos = executors.youtube.call(list_videos)
 
-        # Fetch videos
-        if channel_username:
-            videos = scrapetube.get_channel(channel_username=channel_username, limit=request.limit)
-        else:
-            videos = scrapetube.get_channel(channel_id=channel_id, limit=request.limit)
+    # Results and handled videos are checkpointed, so a resumed import skips them
+    results = ctx.checkpoint.setdefault("results", {"imported": [], "skipped": [], "failed": []})
+    processed = ctx.checkpoint.setdefault("processed", [])
+    done_ids = set(processed)
+    remaining = [v for v in videos if v.get("videoId") and v["videoId"] not in done_ids]
+    ctx.progress(done=len(processed), total=len(processed) + len(remaining))
 
-        results = {
-            "imported": [],
-            "skipped": [],
-            "failed": []
-        }
+    openai_client = None
+    if request.analyze:
+        try:
+            openai_client = get_openai()
+        except:
+            pass
+
+    def import_video(video_id, title):
+        # Check if already exists
+        existing = supabase.table("saas_apps").select("slug").eq("youtube_video_id", video_id).execute()
+        if existing.data:
+            results["skipped"].append({
+                "video_id": video_id,
+                "title": title,
+                "reason": "Already imported"
+            })
+            return
 
-        openai_client = None
-        if request.analyze:
+        try:
+            # Fetch transcript
+            transcript_text = None
             try:
-                openai_client = get_openai()
-            except:
-                pass
+                transcript_list = executors.youtube.call(
+                    YouTubeTranscriptApi.get_transcript, video_id
+                )
+                transcript_text = "\n".join([entry["text"] for entry in transcript_list])
+            except Exception as e:
+                print(f"No transcript for {video_id}: {e}")
 
-        for video in videos:
-            video_id = video.get("videoId")
-            title = video.get("title", {}).get("runs", [{}])[0].get("text", "Unknown")
+            # Extract MRR from title using regex patterns
+            mrr_from_title = None
+            title_lower = title.lower()
 
-            if not video_id:
-                continue
+            # Pattern: $XXK/month, $XXK/mo, $XX,XXX/month
+            mrr_patterns = [
+                r'\$(\d+(?:,\d+)?)\s*k?\s*/\s*(?:month|mo)\b',  # $30K/month, $30/month
+                r'\$(\d+(?:,\d+)?)\s*k\s*/\s*(?:month|mo)\b',   # $30K/month
+                r'\$(\d+(?:,\d+)?(?:\.\d+)?)\s*m\s*/\s*(?:month|mo)\b',  # $1M/month
+                r'(\d+(?:,\d+)?)\s*k\s*/\s*(?:month|mo)\b',     # 30K/month without $
+                r'\$(\d+(?:,\d+)?)\s*k\s*(?:mrr|arr)\b',        # $100K MRR
+                r'(\d+(?:,\d+)?)\s*k\s*(?:mrr|arr)\b',          # 100K MRR without $
+                r'\$(\d+(?:,\d+)?(?:\.\d+)?)\s*m\s*(?:mrr|arr)\b',  # $1M MRR
+                r'makes?\s*\$(\d+(?:,\d+)?)\s*k\s*/\s*(?:year|yr)\b',  # makes $120K/year -> divide by 12
+            ]
 
-            # Check if already exists
-            existing = supabase.table("saas_apps").select("slug").eq("youtube_video_id", video_id).execute()
-            if existing.data:
-                results["skipped"].append({
-                    "video_id": video_id,
-                    "title": title,
-                    "reason": "Already imported"
-                })
-                continue
+            for pattern in mrr_patterns:
+                match = re.search(pattern, title_lower)
+                if match:
+                    value_str = match.group(1).replace(',', '')
+                    try:
+                        value = float(value_str)
+                        # Check if it's in millions
+                        if 'm' in pattern:
+                            mrr_from_title = int(value * 1000000)
+                        # Check if it's K (thousands)
+                        elif 'k' in pattern.lower() or value < 1000:
+                            mrr_from_title = int(value * 1000)
+                        else:
+                            mrr_from_title = int(value)
+                        # If it's yearly, divide by 12
+                        if 'year' in pattern or 'yr' in pattern:
+                            mrr_from_title = mrr_from_title // 12
+                        break
+                    except:
+                        pass
+
+            # Create entry
+            app_data = {
+                "name": title[:250],
+                "youtube_video_id": video_id,
+                "youtube_title": title,
+                "youtube_transcript": transcript_text,
+                "mrr": mrr_from_title,  # Set MRR from title if found
+            }
 
-            try:
-                # Fetch transcript
-                transcript_text = None
+            # Extract info with AI if transcript available OR analyze title
+            if openai_client and request.analyze:
                 try:
-                    transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-                    transcript_text = "\n".join([entry["text"] for entry in transcript_list])
-                except Exception as e:
-                    print(f"No transcript for {video_id}: {e}")
-
-                # Extract MRR from title using regex patterns
-                mrr_from_title = None
-                title_lower = title.lower()
-
-                # Pattern: $XXK/month, $XXK/mo, $XX,XXX/month
-                mrr_patterns = [
-                    r'\$(\d+(?:,\d+)?)\s*k?\s*/\s*(?:month|mo)\b',  # $30K/month, $30/month
-                    r'\$(\d+(?:,\d+)?)\s*k\s*/\s*(?:month|mo)\b',   # $30K/month
-                    r'\$(\d+(?:,\d+)?(?:\.\d+)?)\s*m\s*/\s*(?:month|mo)\b',  # $1M/month
-                    r'(\d+(?:,\d+)?)\s*k\s*/\s*(?:month|mo)\b',     # 30K/month without $
-                    r'\$(\d+(?:,\d+)?)\s*k\s*(?:mrr|arr)\b',        # $100K MRR
-                    r'(\d+(?:,\d+)?)\s*k\s*(?:mrr|arr)\b',          # 100K MRR without $
-                    r'\$(\d+(?:,\d+)?(?:\.\d+)?)\s*m\s*(?:mrr|arr)\b',  # $1M MRR
-                    r'makes?\s*\$(\d+(?:,\d+)?)\s*k\s*/\s*(?:year|yr)\b',  # makes $120K/year -> divide by 12
-                ]
-
-                for pattern in mrr_patterns:
-                    match = re.search(pattern, title_lower)
-                    if match:
-                        value_str = match.group(1).replace(',', '')
-                        try:
-                            value = float(value_str)
-                            # Check if it's in millions
-                            if 'm' in pattern:
-                                mrr_from_title = int(value * 1000000)
-                            # Check if it's K (thousands)
-                            elif 'k' in pattern.lower() or value < 1000:
-                                mrr_from_title = int(value * 1000)
-                            else:
-                                mrr_from_title = int(value)
-                            # If it's yearly, divide by 12
-                            if 'year' in pattern or 'yr' in pattern:
-                                mrr_from_title = mrr_from_title // 12
-                            break
-                        except:
-                            pass
-
-                # Create entry
-                app_data = {
-                    "name": title[:250],
-                    "youtube_video_id": video_id,
-                    "youtube_title": title,
-                    "youtube_transcript": transcript_text,
-                    "mrr": mrr_from_title,  # Set MRR from title if found
-                }
-
-                # Extract info with AI if transcript available OR analyze title
-                if openai_client and request.analyze:
-                    try:
-                        # Use transcript if available, otherwise use title
-                        content_to_analyze = transcript_text[:5000] if transcript_text else f"Video Title: {title}"
-                        content_type = "transcript" if transcript_text else "title"
+                    # Use transcript if available, otherwise use title
+                    content_to_analyze = transcript_text[:5000] if transcript_text else f"Video Title: {title}"
+                    content_type = "transcript" if transcript_text else "title"
 
-                        prompt = f"""Analyze this YouTube video {content_type}. If it's about a SaaS/software business, extract:
+                    prompt = f"""Analyze this YouTube video {content_type}. If it's about a SaaS/software business, extract:
 
 1. Business name (required) - extract the actual product/company name mentioned, not the video title
 2. Monthly Recurring Revenue (MRR) in dollars - just the number. Parse from mentions like "$30K/month" = 30000, "$100K MRR" = 100000, "$1M/month" = 1000000
@@ -1509,74 +2230,77 @@ Return as JSON:
 {content_type.title()}:
 {content_to_analyze}
 """
-                        response = openai_client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=[
-                                {"role": "system", "content": "Extract business info from transcripts. Return valid JSON."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            response_format={"type": "json_object"}
-                        )
-
-                        extracted = json.loads(response.choices[0].message.content)
-
-                        if extracted.get("is_saas") == False:
-                            results["skipped"].append({
-                                "video_id": video_id,
-                                "title": title,
-                                "reason": "Not a SaaS business video"
-                            })
-                            continue
-
-                        if extracted.get("name"):
-                            app_data["name"] = extracted["name"]
-                        # AI-extracted MRR takes priority over regex-extracted
-                        if extracted.get("mrr"):
-                            app_data["mrr"] = extracted["mrr"]
-                        if extracted.get("description"):
-                            app_data["description"] = extracted["description"]
-                        if extracted.get("website_url"):
-                            app_data["website_url"] = extracted["website_url"]
-                        if extracted.get("founder_name"):
-                            app_data["founder_name"] = extracted["founder_name"]
-                        if extracted.get("category"):
-                            app_data["category"] = extracted["category"]
-
-                    except Exception as e:
-                        print(f"AI extraction failed for {video_id}: {e}")
-
-                result = supabase.table("saas_apps").insert(app_data).execute()
-
-                if result.data:
-                    results["imported"].append({
-                        "video_id": video_id,
-                        "title": title,
-                        "slug": result.data[0].get("slug"),
-                        "mrr": app_data.get("mrr")
-                    })
+                    response = executors.llm.call(
+                        openai_client.chat.completions.create,
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": "Extract business info from transcripts. Return valid JSON."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        response_format={"type": "json_object"}
+                    )
+
+                    extracted = json.loads(response.choices[0].message.content)
+
+                    if extracted.get("is_saas") == False:
+                        results["skipped"].append({
+                            "video_id": video_id,
+                            "title": title,
+                            "reason": "Not a SaaS business video"
+                        })
+                        return
+
+                    if extracted.get("name"):
+                        app_data["name"] = extracted["name"]
+                    # AI-extracted MRR takes priority over regex-extracted
+                    if extracted.get("mrr"):
+                        app_data["mrr"] = extracted["mrr"]
+                    if extracted.get("description"):
+                        app_data["description"] = extracted["description"]
+                    if extracted.get("website_url"):
+                        app_data["website_url"] = extracted["website_url"]
+                    if extracted.get("founder_name"):
+                        app_data["founder_name"] = extracted["founder_name"]
+                    if extracted.get("category"):
+                        app_data["category"] = extracted["category"]
 
-            except Exception as e:
-                results["failed"].append({
+                except Exception as e:
+                    print(f"AI extraction failed for {video_id}: {e}")
+
+            result = supabase.table("saas_apps").insert(app_data).execute()
+
+            if result.data:
+                results["imported"].append({
                     "video_id": video_id,
                     "title": title,
-                    "error": str(e)
+                    "slug": result.data[0].get("slug"),
+                    "mrr": app_data.get("mrr")
                 })
 
-        return {
-            "message": f"Channel import complete",
-            "channel_url": request.channel_url,
-            "summary": {
-                "imported": len(results["imported"]),
-                "skipped": len(results["skipped"]),
-                "failed": len(results["failed"])
-            },
-            "results": results
-        }
+        except Exception as e:
+            results["failed"].append({
+                "video_id": video_id,
+                "title": title,
+                "error": str(e)
+            })
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Channel import failed: {str(e)}")
+    for video in remaining:
+        video_id = video["videoId"]
+        title = video.get("title", {}).get("runs", [{}])[0].get("text", "Unknown")
+        import_video(video_id, title)
+        processed.append(video_id)
+        ctx.progress(done=len(processed), message=title)
+
+    return {
+        "message": f"Channel import complete",
+        "channel_url": request.channel_url,
+        "summary": {
+            "imported": len(results["imported"]),
+            "skipped": len(results["skipped"]),
+            "failed": len(results["failed"])
+        },
+        "results": results
+    }
 
 
 if __name__ == "__main__":
@@ -1,7 +1,5 @@
 """Fetch real Google Trends data and store in Supabase."""
 import os
-import time
-from datetime import datetime, timezone
 from dotenv import load_dotenv
 from supabase import create_client
 import pandas as pd
@@ -20,6 +18,10 @@ if not hasattr(urllib3.util.retry.Retry, 'DEFAULT_ALLOWED_METHODS'):
 
 from pytrends.request import TrendReq
 
+from src.fetchers.rate_limit import get_rate_limiter
+from src.fetchers.series import TrendSeries
+from src.storage.keyword_cache import get_keyword_cache
+
 # Load env
 load_dotenv()
 
@@ -35,38 +37,24 @@ def get_source_id(supabase, code="GOOGLE_TRENDS"):
     return result.data["id"] if result.data else None
 
 def upsert_keyword(supabase, keyword: str, language: str = "en"):
-    """Insert or update keyword and return its ID."""
-    normalized = keyword.lower().strip()
-
-    # Try to find existing
-    result = supabase.table("keywords").select("id").eq("normalized_keyword", normalized).eq("language", language).execute()
-
-    if result.data and len(result.data) > 0:
-        # Update last_seen_at
-        kw_id = result.data[0]["id"]
-        supabase.table("keywords").update({"last_seen_at": datetime.now(timezone.utc).isoformat()}).eq("id", kw_id).execute()
-        return kw_id
-    else:
-        # Insert new
-        insert_result = supabase.table("keywords").insert({
-            "keyword": keyword,
-            "language": language,
-        }).execute()
-        return insert_result.data[0]["id"] if insert_result.data else None
-
-def store_timeseries(supabase, keyword_id: str, source_id: str, interest_data: list, region: str = "GLOBAL", granularity: str = "day"):
+    """Insert or update keyword and return its ID (cached; last_seen_at touches are batched)."""
+    return get_keyword_cache().get_or_create(supabase, keyword, language)
+
+def store_timeseries(
+    supabase,
+    keyword_id: str,
+    source_id: str,
+    series: TrendSeries,
+    region: str = "GLOBAL",
+    granularity: str = "day",
+):
     """Store interest over time data."""
-    records = []
-    for point in interest_data:
-        records.append({
-            "keyword_id": keyword_id,
-            "source_id": source_id,
-            "region": region,
-            "granularity": granularity,
-            "ts": point["date"],
-            "interest_value": min(100, max(0, int(point["value"]))),
-            "is_partial": point.get("isPartial", False),
-        })
+    records = series.to_records(
+        keyword_id=keyword_id,
+        source_id=source_id,
+        region=region,
+        granularity=granularity,
+    )
 
     if records:
         # Upsert to avoid duplicates
@@ -80,6 +68,7 @@ def fetch_and_store_trends(keywords: list, region: str = "US"):
     print(f"Connecting to Supabase...")
     supabase = get_supabase()
     source_id = get_source_id(supabase)
+    get_keyword_cache().warm(supabase)
 
     if not source_id:
         print("ERROR: Could not find GOOGLE_TRENDS source in database")
@@ -88,19 +77,20 @@ def fetch_and_store_trends(keywords: list, region: str = "US"):
     print(f"Source ID: {source_id}")
 
     results = []
+    limiter = get_rate_limiter()
 
     for i, keyword in enumerate(keywords):
-        if i > 0:
-            print(f"  Waiting 15s to avoid rate limit...")
-            time.sleep(15)
-
         print(f"\n[{i+1}/{len(keywords)}] Fetching: {keyword}")
 
         try:
-            # Build payload
+            # Build payload (waits for the shared pytrends budget)
+            waited = limiter.acquire()
+            if waited:
+                print(f"  Waited {waited:.1f}s for rate limit")
             pytrends.build_payload([keyword], cat=0, timeframe='now 7-d', geo=region)
 
             # Get interest over time
+            limiter.acquire()
             interest_df = pytrends.interest_over_time()
 
             if interest_df.empty:
@@ -111,22 +101,19 @@ def fetch_and_store_trends(keywords: list, region: str = "US"):
             keyword_id = upsert_keyword(supabase, keyword)
             print(f"  Keyword ID: {keyword_id}")
 
-            # Convert dataframe to records
-            interest_data = []
-            for idx, row in interest_df.iterrows():
-                interest_data.append({
-                    "date": idx.isoformat(),
-                    "value": int(row[keyword]),
-                    "isPartial": bool(row.get("isPartial", False))
-                })
+            # Convert dataframe to a columnar series
+            series = TrendSeries.from_frame(interest_df, keyword)
 
             # Store timeseries
-            store_timeseries(supabase, keyword_id, source_id, interest_data, region=region, granularity="hour")
+            store_timeseries(
+                supabase, keyword_id, source_id, series, region=region, granularity="hour"
+            )
 
             # Calculate stats
-            values = [p["value"] for p in interest_data]
-            current = values[-1] if values else 0
-            baseline = sum(values[:len(values)//2]) / max(1, len(values)//2) if values else 0
+            values = series.values
+            current = int(values[-1]) if len(values) else 0
+            half = len(values) // 2
+            baseline = int(values[:half].sum()) / max(1, half) if len(values) else 0
             trend_score = ((current - baseline) / max(1, baseline)) * 100 if baseline > 0 else current
 
             results.append({
@@ -135,11 +122,11 @@ def fetch_and_store_trends(keywords: list, region: str = "US"):
                 "current_interest": current,
                 "baseline": round(baseline, 1),
                 "trend_score": round(trend_score, 1),
-                "data_points": len(interest_data),
+                "data_points": len(series),
             })
 
             print(f"  Current: {current}, Baseline: {baseline:.1f}, Trend: {trend_score:+.1f}%")
-            print(f"  Stored {len(interest_data)} data points")
+            print(f"  Stored {len(series)} data points")
 
         except Exception as e:
             print(f"  ERROR: {e}")
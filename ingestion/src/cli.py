@@ -1,18 +1,25 @@
 """CLI for the HyperTrending ingestion service."""
 
 import click
+import json
 import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+import numpy as np
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich import print as rprint
+from rich.markup import escape
 
 from .config import get_settings, SourceCode, REGIONS
-from .fetchers import GoogleTrendsFetcher
+from .fetchers import GoogleTrendsFetcher, TrendSeries, get_trends_cache
 from .storage import SupabaseStorage
-from .runners import MissionRunner
+from .runners import MissionRunner, MissionScheduler
 from .utils import setup_logging
+from .utils.encoding import available_encodings, compress, dumps
 
 console = Console()
 logger = logging.getLogger(__name__)
@@ -124,8 +131,8 @@ def analyze(ctx, keywords: tuple, region: str, timeframe: str):
 
                 if data.timeseries:
                     # Simple sparkline
-                    values = [p.value for p in data.timeseries[-20:]]
-                    sparkline = " ".join(["▁▂▃▄▅▆▇█"[min(7, v // 13)] for v in values])
+                    levels = np.minimum(data.timeseries.values[-20:] // 13, 7)
+                    sparkline = " ".join("▁▂▃▄▅▆▇█"[level] for level in levels.tolist())
                     panel_content.append(f"[bold]Trend:[/bold] {sparkline}")
 
                 if data.related_queries:
@@ -185,6 +192,63 @@ def run(ctx, mission_id: str):
             ))
 
 
+@main.command()
+@click.option(
+    "--all", "include_all", is_flag=True, help="Run every active mission, not only due ones"
+)
+@click.pass_context
+def run_all(ctx, include_all: bool):
+    """Run all due missions, sharing identical upstream requests."""
+    console.print("\n[bold cyan]Running due missions...[/bold cyan]\n")
+
+    runner = MissionRunner()
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Executing missions...", total=None)
+        outcomes = runner.run_missions(due_only=not include_all)
+        progress.update(task, completed=True)
+
+    if not outcomes:
+        console.print("[yellow]No missions due.[/yellow]")
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Mission", style="dim")
+    table.add_column("Result")
+    table.add_column("Matched", justify="right")
+    table.add_column("API Calls", justify="right")
+    table.add_column("Shared", justify="right")
+    table.add_column("Errors", justify="right")
+
+    for mission_id, (success, stats) in outcomes.items():
+        table.add_row(
+            mission_id[:8] + "...",
+            "[green]COMPLETED[/green]" if success else "[red]FAILED[/red]",
+            str(stats.keywords_matched),
+            str(stats.api_calls_made),
+            str(stats.api_calls_shared),
+            str(len(stats.errors)),
+        )
+
+    console.print(table)
+
+
+@main.command()
+@click.option("--workers", "-w", type=int, default=None, help="Missions run at once")
+@click.option("--poll", type=int, default=None, help="Max seconds between queue checks")
+@click.pass_context
+def daemon(ctx, workers: int, poll: int):
+    """Run missions continuously as their next_run_at comes due."""
+    console.print("\n[bold cyan]Starting mission scheduler (Ctrl+C to stop)...[/bold cyan]\n")
+
+    scheduler = MissionScheduler(workers=workers, poll_seconds=poll)
+    scheduler.run_forever()
+
+
 @main.command()
 @click.pass_context
 def missions(ctx):
@@ -370,6 +434,241 @@ def ingest(ctx, region: str, limit: int, timeframe: str):
         ))
 
 
+@main.command()
+@click.option("--keywords", "-k", default=20, help="Synthetic keywords to write")
+@click.option("--points", "-p", default=5000, help="Hourly points per keyword")
+@click.option(
+    "--backend",
+    "-b",
+    "backends",
+    type=click.Choice(["rest", "copy"]),
+    multiple=True,
+    default=("rest", "copy"),
+    help="Backends to benchmark (repeatable)",
+)
+@click.pass_context
+def bench_timeseries(ctx, keywords: int, points: int, backends: tuple):
+    """Benchmark bulk timeseries loads through REST and binary COPY."""
+    console.print(
+        f"\n[bold cyan]Timeseries load benchmark: "
+        f"{keywords} keywords x {points} points[/bold cyan]\n"
+    )
+
+    storage = SupabaseStorage()
+    source_id = storage.get_source_id(SourceCode.GOOGLE_TRENDS)
+    if not source_id:
+        console.print("[red]GOOGLE_TRENDS source not found. Have you deployed the schema?[/red]")
+        return
+
+    keyword_ids = list(storage.upsert_keywords([
+        {"keyword": f"__bench_timeseries__ {i}"} for i in range(keywords)
+    ]).values())
+    if len(keyword_ids) != keywords:
+        console.print("[red]Could not create benchmark keywords.[/red]")
+        return
+
+    # Hourly history ending now, with a repeatable pseudo-random shape
+    rng = np.random.default_rng(0)
+    end = int(time.time()) // 3600 * 3600
+    ts = end - 3600 * np.arange(points, dtype=np.int64)[::-1]
+    series = [TrendSeries(ts=ts, values=rng.integers(0, 101, points)) for _ in keyword_ids]
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Backend", style="cyan")
+    table.add_column("Rows", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Rows/sec", justify="right")
+
+    try:
+        for backend in backends:
+            storage.settings.timeseries_backend = backend
+            # A region per backend, so each run inserts fresh rows
+            items = [
+                (keyword_id, source_id, f"BENCH-{backend.upper()}", "hour", s)
+                for keyword_id, s in zip(keyword_ids, series)
+            ]
+            started = time.perf_counter()
+            try:
+                rows = storage.load_timeseries(items)
+            except RuntimeError as e:
+                console.print(f"[yellow]{backend}: {escape(str(e))}[/yellow]")
+                continue
+            elapsed = time.perf_counter() - started
+            table.add_row(backend, str(rows), f"{elapsed:.2f}", f"{rows / elapsed:,.0f}")
+    finally:
+        storage.delete_keywords(keyword_ids)
+
+    console.print(table)
+
+
+def _encoding_fixtures(rows: int) -> dict:
+    """Synthetic payloads shaped like the API's largest responses."""
+    rng = np.random.default_rng(0)
+    words = [
+        "growth", "users", "revenue", "launch", "pricing", "churn", "founder", "market",
+        "product", "customers", "marketing", "build", "team", "feature", "saas", "month",
+        "the", "and", "we", "to", "a", "of", "it", "that", "our", "for", "with", "on",
+    ]
+    now = datetime(2024, 12, 7, tzinfo=timezone.utc)
+
+    def text(n: int) -> str:
+        return " ".join(words[i] for i in rng.integers(0, len(words), n))
+
+    def stamp(i: int) -> str:
+        return (now - timedelta(hours=i)).isoformat()
+
+    trends = {
+        "trends": [
+            {
+                "keyword": f"{text(2)} {i}",
+                "keyword_id": str(uuid.UUID(int=i + 1)),
+                "current_interest": int(rng.integers(0, 101)),
+                "trend_score": round(float(rng.normal(0, 40)), 1),
+                "sparkline": rng.integers(0, 101, 168).tolist(),
+                "last_updated": stamp(i),
+                "data_points": 168,
+            }
+            for i in range(rows)
+        ],
+        "count": rows,
+        "next_cursor": None,
+    }
+
+    def market(i: int, level: int, children: list) -> dict:
+        return {
+            "id": str(uuid.UUID(int=10_000 + i)),
+            "parent_id": None if level == 0 else str(uuid.UUID(int=10_000 + i // 8)),
+            "name": text(3).title(),
+            "slug": text(3).replace(" ", "-"),
+            "level": level,
+            "path": "/".join(str(n) for n in range(level + 1)),
+            "description": text(25),
+            "icon": "chart",
+            "color": "#6366f1",
+            "sort_order": i,
+            "is_active": True,
+            "metadata": {"source": "seed", "keywords": [text(2) for _ in range(5)]},
+            "created_at": stamp(i),
+            "updated_at": stamp(i),
+            "children": children,
+        }
+
+    # Three levels, eight children each (rows roots spread over the top level)
+    tree_roots = max(1, rows // 73)
+    markets = {
+        "markets": [
+            market(r, 0, [
+                market(r * 64 + c, 1, [market(r * 512 + c * 8 + g, 2, []) for g in range(8)])
+                for c in range(8)
+            ])
+            for r in range(tree_roots)
+        ],
+        "total": tree_roots * 73,
+    }
+
+    saas = {
+        "apps": [
+            {
+                "id": str(uuid.UUID(int=100_000 + i)),
+                "name": text(2).title(),
+                "slug": f"{text(2).replace(' ', '-')}-{i}",
+                "description": text(60),
+                "mrr": int(rng.integers(1_000, 500_000)),
+                "arr": None,
+                "revenue_verified": bool(i % 2),
+                "revenue_date": stamp(i),
+                "website_url": f"https://example-{i}.com",
+                "founder_name": text(2).title(),
+                "founder_twitter": None,
+                "founded_date": "2021-06-01",
+                "employee_count": int(rng.integers(1, 50)),
+                "category": "Productivity",
+                "youtube_video_id": f"vid{i:08d}",
+                "youtube_title": text(10),
+                "youtube_description": text(80),
+                "youtube_transcript": text(1500),
+                "youtube_published_at": stamp(i),
+                "tech_stack": ["React", "Node.js", "Postgres"],
+                "business_model": "Subscription",
+                "target_market": text(8),
+                "key_metrics": {"customers": int(rng.integers(10, 10_000)), "churn": 0.03},
+                "created_at": stamp(i),
+                "updated_at": stamp(i),
+                "is_active": True,
+            }
+            for i in range(rows // 4)
+        ],
+        "count": rows // 4,
+    }
+
+    return {"/api/trends": trends, "/api/markets/tree": markets, "/api/saas": saas}
+
+
+@main.command()
+@click.option("--rows", "-r", default=500, help="Trend rows (the other payloads scale with it)")
+@click.option("--repeat", "-n", default=20, help="Encodes per measurement")
+@click.pass_context
+def bench_encoding(ctx, rows: int, repeat: int):
+    """Benchmark API response encoding and compression on realistic payloads."""
+    console.print(f"\n[bold cyan]Response encoding benchmark ({rows} trend rows)[/bold cyan]\n")
+
+    try:
+        from fastapi.encoders import jsonable_encoder
+    except ImportError:
+        jsonable_encoder = None
+
+    def stdlib(content) -> bytes:
+        # What FastAPI does for a returned dict: jsonable_encoder, then json.dumps
+        if jsonable_encoder is not None:
+            content = jsonable_encoder(content)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+
+    def timed(fn, *args) -> tuple[float, bytes]:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = fn(*args)
+        return (time.perf_counter() - started) / repeat * 1000, result
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Payload", style="cyan")
+    table.add_column("Encoder")
+    table.add_column("Encode ms", justify="right")
+    table.add_column("Bytes", justify="right")
+    for encoding in available_encodings():
+        table.add_column(f"{encoding} ms", justify="right")
+        table.add_column(f"{encoding} bytes", justify="right")
+
+    settings = get_settings()
+    for path, payload in _encoding_fixtures(rows).items():
+        for name, encoder in [("json", stdlib), ("orjson", dumps)]:
+            encode_ms, body = timed(encoder, payload)
+            cells = [path, name, f"{encode_ms:.2f}", f"{len(body):,}"]
+            # Compression is independent of the encoder; measure it once per payload
+            if name == "orjson":
+                for encoding in available_encodings():
+                    compress_ms, compressed = timed(
+                        compress,
+                        body,
+                        encoding,
+                        settings.api_gzip_level,
+                        settings.api_brotli_quality,
+                    )
+                    cells += [f"{compress_ms:.2f}", f"{len(compressed):,}"]
+            else:
+                cells += ["", ""] * len(available_encodings())
+            table.add_row(*cells)
+
+    console.print(table)
+    if jsonable_encoder is None:
+        console.print(
+            "[yellow]FastAPI not installed: the json row skips jsonable_encoder.[/yellow]"
+        )
+    if "br" not in available_encodings():
+        console.print("[dim]Install brotli to include Brotli results.[/dim]")
+
+
 # -----------------------------------------------------------------------------
 # Info Commands
 # -----------------------------------------------------------------------------
@@ -405,6 +704,45 @@ def regions(ctx):
     console.print(table)
 
 
+@main.command()
+@click.option("--clear", is_flag=True, help="Delete all cached responses")
+@click.option("--purge", is_flag=True, help="Delete expired responses")
+@click.pass_context
+def cache(ctx, clear: bool, purge: bool):
+    """Show Google Trends response cache statistics."""
+    console.print("\n[bold cyan]Trends Cache[/bold cyan]\n")
+
+    trends_cache = get_trends_cache()
+    if trends_cache is None:
+        console.print("[yellow]Caching is disabled (TRENDS_CACHE_ENABLED=false).[/yellow]")
+        return
+
+    if clear:
+        trends_cache.clear()
+        console.print("[green]Cache cleared.[/green]")
+    elif purge:
+        removed = trends_cache.purge_expired()
+        console.print(f"[green]Purged {removed} expired entries.[/green]")
+
+    stats = trends_cache.stats()
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+
+    table.add_row("Path", trends_cache.path)
+    table.add_row("Entries", str(stats.entries))
+    max_mib = trends_cache.max_bytes // (1024 * 1024)
+    table.add_row("Size", f"{stats.bytes / 1024:.1f} KiB / {max_mib} MiB")
+    table.add_row("Hits", str(stats.hits))
+    table.add_row("Misses", str(stats.misses))
+    table.add_row("Hit rate", f"{stats.hit_rate:.1%}")
+    table.add_row("Expirations", str(stats.expirations))
+    table.add_row("Evictions", str(stats.evictions))
+
+    console.print(table)
+
+
 @main.command()
 @click.pass_context
 def status(ctx):
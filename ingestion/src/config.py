@@ -22,6 +22,91 @@ class Settings(BaseSettings):
     # Rate limiting
     pytrends_requests_per_minute: int = Field(10, env="PYTRENDS_REQUESTS_PER_MINUTE")
     pytrends_retry_delay_seconds: int = Field(60, env="PYTRENDS_RETRY_DELAY_SECONDS")
+    pytrends_burst: int = Field(3, env="PYTRENDS_BURST")
+    pytrends_max_concurrency: int = Field(4, env="PYTRENDS_MAX_CONCURRENCY")
+    pytrends_shared_rate_limit: bool = Field(True, env="PYTRENDS_SHARED_RATE_LIMIT")
+    pytrends_rate_limit_path: Optional[str] = Field(None, env="PYTRENDS_RATE_LIMIT_PATH")
+
+    # Google Trends response cache
+    trends_cache_enabled: bool = Field(True, env="TRENDS_CACHE_ENABLED")
+    trends_cache_path: Optional[str] = Field(None, env="TRENDS_CACHE_PATH")
+    trends_cache_max_mb: int = Field(256, env="TRENDS_CACHE_MAX_MB")
+
+    # API process resources
+    supabase_max_connections: int = Field(20, env="SUPABASE_MAX_CONNECTIONS")
+    trends_session_pool_size: int = Field(2, env="TRENDS_SESSION_POOL_SIZE")
+    trends_session_max_age_seconds: int = Field(1800, env="TRENDS_SESSION_MAX_AGE_SECONDS")
+    trends_session_max_uses: int = Field(100, env="TRENDS_SESSION_MAX_USES")
+
+    # API executors per upstream: worker threads and how many calls may wait for one
+    api_trends_workers: int = Field(4, env="API_TRENDS_WORKERS")
+    api_trends_queue: int = Field(16, env="API_TRENDS_QUEUE")
+    api_llm_workers: int = Field(8, env="API_LLM_WORKERS")
+    api_llm_queue: int = Field(32, env="API_LLM_QUEUE")
+    api_youtube_workers: int = Field(2, env="API_YOUTUBE_WORKERS")
+    api_youtube_queue: int = Field(4, env="API_YOUTUBE_QUEUE")
+    api_db_workers: int = Field(16, env="API_DB_WORKERS")
+    api_db_queue: int = Field(64, env="API_DB_QUEUE")
+
+    # Background jobs (SQLite store shared by API processes on this host)
+    jobs_path: Optional[str] = Field(None, env="JOBS_PATH")
+    job_workers: int = Field(2, env="JOB_WORKERS")
+    job_max_pending: int = Field(20, env="JOB_MAX_PENDING")
+    job_poll_seconds: float = Field(5.0, env="JOB_POLL_SECONDS")
+    job_retention_days: int = Field(7, env="JOB_RETENTION_DAYS")
+
+    # Stale-while-revalidate for /api/refresh-trend: stored data younger than
+    # the fresh age is returned as is; up to the stale age it is returned while
+    # a background refresh runs; older (or missing) data is fetched live
+    refresh_fresh_seconds: int = Field(300, env="REFRESH_FRESH_SECONDS")
+    refresh_stale_seconds: int = Field(86400, env="REFRESH_STALE_SECONDS")
+
+    # Live events (server-sent events at /api/events)
+    events_poll_seconds: float = Field(2.0, env="EVENTS_POLL_SECONDS")
+    events_heartbeat_seconds: float = Field(15.0, env="EVENTS_HEARTBEAT_SECONDS")
+    events_history: int = Field(1000, env="EVENTS_HISTORY")
+    events_client_queue: int = Field(256, env="EVENTS_CLIENT_QUEUE")
+    events_sparkline_tail: int = Field(24, env="EVENTS_SPARKLINE_TAIL")
+    events_overlap_seconds: float = Field(60.0, env="EVENTS_OVERLAP_SECONDS")
+
+    # HTTP caching (ETag version stamps shared by processes on this host)
+    api_versions_path: Optional[str] = Field(None, env="API_VERSIONS_PATH")
+    api_cache_revalidate_seconds: int = Field(300, env="API_CACHE_REVALIDATE_SECONDS")
+    # Seconds a process reuses the keyword_trend_summary position behind "trends" ETags
+    api_trends_position_seconds: float = Field(2.0, env="API_TRENDS_POSITION_SECONDS")
+
+    # Response compression (bodies below the minimum are sent as is)
+    api_compress_min_bytes: int = Field(1024, env="API_COMPRESS_MIN_BYTES")
+    api_gzip_level: int = Field(5, env="API_GZIP_LEVEL")
+    api_brotli_quality: int = Field(4, env="API_BROTLI_QUALITY")
+
+    # Keyword ID cache
+    keyword_cache_size: int = Field(50000, env="KEYWORD_CACHE_SIZE")
+    keyword_cache_warm_size: int = Field(10000, env="KEYWORD_CACHE_WARM_SIZE")
+    keyword_touch_flush_seconds: int = Field(30, env="KEYWORD_TOUCH_FLUSH_SECONDS")
+    keyword_touch_batch_size: int = Field(200, env="KEYWORD_TOUCH_BATCH_SIZE")
+
+    # Timeseries write-behind buffer
+    timeseries_buffer_enabled: bool = Field(True, env="TIMESERIES_BUFFER_ENABLED")
+    timeseries_buffer_rows: int = Field(5000, env="TIMESERIES_BUFFER_ROWS")
+    timeseries_buffer_seconds: float = Field(5.0, env="TIMESERIES_BUFFER_SECONDS")
+
+    # Timeseries storage backend: "rest" (PostgREST) or "copy" (binary COPY over DATABASE_URL)
+    timeseries_backend: str = Field("rest", env="TIMESERIES_BACKEND")
+    database_url: Optional[str] = Field(None, env="DATABASE_URL")
+    timeseries_copy_batch_rows: int = Field(200000, env="TIMESERIES_COPY_BATCH_ROWS")
+
+    # Mission pipeline
+    mission_region_concurrency: int = Field(4, env="MISSION_REGION_CONCURRENCY")
+    pipeline_queue_size: int = Field(16, env="PIPELINE_QUEUE_SIZE")
+    pipeline_store_batch_size: int = Field(25, env="PIPELINE_STORE_BATCH_SIZE")
+    mission_run_heartbeat_seconds: int = Field(60, env="MISSION_RUN_HEARTBEAT_SECONDS")
+
+    # Scheduler daemon
+    scheduler_workers: int = Field(4, env="SCHEDULER_WORKERS")
+    scheduler_poll_seconds: int = Field(30, env="SCHEDULER_POLL_SECONDS")
+    scheduler_refresh_seconds: int = Field(60, env="SCHEDULER_REFRESH_SECONDS")
+    scheduler_stale_run_minutes: int = Field(10, env="SCHEDULER_STALE_RUN_MINUTES")
 
     # Logging
     log_level: str = Field("INFO", env="LOG_LEVEL")
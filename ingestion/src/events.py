@@ -0,0 +1,474 @@
+"""In-process publish/subscribe for the API's server-sent event streams."""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Iterable, NamedTuple, Optional
+
+from .config import get_settings
+from .utils.encoding import dumps
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("trends", "jobs", "missions")
+
+_NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+# Frame sent when nothing happened for a while, so proxies keep the stream open
+KEEP_ALIVE = b": keep-alive\n\n"
+
+
+class Event(NamedTuple):
+    """A published event and its encoded SSE frame (shared by every subscriber)."""
+
+    id: int
+    topic: str
+    key: Optional[str]
+    data: Any
+    frame: bytes
+
+
+def sse_frame(topic: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    """Encode one server-sent event."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {topic}\ndata: ".encode() + dumps(data) + b"\n\n"
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    """Parse a timestamptz string from PostgREST."""
+    if not value:
+        return None
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class Subscription:
+    """One client's view of the hub: a queue of matching events.
+
+    Created and consumed on the event loop; events published from worker
+    threads are handed over with ``call_soon_threadsafe``.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        topics: frozenset,
+        keys: Optional[frozenset],
+        max_queue: int,
+        last_id: int,
+    ):
+        self.loop = loop
+        self.topics = topics
+        self.keys = keys
+        self.max_queue = max_queue
+        self.last_id = last_id
+        self.closed = False
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def matches(self, event: Event) -> bool:
+        if event.topic not in self.topics:
+            return False
+        return self.keys is None or event.key in self.keys or event.topic == "reset"
+
+    def offer(self, event: Event, replay: bool = False) -> bool:
+        """Queue an event (on the loop thread). Returns False once the subscriber is dropped."""
+        if self.closed:
+            return False
+        if event.id <= self.last_id or not self.matches(event):
+            return True
+        if not replay and self._queue.qsize() >= self.max_queue:
+            # Too far behind: end the stream; the client reconnects with
+            # Last-Event-ID and replays what it missed from the history
+            self.closed = True
+            self._queue.put_nowait(None)
+            return False
+        self.last_id = event.id
+        self._queue.put_nowait(event)
+        return True
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """Wait for the next event; None on timeout or once the subscription is closed."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """Fan events out from the threads that write data to connected SSE clients.
+
+    ``publish`` may be called from any thread. Each event is encoded once and
+    the same frame is queued for every matching subscriber, with a single
+    ``call_soon_threadsafe`` per event loop, so the cost per extra client is
+    a queue append. The last ``history`` events are kept so a client that
+    reconnects with ``Last-Event-ID`` receives what it missed; a client too
+    far behind for that gets a ``reset`` event and should reload its data.
+    """
+
+    def __init__(self, history: int = 1000, max_queue: int = 256):
+        """Initialize the hub.
+
+        Args:
+            history: Events kept for replay on reconnect
+            max_queue: Events a subscriber may fall behind before it is dropped
+        """
+        self.max_queue = max_queue
+        self._history: deque[Event] = deque(maxlen=history)
+        self._subscribers: dict[asyncio.AbstractEventLoop, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._seq = 0
+
+        self.published = 0
+        self.dropped = 0
+
+    # -------------------------------------------------------------------------
+    # Publishing
+    # -------------------------------------------------------------------------
+
+    def publish(self, topic: str, data: Any, key: Optional[str] = None) -> Event:
+        """Publish an event to every subscriber of the topic.
+
+        Args:
+            topic: One of :data:`TOPICS`
+            data: JSON-serializable payload
+            key: Entity the event is about (subscribers may filter on it)
+        """
+        payload = dumps(data)
+        with self._lock:
+            self._seq += 1
+            frame = f"id: {self._seq}\nevent: {topic}\ndata: ".encode() + payload + b"\n\n"
+            event = Event(self._seq, topic, key, data, frame)
+            self._history.append(event)
+            self.published += 1
+            loops = list(self._subscribers)
+
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._deliver, loop, event)
+            except RuntimeError:
+                # Loop closed without unsubscribing (e.g. at shutdown)
+                with self._lock:
+                    self._subscribers.pop(loop, None)
+        return event
+
+    def _deliver(self, loop: asyncio.AbstractEventLoop, event: Event):
+        """Queue an event for a loop's subscribers (runs on that loop)."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(loop, ()))
+        for sub in subscribers:
+            if not sub.offer(event):
+                self.dropped += 1
+                self.unsubscribe(sub)
+
+    # -------------------------------------------------------------------------
+    # Subscribing
+    # -------------------------------------------------------------------------
+
+    def subscribe(
+        self,
+        topics: Iterable[str] = TOPICS,
+        keys: Optional[Iterable[str]] = None,
+        last_event_id: Optional[int] = None,
+    ) -> Subscription:
+        """Subscribe the calling event loop's client to some topics.
+
+        Args:
+            topics: Topics to receive
+            keys: Only events about these keys (default: all)
+            last_event_id: ID of the last event the client saw, to replay from
+
+        Returns:
+            The subscription (pass it to :meth:`unsubscribe` when done)
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            seq = self._seq
+            oldest = self._history[0].id if self._history else seq + 1
+            replay = last_event_id is not None and 0 <= last_event_id <= seq
+            sub = Subscription(
+                loop,
+                frozenset(topics) | {"reset"},
+                frozenset(keys) if keys is not None else None,
+                self.max_queue,
+                last_event_id if replay else seq,
+            )
+            history = [event for event in self._history if event.id > sub.last_id] if replay else []
+            self._subscribers.setdefault(loop, set()).add(sub)
+
+        # The client missed events beyond the history, or saw IDs from a
+        # previous process: it must reload its data
+        if last_event_id is not None and (not replay or last_event_id + 1 < oldest):
+            reset_id = oldest - 1 if replay else seq
+            sub.last_id = reset_id - 1
+            reset = Event(reset_id, "reset", None, {}, sse_frame("reset", {}, reset_id))
+            sub.offer(reset, replay=True)
+        for event in history:
+            sub.offer(event, replay=True)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        """Remove a subscription."""
+        sub.closed = True
+        with self._lock:
+            subscribers = self._subscribers.get(sub.loop)
+            if subscribers is not None:
+                subscribers.discard(sub)
+                if not subscribers:
+                    del self._subscribers[sub.loop]
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Whether any client is listening to a topic."""
+        with self._lock:
+            return any(
+                topic in sub.topics
+                for subscribers in self._subscribers.values()
+                for sub in subscribers
+            )
+
+    async def stream(self, sub: Subscription, heartbeat: float = 15.0) -> AsyncIterator[bytes]:
+        """SSE body for a subscription; unsubscribes when the client goes away.
+
+        Args:
+            sub: Subscription from :meth:`subscribe`
+            heartbeat: Seconds of silence before a keep-alive comment
+        """
+        try:
+            # Ask clients to reconnect after 3s if the connection drops
+            yield b"retry: 3000\n\n"
+            while not sub.closed:
+                event = await sub.next(heartbeat)
+                if event is not None:
+                    yield event.frame
+                elif not sub.closed:
+                    yield KEEP_ALIVE
+        finally:
+            self.unsubscribe(sub)
+
+    def stats(self) -> dict:
+        """Hub counters."""
+        with self._lock:
+            subscribers = sum(len(subs) for subs in self._subscribers.values())
+            last_id = self._seq
+        return {
+            "subscribers": subscribers,
+            "published": self.published,
+            "dropped": self.dropped,
+            "last_event_id": last_id,
+        }
+
+
+@lru_cache()
+def get_event_hub() -> EventHub:
+    """Get the process-wide event hub."""
+    settings = get_settings()
+    return EventHub(history=settings.events_history, max_queue=settings.events_client_queue)
+
+
+# -----------------------------------------------------------------------------
+# Change feed
+# -----------------------------------------------------------------------------
+
+
+class ChangeFeed:
+    """Publish trend summary and mission run changes to the hub.
+
+    Mission runs and most timeseries writes happen in other processes (the
+    CLI and the scheduler daemon), so one background thread per API process
+    reads what changed since its last position and publishes it, instead of
+    every client polling the full trend list. Nothing is read while no
+    client subscribes to a topic; the position is kept, so the feed catches
+    up (one page per poll) when a client connects again.
+
+    Trend changes are read by updated_at, the writing transaction's start
+    time, so each poll re-reads an overlap window behind the newest change
+    seen and skips changes it already published.
+    """
+
+    RUN_FIELDS = (
+        "id, mission_id, run_number, status, started_at, completed_at, duration_ms, "
+        "keywords_scanned, keywords_matched, error_message"
+    )
+
+    def __init__(
+        self,
+        hub: EventHub,
+        supabase: Callable[[], Any],
+        poll_seconds: float = 2.0,
+        sparkline_tail: int = 24,
+        page_size: int = 500,
+        overlap_seconds: float = 60.0,
+    ):
+        """Initialize the feed.
+
+        Args:
+            hub: Hub to publish to
+            supabase: Returns the Supabase client
+            poll_seconds: Seconds between reads while clients are subscribed
+            sparkline_tail: Latest sparkline points sent with each trend change
+            page_size: Most new changes read per topic and poll
+            overlap_seconds: How far behind the newest trend change to re-read
+        """
+        self.hub = hub
+        self.supabase = supabase
+        self.poll_seconds = poll_seconds
+        self.sparkline_tail = sparkline_tail
+        self.page_size = page_size
+
+        self.overlap_seconds = overlap_seconds
+
+        self._trend_started = False
+        self._trend_high: Optional[datetime] = None
+        self._trend_seen: set[tuple[str, str, str, datetime]] = set()
+        self._runs: Optional[dict[str, tuple]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(cls, hub: EventHub, supabase: Callable[[], Any]) -> "ChangeFeed":
+        """Build a feed with the configured poll interval and sparkline tail."""
+        settings = get_settings()
+        return cls(
+            hub,
+            supabase,
+            poll_seconds=settings.events_poll_seconds,
+            sparkline_tail=settings.events_sparkline_tail,
+            overlap_seconds=settings.events_overlap_seconds,
+        )
+
+    def start(self):
+        """Start the polling thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="change-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.poll_seconds):
+            self.poll()
+
+    def poll(self):
+        """Publish the changes since the last poll for topics with subscribers."""
+        if self.hub.has_subscribers("trends"):
+            try:
+                self._poll_trends()
+            except Exception as e:
+                logger.error(f"Error reading trend changes: {e}")
+        if self.hub.has_subscribers("missions"):
+            try:
+                self._poll_runs()
+            except Exception as e:
+                logger.error(f"Error reading mission run changes: {e}")
+
+    def _poll_trends(self):
+        if not self._trend_started:
+            rows = self.supabase().rpc("get_trend_summary_position", {}).execute().data or []
+            # An empty table starts before any possible change
+            self._trend_high = _parse_ts(rows[0]["updated_at"]) if rows else None
+            self._trend_started = True
+            # Changes already in the overlap window are not news to this reader
+            self._read_trend_changes(publish=False)
+            return
+
+        self._read_trend_changes(publish=True)
+
+    def _read_trend_changes(self, publish: bool):
+        """Page through the changes since the overlap window before the newest one seen.
+
+        updated_at is the writing transaction's start time, so a row can
+        become visible after rows with a later updated_at. Re-reading the last
+        ``overlap_seconds`` picks such rows up; rows already seen are skipped
+        by key and updated_at. Pages are read until ``page_size`` rows were
+        new or the feed caught up.
+        """
+        client = self.supabase()
+        start = "-infinity"
+        if self._trend_high is not None:
+            start = (self._trend_high - timedelta(seconds=self.overlap_seconds)).isoformat()
+        after = {
+            "p_after": start,
+            "p_after_keyword_id": _NIL_UUID,
+            "p_after_source_id": _NIL_UUID,
+            "p_after_region": "",
+        }
+
+        fresh = 0
+        while fresh < self.page_size:
+            rows = client.rpc(
+                "get_trend_summary_changes", {**after, "p_limit": self.page_size}
+            ).execute().data or []
+
+            for row in rows:
+                updated_at = _parse_ts(row["updated_at"])
+                seen_key = (row["keyword_id"], row["source_id"], row["region"], updated_at)
+                if seen_key in self._trend_seen:
+                    continue
+                self._trend_seen.add(seen_key)
+                fresh += 1
+                if self._trend_high is None or updated_at > self._trend_high:
+                    self._trend_high = updated_at
+                if publish:
+                    self.hub.publish("trends", self.trend_change(row), key=row["keyword_id"])
+
+            if len(rows) < self.page_size:
+                break
+            last = rows[-1]
+            after = {
+                "p_after": last["updated_at"],
+                "p_after_keyword_id": last["keyword_id"],
+                "p_after_source_id": last["source_id"],
+                "p_after_region": last["region"],
+            }
+
+        # Changes older than the window are never read again
+        if self._trend_high is not None:
+            horizon = self._trend_high - timedelta(seconds=self.overlap_seconds)
+            self._trend_seen = {key for key in self._trend_seen if key[3] >= horizon}
+
+    def trend_change(self, row: dict) -> dict:
+        """Event payload for a changed summary row."""
+        sparkline = row.get("sparkline") or []
+        return {
+            "keyword": row["keyword"],
+            "keyword_id": row["keyword_id"],
+            "source_id": row["source_id"],
+            "region": row["region"],
+            "current_interest": row["current_interest"],
+            "trend_score": round(float(row["trend_score"]), 1),
+            "sparkline_tail": sparkline[-self.sparkline_tail:],
+            "data_points": row["data_points"],
+            "last_updated": row["latest_ts"],
+        }
+
+    def _poll_runs(self):
+        # Active runs, plus runs that finished since shortly before the last poll
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.poll_seconds * 3 + 60)
+        rows = (
+            self.supabase()
+            .table("mission_runs")
+            .select(self.RUN_FIELDS)
+            .or_(f"status.in.(PENDING,RUNNING),completed_at.gte.{since.strftime('%Y-%m-%dT%H:%M:%SZ')}")
+            .order("started_at")
+            .limit(self.page_size)
+            .execute()
+            .data
+            or []
+        )
+
+        seen = {}
+        for row in rows:
+            state = (row["status"], row["keywords_scanned"], row["keywords_matched"])
+            seen[row["id"]] = state
+            # The first read only records where runs are
+            if self._runs is not None and self._runs.get(row["id"]) != state:
+                self.hub.publish("missions", row, key=row["id"])
+        self._runs = seen
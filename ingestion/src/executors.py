@@ -0,0 +1,177 @@
+"""Bounded thread pools for blocking upstream calls made by the API."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from .config import get_settings
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when an executor's queue is full; the API answers 503."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Too many pending {name} requests, try again shortly")
+        self.name = name
+
+
+class BoundedExecutor:
+    """Thread pool for one class of blocking calls, with a queue-depth limit.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a thread; further calls from the event loop are rejected with
+    :class:`ExecutorBusyError` instead of piling up, so a burst of slow requests of
+    one kind (LLM analysis, YouTube scraping) cannot take threads or memory
+    from the others.
+
+    A slot is held until the call finishes, even if the awaiting request was
+    cancelled, so the limits reflect the work actually running.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """Initialize the executor.
+
+        Args:
+            name: Upstream name (thread names, errors and stats)
+            max_workers: Calls run at once
+            max_queue: Calls allowed to wait for a worker before rejecting
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"api-{name}")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._admitted = 0
+
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on this executor and await its result.
+
+        Raises:
+            ExecutorBusyError: If the workers and the queue are all taken
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue a call from any thread without waiting for it.
+
+        Used for background work (e.g. revalidating stale data after the
+        response), which is admitted against the same limits as requests.
+
+        Raises:
+            ExecutorBusyError: If the workers and the queue are all taken
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ExecutorBusyError(self.name)
+        with self._lock:
+            self._admitted += 1
+
+        # Carry context variables over, as Starlette's threadpool does
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, functools.partial(fn, *args, **kwargs))
+        future.add_done_callback(self._release)
+        return future
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a call on this executor from a worker thread of another one, blocking.
+
+        Used for nested upstream calls (an LLM call inside a YouTube import) so
+        they count against this upstream's worker limit. These calls wait for a
+        worker instead of being rejected: they are already bounded by the
+        calling executor's own limits.
+        """
+        return self._pool.submit(fn, *args, **kwargs).result()
+
+    def offload(self, fn: Callable) -> Callable:
+        """Decorate a blocking endpoint so it runs on this executor.
+
+        The wrapper is a coroutine function with the same signature, so
+        FastAPI awaits it on the event loop instead of using its own shared
+        threadpool.
+        """
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await self.run(fn, *args, **kwargs)
+
+        return wrapper
+
+    def _release(self, _future):
+        with self._lock:
+            self._admitted -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        """Executor load and counters."""
+        with self._lock:
+            admitted = self._admitted
+        return {
+            "workers": self.max_workers,
+            "running": min(admitted, self.max_workers),
+            "queued": max(0, admitted - self.max_workers),
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting calls and optionally wait for running ones."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class UpstreamExecutors:
+    """One bounded executor per upstream class the API blocks on.
+
+    Nested :meth:`BoundedExecutor.call` chains must not form a cycle (e.g.
+    ``youtube`` -> ``llm`` is fine as long as ``llm`` never waits on
+    ``youtube``), or the executors could deadlock waiting on each other.
+    """
+
+    def __init__(
+        self,
+        trends: BoundedExecutor,
+        llm: BoundedExecutor,
+        youtube: BoundedExecutor,
+        db: BoundedExecutor,
+    ):
+        self.trends = trends
+        self.llm = llm
+        self.youtube = youtube
+        self.db = db
+
+    @classmethod
+    def from_settings(cls) -> "UpstreamExecutors":
+        """Build the executors with the configured sizes."""
+        settings = get_settings()
+        return cls(
+            trends=BoundedExecutor(
+                "trends", settings.api_trends_workers, settings.api_trends_queue
+            ),
+            llm=BoundedExecutor("llm", settings.api_llm_workers, settings.api_llm_queue),
+            youtube=BoundedExecutor(
+                "youtube", settings.api_youtube_workers, settings.api_youtube_queue
+            ),
+            db=BoundedExecutor("db", settings.api_db_workers, settings.api_db_queue),
+        )
+
+    def all(self) -> list[BoundedExecutor]:
+        """Every executor."""
+        return [self.trends, self.llm, self.youtube, self.db]
+
+    def stats(self) -> dict:
+        """Load and counters per executor."""
+        return {executor.name: executor.stats() for executor in self.all()}
+
+    def shutdown(self, wait: bool = True):
+        """Shut every executor down."""
+        for executor in self.all():
+            executor.shutdown(wait=wait)
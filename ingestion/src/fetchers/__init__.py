@@ -1,6 +1,25 @@
 """Data fetchers for various trend sources."""
 
 from .google_trends import GoogleTrendsFetcher
-from .base import BaseFetcher, TrendData, TimeseriesPoint
+from .async_google_trends import AsyncGoogleTrendsFetcher
+from .base import BaseFetcher, TrendData
+from .series import TimeseriesPoint, TrendSeries
+from .cache import TrendsCache, CacheStats, get_trends_cache
+from .rate_limit import TokenBucket, SharedTokenBucket, get_rate_limiter
+from .session_pool import TrendsSessionPool
 
-__all__ = ["GoogleTrendsFetcher", "BaseFetcher", "TrendData", "TimeseriesPoint"]
+__all__ = [
+    "GoogleTrendsFetcher",
+    "AsyncGoogleTrendsFetcher",
+    "BaseFetcher",
+    "TrendData",
+    "TimeseriesPoint",
+    "TrendSeries",
+    "TokenBucket",
+    "SharedTokenBucket",
+    "get_rate_limiter",
+    "TrendsCache",
+    "CacheStats",
+    "get_trends_cache",
+    "TrendsSessionPool",
+]
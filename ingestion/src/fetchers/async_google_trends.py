@@ -0,0 +1,173 @@
+"""Asyncio fetch engine for Google Trends."""
+
+import asyncio
+import functools
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from ..config import SourceCode, get_settings
+from .base import TrendData
+from .google_trends import GoogleTrendsFetcher
+from .rate_limit import TokenBucket, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGoogleTrendsFetcher:
+    """Run many Google Trends requests in flight under one token budget.
+
+    pytrends clients are stateful (``build_payload`` stores the query on the
+    session), so every in-flight request checks out its own
+    :class:`GoogleTrendsFetcher` from a pool and runs it on a worker thread.
+    All pooled fetchers draw from the same :class:`TokenBucket`, so overlapping
+    round trips never push the request rate above the configured quota.
+
+    Example:
+        async with AsyncGoogleTrendsFetcher() as fetcher:
+            us, gb = await asyncio.gather(
+                fetcher.fetch_trending("US"),
+                fetcher.fetch_trending("GB"),
+            )
+    """
+
+    source_code = SourceCode.GOOGLE_TRENDS
+    TIMEFRAMES = GoogleTrendsFetcher.TIMEFRAMES
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        limiter: Optional[TokenBucket] = None,
+        hl: str = "en-US",
+        tz: int = 360,
+        retries: int = 3,
+    ):
+        """Initialize the async fetcher.
+
+        Args:
+            max_concurrency: Maximum requests in flight (default from settings)
+            limiter: Token bucket shared by all pooled fetchers (default: host-wide)
+            hl: Host language for Google Trends
+            tz: Timezone offset in minutes
+            retries: Number of retries for failed requests
+        """
+        self.settings = get_settings()
+        self.max_concurrency = max_concurrency or self.settings.pytrends_max_concurrency
+        self.limiter = limiter or get_rate_limiter()
+        self.hl = hl
+        self.tz = tz
+        self.retries = retries
+        self._idle: queue.LifoQueue[GoogleTrendsFetcher] = queue.LifoQueue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="pytrends",
+        )
+
+    async def __aenter__(self) -> "AsyncGoogleTrendsFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _checkout(self) -> GoogleTrendsFetcher:
+        """Take an idle fetcher, creating one if the pool is empty.
+
+        The executor never runs more than ``max_concurrency`` jobs, so at most
+        that many fetchers (and pytrends sessions) are ever created.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return GoogleTrendsFetcher(
+                hl=self.hl,
+                tz=self.tz,
+                retries=self.retries,
+                limiter=self.limiter,
+            )
+
+    def _run(self, method: str, args: tuple, kwargs: dict):
+        """Run a fetcher method on the current worker thread."""
+        fetcher = self._checkout()
+        try:
+            return getattr(fetcher, method)(*args, **kwargs)
+        finally:
+            self._idle.put(fetcher)
+
+    async def _call(self, method: str, *args, **kwargs):
+        """Schedule a blocking fetcher call on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(self._run, method, args, kwargs),
+        )
+
+    # -------------------------------------------------------------------------
+    # Fetch API (mirrors GoogleTrendsFetcher)
+    # -------------------------------------------------------------------------
+
+    async def fetch_trending(
+        self,
+        region: str = "US",
+        category: int = 0,
+        limit: int = 20,
+    ) -> list[TrendData]:
+        """Fetch currently trending searches. See GoogleTrendsFetcher.fetch_trending."""
+        return await self._call("fetch_trending", region=region, category=category, limit=limit)
+
+    async def fetch_realtime_trending(
+        self,
+        region: str = "US",
+        category: str = "all",
+        limit: int = 20,
+    ) -> list[TrendData]:
+        """Fetch realtime trending stories. See GoogleTrendsFetcher.fetch_realtime_trending."""
+        return await self._call(
+            "fetch_realtime_trending", region=region, category=category, limit=limit
+        )
+
+    async def fetch_interest_over_time(
+        self,
+        keywords: list[str],
+        region: str = "US",
+        timeframe: str = "7d",
+    ) -> dict[str, TrendData]:
+        """Fetch interest over time. See GoogleTrendsFetcher.fetch_interest_over_time."""
+        return await self._call(
+            "fetch_interest_over_time", keywords=keywords, region=region, timeframe=timeframe
+        )
+
+    async def fetch_related_queries(
+        self,
+        keyword: str,
+        region: str = "US",
+        timeframe: str = "7d",
+    ) -> tuple[list[str], list[dict]]:
+        """Fetch related queries. See GoogleTrendsFetcher.fetch_related_queries."""
+        return await self._call(
+            "fetch_related_queries", keyword=keyword, region=region, timeframe=timeframe
+        )
+
+    async def fetch_interest_by_region(
+        self,
+        keyword: str,
+        region: str = "",
+        resolution: str = "COUNTRY",
+        timeframe: str = "7d",
+    ) -> dict[str, int]:
+        """Fetch interest by sub-region. See GoogleTrendsFetcher.fetch_interest_by_region."""
+        return await self._call(
+            "fetch_interest_by_region",
+            keyword=keyword,
+            region=region,
+            resolution=resolution,
+            timeframe=timeframe,
+        )
+
+    async def fetch_suggestions(self, keyword: str) -> list[dict]:
+        """Get keyword suggestions. See GoogleTrendsFetcher.fetch_suggestions."""
+        return await self._call("fetch_suggestions", keyword)
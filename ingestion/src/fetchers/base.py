@@ -2,19 +2,12 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Optional
 from enum import Enum
 
+import numpy as np
 
-@dataclass
-class TimeseriesPoint:
-    """A single point in a timeseries."""
-
-    timestamp: datetime
-    value: int  # 0-100 interest value
-    is_partial: bool = False
-    metadata: Optional[dict] = None
+from .series import TrendSeries
 
 
 @dataclass
@@ -24,7 +17,7 @@ class TrendData:
     keyword: str
     region: str
     source: str
-    timeseries: list[TimeseriesPoint] = field(default_factory=list)
+    timeseries: TrendSeries = field(default_factory=TrendSeries)
     related_queries: list[str] = field(default_factory=list)
     rising_queries: list[dict] = field(default_factory=list)  # {"query": str, "value": int}
     current_interest: int = 0
@@ -32,6 +25,11 @@ class TrendData:
     trend_score: float = 0.0
     metadata: Optional[dict] = None
 
+    def __post_init__(self):
+        # Accept legacy lists of TimeseriesPoint
+        if not isinstance(self.timeseries, TrendSeries):
+            self.timeseries = TrendSeries.from_points(self.timeseries)
+
     def calculate_trend_score(self) -> float:
         """Calculate trend score based on current vs baseline interest."""
         if self.baseline_interest == 0:
@@ -45,14 +43,14 @@ class TrendData:
         if not self.timeseries:
             return
 
-        values = [p.value for p in self.timeseries]
+        values = self.timeseries.values
 
         # Current interest = latest value
-        self.current_interest = values[-1] if values else 0
+        self.current_interest = int(values[-1])
 
         # Baseline = average of first half of the timeseries
         first_half = values[: len(values) // 2] if len(values) > 1 else values
-        self.baseline_interest = int(sum(first_half) / len(first_half)) if first_half else 0
+        self.baseline_interest = int(first_half.sum(dtype=np.int64)) // len(first_half)
 
         # Calculate trend score
         self.trend_score = self.calculate_trend_score()
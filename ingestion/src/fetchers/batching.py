@@ -0,0 +1,291 @@
+"""Anchor-normalized batching for Google Trends comparisons beyond five keywords.
+
+Google Trends scales every payload to its own 0-100 range, so values from two
+payloads are not comparable. Sharing one anchor keyword between payloads fixes
+that: the anchor's series appears in every batch, and the ratio between its
+appearances gives the factor that maps each batch onto the first batch's scale.
+
+The first payload carries five keywords and picks the anchor; every further
+payload carries the anchor plus four new keywords, so N keywords cost
+``ceil((N - 1) / 4)`` requests.
+
+When each keyword only needs its own series (refreshing a watchlist), no
+anchor is needed: :func:`fetch_packed` puts five keywords in every payload
+and rescales each column to its own peak, as a single-keyword payload would
+return it.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MAX_KEYWORDS_PER_PAYLOAD = 5
+
+
+def unique_keywords(keywords: list[str]) -> list[str]:
+    """Drop duplicate keywords, keeping first-seen order."""
+    return list(dict.fromkeys(keywords))
+
+
+def first_batch(keywords: list[str], anchor: Optional[str] = None) -> list[str]:
+    """Keywords for the first payload, which is used to choose the anchor.
+
+    Args:
+        keywords: All keywords to compare (deduplicated)
+        anchor: Caller-chosen anchor, always included if given
+
+    Returns:
+        Up to five keywords
+    """
+    if anchor is None:
+        return keywords[:MAX_KEYWORDS_PER_PAYLOAD]
+    others = [kw for kw in keywords if kw != anchor]
+    return [anchor] + others[: MAX_KEYWORDS_PER_PAYLOAD - 1]
+
+
+def pick_anchor(
+    frame: Optional[pd.DataFrame],
+    candidates: list[str],
+    preferred: Optional[str] = None,
+) -> Optional[str]:
+    """Choose the anchor from the first payload's response.
+
+    The keyword with the highest mean interest is used unless the caller named
+    one, since a larger anchor series gives a more precise scale factor after
+    Google's integer rounding. Keywords with no interest cannot anchor.
+
+    Args:
+        frame: interest_over_time frame for the first batch
+        candidates: Keywords in the first batch
+        preferred: Caller-chosen anchor
+
+    Returns:
+        Anchor keyword, or None if no keyword in the batch has any interest
+    """
+    if frame is None or frame.empty:
+        return None
+
+    means = {kw: float(frame[kw].mean()) for kw in candidates if kw in frame.columns}
+    if preferred is not None and means.get(preferred, 0.0) > 0:
+        return preferred
+
+    best = max(means, key=means.get, default=None)
+    if best is None or means[best] <= 0:
+        return None
+    return best
+
+
+def anchor_batches(keywords: list[str], anchor: str, done: list[str]) -> list[list[str]]:
+    """Group the keywords not yet fetched into payloads sharing the anchor.
+
+    Args:
+        keywords: All keywords to compare
+        anchor: Anchor keyword included in every batch
+        done: Keywords already fetched (the first batch)
+
+    Returns:
+        List of payloads, each ``[anchor, kw1, ..., kw4]``
+    """
+    fetched = set(done)
+    remaining = [kw for kw in keywords if kw not in fetched and kw != anchor]
+    size = MAX_KEYWORDS_PER_PAYLOAD - 1
+    return [[anchor] + remaining[i : i + size] for i in range(0, len(remaining), size)]
+
+
+def merge_on_anchor(frames: list[pd.DataFrame], anchor: str) -> pd.DataFrame:
+    """Rescale batch frames onto one 0-100 scale using the shared anchor.
+
+    Batches fetched at different times cover shifted windows (cached "now 7-d"
+    frames up to an hour apart, "now 1-H" frames across a minute boundary),
+    so the frames are first cut down to the timestamps they all share. Each
+    batch after the first is then multiplied by
+    ``sum(anchor in first batch) / sum(anchor in this batch)`` over those
+    shared points only, and the combined frame is renormalized so its overall
+    peak is 100, matching what Google would return for a single payload
+    containing every keyword.
+
+    A batch that shares no timestamps with the first, or whose anchor has no
+    interest over the shared points (Google rounded it to zero next to
+    stronger keywords), cannot be scaled, so it is dropped and its keywords
+    are left out of the result.
+
+    Args:
+        frames: interest_over_time frames; the first defines the reference scale
+        anchor: Keyword present in every frame
+
+    Returns:
+        Frame indexed by the timestamps shared by the kept batches, with one
+        int column per keyword (plus ``isPartial`` if present); keywords of
+        dropped batches are missing
+    """
+    def drop(position: int, frame: pd.DataFrame, reason: str):
+        dropped = [c for c in frame.columns if c not in (anchor, "isPartial")]
+        logger.error(f"Batch {position + 1} {reason}; cannot scale {dropped}")
+
+    reference = frames[0]
+    index = reference.index
+    kept = [(0, reference)]
+    for position, frame in enumerate(frames[1:], start=1):
+        shared = index.intersection(frame.index)
+        if shared.empty:
+            drop(position, frame, "shares no timestamps with the first batch")
+            continue
+        index = shared
+        kept.append((position, frame))
+
+    if len(index) < len(reference.index):
+        logger.info(
+            f"Anchored batches share {len(index)} of {len(reference.index)} timestamps; "
+            "trimmed the rest"
+        )
+
+    reference_total = float(reference[anchor].reindex(index).sum())
+    columns: dict[str, pd.Series] = {}
+    for position, frame in kept:
+        frame = frame.reindex(index)
+        factor = 1.0
+        if position > 0:
+            batch_total = float(frame[anchor].sum())
+            if reference_total <= 0 or batch_total <= 0:
+                drop(position, frame, f"has no anchor interest ('{anchor}') on shared points")
+                continue
+            factor = reference_total / batch_total
+
+        for column in frame.columns:
+            if column == "isPartial" or column in columns:
+                continue
+            columns[column] = frame[column].astype(float).fillna(0.0) * factor
+
+    combined = pd.DataFrame(columns, index=index)
+    peak = float(combined.to_numpy().max()) if not combined.empty else 0.0
+    if peak > 0:
+        combined = combined * (100.0 / peak)
+    combined = combined.round().clip(0, 100).astype(int)
+
+    if "isPartial" in reference.columns:
+        combined["isPartial"] = reference["isPartial"].reindex(index).astype(bool)
+
+    return combined
+
+
+# -----------------------------------------------------------------------------
+# Packed payloads (independent series)
+# -----------------------------------------------------------------------------
+
+# Below this peak within a shared payload a keyword keeps too few distinct
+# levels after Google's rounding, so it is fetched again with weaker keywords
+MIN_PACKED_PEAK = 25
+
+# Re-packing rounds for weak keywords before the best series seen is kept
+MAX_PACK_ROUNDS = 3
+
+
+@dataclass
+class PackedResult:
+    """Series fetched by :func:`fetch_packed`."""
+
+    # keyword -> frame with the keyword's column on its own 0-100 scale
+    # (plus ``isPartial`` if present)
+    frames: dict[str, pd.DataFrame] = field(default_factory=dict)
+    # keyword -> reason it has no series
+    errors: dict[str, str] = field(default_factory=dict)
+    # Payloads requested upstream (cache hits included)
+    payloads: int = 0
+
+
+def pack_payloads(keywords: list[str]) -> list[list[str]]:
+    """Split keywords into the fewest payloads of up to five."""
+    size = MAX_KEYWORDS_PER_PAYLOAD
+    return [keywords[i : i + size] for i in range(0, len(keywords), size)]
+
+
+def own_scale(frame: pd.DataFrame, keyword: str) -> pd.DataFrame:
+    """Rescale one keyword's column so its peak is 100.
+
+    Args:
+        frame: interest_over_time frame containing the keyword
+        keyword: Column to keep
+
+    Returns:
+        Frame with the rescaled int column (plus ``isPartial`` if present)
+    """
+    values = frame[keyword].astype(float).fillna(0.0)
+    peak = float(values.max()) if len(values) else 0.0
+    if peak > 0:
+        values = (values * (100.0 / peak)).round().clip(0, 100)
+    scaled = pd.DataFrame({keyword: values.astype(int)}, index=frame.index)
+    if "isPartial" in frame.columns:
+        scaled["isPartial"] = frame["isPartial"].astype(bool)
+    return scaled
+
+
+def fetch_packed(
+    keywords: list[str],
+    load: Callable[[list[str]], Optional[pd.DataFrame]],
+    min_peak: int = MIN_PACKED_PEAK,
+    max_rounds: int = MAX_PACK_ROUNDS,
+) -> PackedResult:
+    """Fetch each keyword's own series, five keywords per payload.
+
+    Google scales a payload to its strongest keyword, so a keyword sharing a
+    payload with a much more popular one comes back flattened (or all
+    zeros). Keywords peaking below ``min_peak`` are packed together again in
+    the next round, where they are compared with each other; the strongest
+    keyword of every payload peaks at 100, so each round settles at least one
+    keyword per payload. After ``max_rounds`` the best series seen is kept;
+    a keyword that stayed at zero in every payload is returned as an all-zero
+    series, as a single-keyword fetch would return it. Only keywords missing
+    from every response (or whose payloads failed) are reported in ``errors``.
+
+    Args:
+        keywords: Keywords to fetch (deduplicated)
+        load: Returns the interest_over_time frame for one payload
+        min_peak: Peak a keyword needs in a shared payload to be accepted
+        max_rounds: Rounds before weak keywords are accepted as they are
+
+    Returns:
+        Frames per keyword, errors per keyword and the payload count
+    """
+    result = PackedResult()
+    best_peaks: dict[str, float] = {}
+    pending = list(keywords)
+
+    for round_number in range(1, max_rounds + 1):
+        weak = []
+        for payload in pack_payloads(pending):
+            result.payloads += 1
+            try:
+                frame = load(payload)
+            except Exception as e:
+                logger.warning(f"Payload {payload} failed: {e}")
+                for keyword in payload:
+                    result.errors.setdefault(keyword, str(e))
+                continue
+
+            for keyword in payload:
+                if frame is None or frame.empty or keyword not in frame.columns:
+                    result.errors.setdefault(keyword, "No data available")
+                    continue
+                peak = float(frame[keyword].max())
+                if keyword not in result.frames or peak > best_peaks[keyword]:
+                    best_peaks[keyword] = peak
+                    result.frames[keyword] = own_scale(frame, keyword)
+                    result.errors.pop(keyword, None)
+                if peak < min_peak and len(payload) > 1:
+                    weak.append(keyword)
+
+        if not weak or round_number == max_rounds:
+            break
+        # Weakest first, so keywords of similar popularity share payloads
+        pending = sorted(weak, key=lambda kw: best_peaks.get(kw, 0.0))
+
+    for keyword in keywords:
+        if keyword in result.frames:
+            result.errors.pop(keyword, None)
+        else:
+            result.errors.setdefault(keyword, "No data available")
+    return result
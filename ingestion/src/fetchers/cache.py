@@ -0,0 +1,363 @@
+"""Persistent cache for parsed Google Trends responses."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from ..config import get_settings
+from ..utils.sqlite import LocalSQLite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Counters for a TrendsCache, aggregated across every process using the file."""
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dict for logging or JSON output."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "bytes": self.bytes,
+        }
+
+
+def _encode(value: Any) -> Any:
+    """Convert pytrends results (frames nested in dicts/lists) to JSON-safe data."""
+    if isinstance(value, pd.DataFrame):
+        index = value.index
+        if isinstance(index, pd.DatetimeIndex):
+            encoded_index = {"kind": "datetime", "values": index.as_unit("ns").asi8.tolist()}
+        else:
+            encoded_index = {"kind": "plain", "values": index.tolist()}
+        encoded_index["name"] = index.name
+        return {
+            "__frame__": True,
+            "index": encoded_index,
+            "columns": value.columns.tolist(),
+            "data": [value[column].tolist() for column in value.columns],
+        }
+    if isinstance(value, dict):
+        return {"__dict__": [[key, _encode(item)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Inverse of :func:`_encode`."""
+    if isinstance(value, dict) and value.get("__frame__"):
+        index_spec = value["index"]
+        if index_spec["kind"] == "datetime":
+            index = pd.DatetimeIndex(pd.to_datetime(index_spec["values"], unit="ns"))
+        else:
+            index = pd.Index(index_spec["values"])
+        index.name = index_spec["name"]
+        columns = value["columns"]
+        frame = pd.DataFrame(dict(zip(range(len(columns)), value["data"])), index=index)
+        frame.columns = columns
+        return frame
+    if isinstance(value, dict) and "__dict__" in value:
+        return {key: _decode(item) for key, item in value["__dict__"]}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+class TrendsCache:
+    """Disk-backed cache of Google Trends responses keyed by query.
+
+    Entries are keyed by (kind, keywords, geo, timeframe, cat) and stored as
+    zlib-compressed JSON column arrays (no pickles, so loading an entry never
+    executes code). Each entry expires according to the granularity of its
+    timeframe: hourly windows go stale within minutes, multi-month windows
+    keep for hours. When the file grows beyond ``max_bytes`` the least
+    recently used entries are evicted.
+
+    The cache lives in SQLite, so every process on the host (CLI, missions,
+    API) shares entries and counters.
+    """
+
+    # Seconds an entry stays fresh, by pytrends timeframe
+    TTL_SECONDS = {
+        "now 1-H": 5 * 60,
+        "now 4-H": 10 * 60,
+        "now 1-d": 30 * 60,
+        "now 7-d": 60 * 60,
+        "today 1-m": 6 * 3600,
+        "today 3-m": 12 * 3600,
+        "today 12-m": 24 * 3600,
+    }
+    DEFAULT_TTL_SECONDS = 60 * 60
+
+    # Daily trending lists are refreshed by Google a few times per hour
+    TRENDING_TTL_SECONDS = 15 * 60
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Payload size above which LRU entries are evicted
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = LocalSQLite(path, self.SCHEMA)
+
+    @classmethod
+    def ttl_for(cls, timeframe: Optional[str]) -> int:
+        """Get the TTL in seconds for a pytrends timeframe string."""
+        if not timeframe:
+            return cls.TRENDING_TTL_SECONDS
+        return cls.TTL_SECONDS.get(timeframe, cls.DEFAULT_TTL_SECONDS)
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        keywords: list[str],
+        geo: str = "",
+        timeframe: Optional[str] = None,
+        cat: int = 0,
+        **extra,
+    ) -> str:
+        """Build a stable cache key for a query.
+
+        Keywords are sorted because pytrends returns the same frame for any
+        ordering of one payload.
+        """
+        raw = json.dumps(
+            [kind, sorted(keywords), geo, timeframe, cat, sorted(extra.items())],
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str, max_age: Optional[float] = None) -> tuple[bool, Any]:
+        """Look up an entry.
+
+        Args:
+            key: Key from :meth:`make_key`
+            max_age: Treat entries stored more than this many seconds ago as
+                missing (default: any unexpired entry)
+
+        Returns:
+            Tuple of (found, value)
+        """
+        now = time.time()
+        with self._db.transaction() as conn:
+            row = conn.execute(
+                "SELECT payload, expires_at, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (max_age is not None and now - row[2] > max_age):
+                self._bump(conn, "misses")
+                return False, None
+
+            if row[1] <= now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._bump(conn, "misses")
+                self._bump(conn, "expirations")
+                return False, None
+
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._bump(conn, "hits")
+
+        return True, _decode(json.loads(zlib.decompress(row[0])))
+
+    def set(self, key: str, kind: str, value: Any, ttl: int):
+        """Store an entry, evicting LRU entries if the cache is over budget.
+
+        Args:
+            key: Key from :meth:`make_key`
+            kind: Response kind (for inspection only)
+            value: pytrends result (frames, dicts and lists of them)
+            ttl: Seconds until the entry expires
+        """
+        payload = zlib.compress(
+            json.dumps(_encode(value), separators=(",", ":"), default=str).encode("utf-8")
+        )
+        now = time.time()
+
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO entries "
+                "(key, kind, payload, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET payload = excluded.payload, size = excluded.size, "
+                "created_at = excluded.created_at, expires_at = excluded.expires_at, "
+                "last_access = excluded.last_access",
+                (key, kind, payload, len(payload), now, now + ttl, now),
+            )
+            self._evict(conn, now)
+
+    def get_or_load(
+        self,
+        kind: str,
+        keywords: list[str],
+        geo: str,
+        timeframe: Optional[str],
+        cat: int,
+        loader: Callable[[], Any],
+        max_age: Optional[float] = None,
+    ) -> Any:
+        """Return a cached response, calling ``loader`` and storing its result on a miss.
+
+        Args:
+            kind: Response kind (e.g., 'interest_over_time')
+            keywords: Payload keywords
+            geo: Geo code
+            timeframe: pytrends timeframe (None for non-windowed queries)
+            cat: Category ID
+            loader: Performs the upstream request
+            max_age: Only use an entry stored at most this many seconds ago
+                (0 always calls ``loader`` and replaces the entry)
+
+        Returns:
+            The cached or freshly loaded response
+        """
+        key = self.make_key(kind, keywords, geo, timeframe, cat)
+
+        try:
+            found, value = self.get(key, max_age)
+            if found:
+                logger.debug(f"Trends cache hit: {kind} {keywords} geo={geo} tf={timeframe}")
+                return value
+        except Exception as e:
+            logger.warning(f"Trends cache read failed, fetching upstream: {e}")
+
+        value = loader()
+        if value is not None:
+            try:
+                self.set(key, kind, value, self.ttl_for(timeframe))
+            except Exception as e:
+                logger.warning(f"Trends cache write failed: {e}")
+        return value
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _bump(self, conn, name: str, amount: int = 1):
+        """Increment a persistent counter inside the current transaction."""
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then LRU entries until under ``max_bytes``."""
+        expired = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,)).rowcount
+        if expired:
+            self._bump(conn, "expirations", expired)
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        if evicted:
+            self._bump(conn, "evictions", evicted)
+            logger.debug(f"Evicted {evicted} trends cache entries")
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns the number removed."""
+        with self._db.transaction() as conn:
+            removed = conn.execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            if removed:
+                self._bump(conn, "expirations", removed)
+        return removed
+
+    def clear(self):
+        """Delete every entry and reset the counters."""
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
+
+    def stats(self) -> CacheStats:
+        """Get hit/miss/eviction counters and current size."""
+        conn = self._db.connection()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return CacheStats(
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            expirations=counters.get("expirations", 0),
+            evictions=counters.get("evictions", 0),
+            entries=entries,
+            bytes=size,
+        )
+
+
+@lru_cache()
+def get_trends_cache() -> Optional[TrendsCache]:
+    """Get the process-wide trends cache, or None if caching is disabled."""
+    settings = get_settings()
+    if not settings.trends_cache_enabled:
+        return None
+
+    path = settings.trends_cache_path or os.path.join(
+        tempfile.gettempdir(), "hypertrending-trends-cache.sqlite"
+    )
+    return TrendsCache(path, max_bytes=settings.trends_cache_max_mb * 1024 * 1024)
@@ -1,15 +1,24 @@
 """Google Trends data fetcher using pytrends."""
 
-import time
 import logging
-from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import pandas as pd
 from pytrends.request import TrendReq
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from .base import BaseFetcher, TrendData, TimeseriesPoint
+from .base import BaseFetcher, TrendData
+from .series import TrendSeries
+from .batching import (
+    MAX_KEYWORDS_PER_PAYLOAD,
+    anchor_batches,
+    first_batch,
+    merge_on_anchor,
+    pick_anchor,
+    unique_keywords,
+)
+from .cache import TrendsCache, get_trends_cache
+from .rate_limit import TokenBucket, get_rate_limiter
 from ..config import get_settings, SourceCode, REGIONS
 
 logger = logging.getLogger(__name__)
@@ -31,21 +40,30 @@ class GoogleTrendsFetcher(BaseFetcher):
         "12m": "today 12-m",
     }
 
-    def __init__(self, hl: str = "en-US", tz: int = 360, retries: int = 3):
+    def __init__(
+        self,
+        hl: str = "en-US",
+        tz: int = 360,
+        retries: int = 3,
+        limiter: Optional[TokenBucket] = None,
+        cache: Optional[TrendsCache] = None,
+    ):
         """Initialize the Google Trends fetcher.
 
         Args:
             hl: Host language for Google Trends
             tz: Timezone offset in minutes
             retries: Number of retries for failed requests
+            limiter: Token bucket to draw from (default: the host-wide limiter)
+            cache: Response cache (default: the shared cache, if enabled)
         """
         self.settings = get_settings()
         self.hl = hl
         self.tz = tz
         self.retries = retries
         self._pytrends: Optional[TrendReq] = None
-        self._last_request_time = 0.0
-        self._min_request_interval = 60.0 / self.settings.pytrends_requests_per_minute
+        self.limiter = limiter or get_rate_limiter()
+        self.cache = cache or get_trends_cache()
 
     @property
     def pytrends(self) -> TrendReq:
@@ -56,12 +74,21 @@ class GoogleTrendsFetcher(BaseFetcher):
 
     def _rate_limit(self):
         """Ensure we don't exceed rate limits."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._min_request_interval:
-            sleep_time = self._min_request_interval - elapsed
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-        self._last_request_time = time.time()
+        self.limiter.acquire()
+
+    def _cached(
+        self,
+        kind: str,
+        keywords: list[str],
+        geo: str,
+        timeframe: Optional[str],
+        cat: int,
+        loader: Callable[[], Any],
+    ) -> Any:
+        """Serve a pytrends response from the cache, calling ``loader`` on a miss."""
+        if self.cache is None:
+            return loader()
+        return self.cache.get_or_load(kind, keywords, geo, timeframe, cat, loader)
 
     @retry(
         stop=stop_after_attempt(3),
@@ -101,11 +128,15 @@ class GoogleTrendsFetcher(BaseFetcher):
         results = []
 
         try:
-            self._rate_limit()
-
             # Get trending searches (daily trends)
             geo = REGIONS.get(region, region)
-            trending_df = self.pytrends.trending_searches(pn=geo.lower() if geo else "united_states")
+            pn = geo.lower() if geo else "united_states"
+
+            def load():
+                self._rate_limit()
+                return self.pytrends.trending_searches(pn=pn)
+
+            trending_df = self._cached("trending_searches", [], pn, None, 0, load)
 
             if trending_df is None or trending_df.empty:
                 logger.warning(f"No trending searches found for {region}")
@@ -193,6 +224,73 @@ class GoogleTrendsFetcher(BaseFetcher):
 
         return results
 
+    def _interest_over_time_frame(
+        self,
+        keywords: list[str],
+        timeframe: str,
+        geo: str,
+    ) -> Optional[pd.DataFrame]:
+        """Fetch the raw interest_over_time frame for one payload (max 5 keywords).
+
+        Args:
+            keywords: Payload keywords
+            timeframe: pytrends timeframe string (e.g., 'now 7-d')
+            geo: Google geo code
+
+        Returns:
+            DataFrame indexed by timestamp with one column per keyword
+        """
+        def load():
+            # Build payload
+            self._build_payload(keywords[:5], timeframe, geo)
+
+            # Get interest over time
+            self._rate_limit()
+            return self.pytrends.interest_over_time()
+
+        return self._cached("interest_over_time", keywords[:5], geo, timeframe, 0, load)
+
+    def _frame_to_trend_data(
+        self,
+        iot_df: pd.DataFrame,
+        keywords: list[str],
+        region: str,
+        timeframe: str,
+        metadata: Optional[dict] = None,
+    ) -> dict[str, TrendData]:
+        """Convert an interest_over_time frame to TrendData per keyword.
+
+        Args:
+            iot_df: Frame indexed by timestamp with one column per keyword
+            keywords: Keywords to extract (missing columns are skipped)
+            region: Region code
+            timeframe: Time window the frame covers
+            metadata: Extra metadata merged into each TrendData
+
+        Returns:
+            Dict mapping keyword to TrendData with timeseries
+        """
+        results = {}
+
+        for keyword in keywords:
+            if keyword not in iot_df.columns:
+                continue
+
+            timeseries = TrendSeries.from_frame(iot_df, keyword)
+
+            # Create TrendData
+            trend_data = TrendData(
+                keyword=keyword,
+                region=region,
+                source=self.source_code,
+                timeseries=timeseries,
+                metadata={"timeframe": timeframe, **(metadata or {})},
+            )
+            trend_data.calculate_from_timeseries()
+            results[keyword] = trend_data
+
+        return results
+
     def fetch_interest_over_time(
         self,
         keywords: list[str],
@@ -216,44 +314,13 @@ class GoogleTrendsFetcher(BaseFetcher):
         results = {}
 
         try:
-            # Build payload
-            self._build_payload(keywords[:5], tf, geo)
-
-            # Get interest over time
-            self._rate_limit()
-            iot_df = self.pytrends.interest_over_time()
+            iot_df = self._interest_over_time_frame(keywords[:5], tf, geo)
 
             if iot_df is None or iot_df.empty:
                 logger.warning("No interest over time data returned")
                 return results
 
-            # Process each keyword
-            for keyword in keywords[:5]:
-                if keyword not in iot_df.columns:
-                    continue
-
-                # Build timeseries
-                timeseries = []
-                for ts, row in iot_df.iterrows():
-                    is_partial = row.get("isPartial", False) if "isPartial" in iot_df.columns else False
-                    point = TimeseriesPoint(
-                        timestamp=ts.to_pydatetime().replace(tzinfo=timezone.utc),
-                        value=int(row[keyword]),
-                        is_partial=bool(is_partial),
-                    )
-                    timeseries.append(point)
-
-                # Create TrendData
-                trend_data = TrendData(
-                    keyword=keyword,
-                    region=region,
-                    source=self.source_code,
-                    timeseries=timeseries,
-                    metadata={"timeframe": timeframe},
-                )
-                trend_data.calculate_from_timeseries()
-                results[keyword] = trend_data
-
+            results = self._frame_to_trend_data(iot_df, keywords[:5], region, timeframe)
             logger.info(f"Got timeseries data for {len(results)} keywords")
 
         except Exception as e:
@@ -262,6 +329,79 @@ class GoogleTrendsFetcher(BaseFetcher):
 
         return results
 
+    def fetch_interest_over_time_batched(
+        self,
+        keywords: list[str],
+        region: str = "US",
+        timeframe: str = "7d",
+        anchor: Optional[str] = None,
+    ) -> dict[str, TrendData]:
+        """Fetch interest over time for any number of keywords on one common scale.
+
+        Payloads share an anchor keyword so every batch can be rescaled onto the
+        first batch's scale (see :mod:`.batching`). N keywords cost
+        ``ceil((N - 1) / 4)`` requests instead of re-fetching in ad-hoc groups.
+
+        Args:
+            keywords: Keywords to compare (any number)
+            region: Region code
+            timeframe: Time window ('1h', '4h', '24h', '7d', '30d', '90d')
+            anchor: Keyword to share between payloads (default: the strongest
+                keyword in the first payload)
+
+        Returns:
+            Dict mapping keyword to TrendData, all values on one 0-100 scale
+        """
+        keywords = unique_keywords(keywords)
+        if len(keywords) <= MAX_KEYWORDS_PER_PAYLOAD and anchor is None:
+            return self.fetch_interest_over_time(keywords, region, timeframe)
+
+        tf = self.TIMEFRAMES.get(timeframe, timeframe)
+        geo = REGIONS.get(region, region)
+
+        batch = first_batch(keywords, anchor)
+        first_df = self._interest_over_time_frame(batch, tf, geo)
+        chosen = pick_anchor(first_df, batch, anchor)
+
+        if chosen is None:
+            logger.warning(
+                "No keyword in the first payload has interest; fetching without an anchor"
+            )
+            results = {}
+            for i in range(0, len(keywords), MAX_KEYWORDS_PER_PAYLOAD):
+                payload = keywords[i : i + MAX_KEYWORDS_PER_PAYLOAD]
+                try:
+                    results.update(self.fetch_interest_over_time(payload, region, timeframe))
+                except Exception as e:
+                    logger.error(f"Error fetching batch {payload}: {e}")
+            return results
+
+        frames = [first_df]
+        for payload in anchor_batches(keywords, chosen, batch):
+            # A failed batch only loses its own keywords
+            try:
+                frame = self._interest_over_time_frame(payload, tf, geo)
+            except Exception as e:
+                logger.error(f"Error fetching batch {payload}: {e}")
+                continue
+            if frame is None or frame.empty or chosen not in frame.columns:
+                logger.warning(f"No interest over time data for batch {payload}")
+                continue
+            frames.append(frame)
+
+        logger.info(
+            f"Fetched {len(keywords)} keywords in {len(frames)} anchored payloads "
+            f"(anchor='{chosen}'), region={region}"
+        )
+        combined = merge_on_anchor(frames, chosen)
+        return self._frame_to_trend_data(
+            combined,
+            keywords,
+            region,
+            timeframe,
+            metadata={"anchor": chosen, "payloads": len(frames)},
+        )
+
     def fetch_related_queries(
         self,
         keyword: str,
@@ -286,10 +426,12 @@ class GoogleTrendsFetcher(BaseFetcher):
         rising_queries = []
 
         try:
-            self._build_payload([keyword], tf, geo)
-            self._rate_limit()
+            def load():
+                self._build_payload([keyword], tf, geo)
+                self._rate_limit()
+                return self.pytrends.related_queries()
 
-            related = self.pytrends.related_queries()
+            related = self._cached("related_queries", [keyword], geo, tf, 0, load)
 
             if related and keyword in related:
                 kw_data = related[keyword]
@@ -342,14 +484,16 @@ class GoogleTrendsFetcher(BaseFetcher):
         results = {}
 
         try:
-            self._build_payload([keyword], tf, geo)
-            self._rate_limit()
+            def load():
+                self._build_payload([keyword], tf, geo)
+                self._rate_limit()
+                return self.pytrends.interest_by_region(
+                    resolution=resolution,
+                    inc_low_vol=True,
+                    inc_geo_code=True,
+                )
 
-            ibr_df = self.pytrends.interest_by_region(
-                resolution=resolution,
-                inc_low_vol=True,
-                inc_geo_code=True,
-            )
+            ibr_df = self._cached(f"interest_by_region:{resolution}", [keyword], geo, tf, 0, load)
 
             if ibr_df is not None and not ibr_df.empty:
                 for geo_name, row in ibr_df.iterrows():
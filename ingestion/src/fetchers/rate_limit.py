@@ -0,0 +1,167 @@
+"""Rate limiting primitives shared by the trend fetchers."""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from functools import lru_cache
+
+from ..config import get_settings
+from ..utils.sqlite import LocalSQLite
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how fast upstream requests may start.
+
+    Tokens refill continuously at ``requests_per_minute / 60`` per second up to
+    ``burst``. Each request takes one token; callers that find the bucket empty
+    reserve a future token and sleep until it is due, so waiters are served in
+    arrival order. Only request *starts* are limited, which lets several round
+    trips overlap while the aggregate rate stays within the quota.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """Initialize the bucket.
+
+        Args:
+            requests_per_minute: Sustained request budget
+            burst: Maximum number of tokens that can accumulate while idle
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now, going into debt if needed.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds the caller must wait before its request may start
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            deficit = -self._tokens
+
+        return deficit / self.rate if deficit > 0 else 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until the caller may start a request.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limiting: sleeping {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket whose state lives in SQLite so every process on a host shares it.
+
+    The CLI, mission runners, scripts and the API each draw from the same
+    budget, so running them side by side cannot exceed the configured rate.
+    ``BEGIN IMMEDIATE`` serializes reservations across processes through
+    SQLite's file lock, and timestamps use the wall clock so processes agree
+    on elapsed time.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS token_buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str,
+        requests_per_minute: float,
+        burst: int = 1,
+        name: str = "pytrends",
+    ):
+        """Initialize the bucket.
+
+        Args:
+            path: SQLite database file holding the bucket state
+            requests_per_minute: Sustained request budget
+            burst: Maximum number of tokens that can accumulate while idle
+            name: Bucket name, so several budgets can share one file
+        """
+        super().__init__(requests_per_minute, burst)
+        self.path = path
+        self.name = name
+        self._db = LocalSQLite(path, self.SCHEMA)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens from the shared bucket, going into debt if needed.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds the caller must wait before its request may start
+        """
+        with self._db.transaction() as conn:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+
+            if row is None:
+                available = self.capacity
+            else:
+                elapsed = max(0.0, now - row[1])
+                available = min(self.capacity, row[0] + elapsed * self.rate)
+
+            available -= tokens
+            conn.execute(
+                "INSERT INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, "
+                "updated_at = excluded.updated_at",
+                (self.name, available, now),
+            )
+
+        deficit = -available
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+@lru_cache()
+def get_rate_limiter() -> TokenBucket:
+    """Get the process-wide pytrends rate limiter.
+
+    Returns a host-wide :class:`SharedTokenBucket` unless shared limiting is
+    disabled in settings, in which case the budget is per process.
+    """
+    settings = get_settings()
+
+    if settings.pytrends_shared_rate_limit:
+        path = settings.pytrends_rate_limit_path or os.path.join(
+            tempfile.gettempdir(), "hypertrending-ratelimit.sqlite"
+        )
+        return SharedTokenBucket(
+            path,
+            settings.pytrends_requests_per_minute,
+            burst=settings.pytrends_burst,
+        )
+
+    return TokenBucket(settings.pytrends_requests_per_minute, burst=settings.pytrends_burst)
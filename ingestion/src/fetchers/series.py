@@ -0,0 +1,259 @@
+"""Columnar timeseries storage for trend data."""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class TimeseriesPoint:
+    """A single point in a timeseries."""
+
+    timestamp: datetime
+    value: int  # 0-100 interest value
+    is_partial: bool = False
+    metadata: Optional[dict] = None
+
+
+class TrendSeries:
+    """Interest timeseries held as three packed NumPy columns.
+
+    Timestamps are int64 epoch seconds (UTC), values are uint8 (Google Trends
+    interest is 0-100) and the partial flags are a bitmask, so a week of hourly
+    points takes ~1.5 KB instead of 168 dataclass instances with a datetime
+    each. Build it straight from a pytrends frame with :meth:`from_frame`.
+
+    Iterating yields :class:`TimeseriesPoint` objects for callers that still
+    want them; hot paths should use :attr:`ts`, :attr:`values` and
+    :attr:`partial` directly.
+    """
+
+    __slots__ = ("ts", "values", "_partial_bits")
+
+    def __init__(
+        self,
+        ts: Optional[np.ndarray] = None,
+        values: Optional[np.ndarray] = None,
+        partial: Optional[np.ndarray] = None,
+    ):
+        """Initialize the series.
+
+        Args:
+            ts: Epoch seconds (UTC)
+            values: Interest values, clipped to 0-100
+            partial: Boolean flags per point (default: none partial)
+        """
+        self.ts = np.asarray(ts if ts is not None else [], dtype=np.int64)
+        raw = np.asarray(values if values is not None else [])
+        self.values = np.clip(raw, 0, 100).astype(np.uint8)
+        if len(self.ts) != len(self.values):
+            raise ValueError(
+                "Timestamp and value columns differ in length "
+                f"({len(self.ts)} != {len(self.values)})"
+            )
+
+        if partial is None:
+            partial = np.zeros(len(self.ts), dtype=bool)
+        self._partial_bits = np.packbits(np.asarray(partial, dtype=bool))
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, column: str) -> "TrendSeries":
+        """Build a series from a pytrends interest_over_time frame.
+
+        Args:
+            frame: Frame indexed by timestamp (naive timestamps are taken as UTC)
+            column: Keyword column to extract
+
+        Returns:
+            TrendSeries for the column
+        """
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        partial = None
+        if "isPartial" in frame.columns:
+            partial = frame["isPartial"].fillna(False).to_numpy(dtype=bool)
+
+        return cls(
+            ts=index.as_unit("s").asi8,
+            values=frame[column].fillna(0).to_numpy(),
+            partial=partial,
+        )
+
+    @classmethod
+    def from_points(cls, points: Iterable[TimeseriesPoint]) -> "TrendSeries":
+        """Build a series from TimeseriesPoint objects (per-point metadata is dropped)."""
+        points = list(points)
+        return cls(
+            ts=[int(_as_utc(p.timestamp).timestamp()) for p in points],
+            values=[p.value for p in points],
+            partial=[p.is_partial for p in points],
+        )
+
+    @classmethod
+    def from_records(cls, rows: list[dict]) -> "TrendSeries":
+        """Build a series from keyword_timeseries rows (``ts``, ``interest_value``)."""
+        if not rows:
+            return cls()
+
+        index = pd.to_datetime([row["ts"] for row in rows], utc=True, format="ISO8601")
+        return cls(
+            ts=index.tz_localize(None).as_unit("s").asi8,
+            values=np.fromiter(
+                (row["interest_value"] for row in rows), dtype=np.int64, count=len(rows)
+            ),
+            partial=np.fromiter(
+                (bool(row.get("is_partial", False)) for row in rows), dtype=bool, count=len(rows)
+            ),
+        )
+
+    # -------------------------------------------------------------------------
+    # Columns
+    # -------------------------------------------------------------------------
+
+    @property
+    def partial(self) -> np.ndarray:
+        """Boolean partial flag per point."""
+        return np.unpackbits(self._partial_bits, count=len(self.ts)).astype(bool)
+
+    def iso_timestamps(self) -> list[str]:
+        """Timestamps as ISO-8601 strings with an explicit UTC offset."""
+        stamps = np.datetime_as_string(self.ts.astype("datetime64[s]"), unit="s")
+        return [f"{stamp}+00:00" for stamp in stamps.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+        return self.ts.nbytes + self.values.nbytes + self._partial_bits.nbytes
+
+    # -------------------------------------------------------------------------
+    # Sequence protocol
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __bool__(self) -> bool:
+        return len(self.ts) > 0
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[TimeseriesPoint, "TrendSeries"]:
+        if isinstance(key, slice):
+            return TrendSeries(self.ts[key], self.values[key], self.partial[key])
+        return TimeseriesPoint(
+            timestamp=datetime.fromtimestamp(int(self.ts[key]), tz=timezone.utc),
+            value=int(self.values[key]),
+            is_partial=bool(self.partial[key]),
+        )
+
+    def __iter__(self) -> Iterator[TimeseriesPoint]:
+        partial = self.partial
+        for ts, value, flag in zip(self.ts.tolist(), self.values.tolist(), partial.tolist()):
+            yield TimeseriesPoint(
+                timestamp=datetime.fromtimestamp(ts, tz=timezone.utc),
+                value=value,
+                is_partial=flag,
+            )
+
+    def __repr__(self) -> str:
+        return f"TrendSeries(points={len(self)}, nbytes={self.nbytes})"
+
+    # -------------------------------------------------------------------------
+    # Downsampling
+    # -------------------------------------------------------------------------
+
+    def downsample(self, points: int) -> "TrendSeries":
+        """Reduce the series to ``points`` points with LTTB (see :func:`lttb_indices`).
+
+        Args:
+            points: Target number of points (series this short are returned as is)
+
+        Returns:
+            Downsampled series (keeps the first and last points)
+        """
+        index = lttb_indices(self.values, points, x=self.ts)
+        return TrendSeries(self.ts[index], self.values[index], self.partial[index])
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def to_records(self, **columns) -> list[dict]:
+        """Build keyword_timeseries rows without creating per-point objects.
+
+        Args:
+            **columns: Columns shared by every row (keyword_id, source_id, ...)
+
+        Returns:
+            List of row dicts with ``ts``, ``interest_value`` and ``is_partial``
+        """
+        return [
+            {**columns, "ts": ts, "interest_value": value, "is_partial": flag}
+            for ts, value, flag in zip(
+                self.iso_timestamps(), self.values.tolist(), self.partial.tolist()
+            )
+        ]
+
+
+def lttb_indices(y: np.ndarray, threshold: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pick points with Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The points between them are
+    split into ``threshold - 2`` buckets, and from each bucket the point forming
+    the largest triangle with the previously kept point and the next
+    bucket's average is kept, which preserves peaks and dips a plain
+    stride or average would flatten. Bucket averages come from cumulative
+    sums and each bucket's areas are computed as one array operation; only
+    the walk from bucket to bucket is a Python loop (``threshold`` steps).
+
+    Args:
+        y: Values
+        threshold: Number of points to keep
+        x: Positions (default: evenly spaced)
+
+    Returns:
+        Sorted indices of the kept points (all indices if ``threshold`` is
+        at least ``len(y)`` or below 3)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # Bucket i spans [edges[i], edges[i + 1]); every bucket holds at least one point
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    # The last bucket looks ahead to the final point instead of a bucket average
+    next_x = np.append(((cum_x[ends] - cum_x[starts]) / counts)[1:], x[-1])
+    next_y = np.append(((cum_y[ends] - cum_y[starts]) / counts)[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for i in range(threshold - 2):
+        start, end = starts[i], ends[i]
+        ax, ay = x[anchor], y[anchor]
+        areas = np.abs(
+            (ax - next_x[i]) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y[i] - ay)
+        )
+        anchor = start + int(np.argmax(areas))
+        selected[i + 1] = anchor
+    return selected
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,239 @@
+"""Pool of pre-warmed pytrends sessions."""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from pytrends.request import TrendReq
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledSession:
+    """A pytrends client and its bookkeeping."""
+
+    trends: TrendReq
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    failed: bool = False
+
+
+class TrendsSessionPool:
+    """Reuse pytrends sessions so requests skip Google's cookie handshake.
+
+    ``TrendReq()`` fetches a NID cookie from Google before it can send a
+    query, which costs a full round trip on every request that builds a new
+    client. The pool creates ``size`` clients up front (in the background)
+    and lends them out one caller at a time, since a TrendReq keeps
+    per-query payload state.
+
+    A session is health-checked when returned and retired when it is older
+    than ``max_age`` seconds, has served ``max_uses`` queries, has no cookie,
+    or raised while checked out (Google tends to keep rejecting a cookie
+    after a 429). Retired sessions are replaced in the background. If every
+    session is busy for ``timeout`` seconds, a one-off client is built so
+    callers never wait indefinitely.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        hl: str = "en-US",
+        tz: int = 360,
+        max_age: float = 1800.0,
+        max_uses: int = 100,
+        factory: Optional[Callable[[], TrendReq]] = None,
+    ):
+        """Initialize the pool (no sessions are created until :meth:`warm`).
+
+        Args:
+            size: Sessions kept warm
+            hl: Host language for Google Trends
+            tz: Timezone offset in minutes
+            max_age: Seconds before a session is replaced
+            max_uses: Queries before a session is replaced
+            factory: Builds a client (default: ``TrendReq(hl=hl, tz=tz)``)
+        """
+        self.size = size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.factory = factory or (lambda: TrendReq(hl=hl, tz=tz))
+
+        self._idle: "queue.LifoQueue[_PooledSession]" = queue.LifoQueue()
+        self._owned = 0  # Pooled sessions, idle or checked out
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.created = 0
+        self.retired = 0
+        self.overflow = 0
+        self.create_errors = 0
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def warm(self, wait: bool = False):
+        """Fill the pool to ``size`` sessions.
+
+        Args:
+            wait: Block until the sessions exist (default: fill in the background)
+        """
+        if wait:
+            self._fill()
+        else:
+            threading.Thread(target=self._fill, name="trends-session-warm", daemon=True).start()
+
+    def close(self):
+        """Drop every idle session; checked-out sessions are dropped on return."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._owned -= 1
+
+    def _fill(self):
+        """Create sessions until the pool is full (stops at the first failure)."""
+        while True:
+            with self._lock:
+                if self._closed or self._owned >= self.size:
+                    return
+                self._owned += 1
+
+            entry = self._create()
+            if entry is None:
+                with self._lock:
+                    self._owned -= 1
+                return
+            self._idle.put(entry)
+
+    def _create(self) -> Optional[_PooledSession]:
+        """Build one client, doing the cookie handshake now."""
+        try:
+            entry = _PooledSession(self.factory())
+        except Exception as e:
+            logger.warning(f"Could not create pytrends session: {e}")
+            with self._lock:
+                self.create_errors += 1
+            return None
+        with self._lock:
+            self.created += 1
+        return entry
+
+    # -------------------------------------------------------------------------
+    # Checkout
+    # -------------------------------------------------------------------------
+
+    def healthy(self, entry: _PooledSession) -> bool:
+        """Whether a session can go back into the pool."""
+        return (
+            not entry.failed
+            and entry.uses < self.max_uses
+            and time.monotonic() - entry.created_at < self.max_age
+            and bool(getattr(entry.trends, "cookies", None))
+        )
+
+    @contextmanager
+    def session(self, timeout: float = 10.0) -> Iterator[TrendReq]:
+        """Borrow a warm pytrends client.
+
+        Args:
+            timeout: Seconds to wait for a free session before building a one-off
+
+        Yields:
+            A TrendReq owned by the caller until the block exits
+        """
+        entry, pooled = self._checkout(timeout)
+        try:
+            yield entry.trends
+        except Exception:
+            entry.failed = True
+            raise
+        finally:
+            entry.uses += 1
+            if pooled:
+                self._checkin(entry)
+
+    def _checkout(self, timeout: float) -> tuple[_PooledSession, bool]:
+        """Take an idle session, create one if the pool has room, or wait."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                entry = None
+
+            if entry is not None:
+                if self.healthy(entry):
+                    return entry, True
+                self._retire(entry)
+                continue
+
+            with self._lock:
+                has_room = not self._closed and self._owned < self.size
+                if has_room:
+                    self._owned += 1
+            if has_room:
+                created = self._create()
+                if created is not None:
+                    return created, True
+                with self._lock:
+                    self._owned -= 1
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if self.healthy(entry):
+                return entry, True
+            self._retire(entry)
+
+        # Pool exhausted (or Google refused a handshake): serve this caller with a one-off
+        with self._lock:
+            self.overflow += 1
+        return _PooledSession(self.factory()), False
+
+    def _checkin(self, entry: _PooledSession):
+        """Return a session, retiring it if it failed its health check."""
+        with self._lock:
+            closed = self._closed
+        if closed or not self.healthy(entry):
+            self._retire(entry)
+        else:
+            self._idle.put(entry)
+
+    def _retire(self, entry: _PooledSession):
+        """Drop a pooled session and start building its replacement."""
+        with self._lock:
+            self._owned -= 1
+            self.retired += 1
+        logger.debug(f"Retired pytrends session after {entry.uses} uses (failed={entry.failed})")
+        self.warm()
+
+    def health(self) -> dict:
+        """Pool state for health endpoints."""
+        with self._lock:
+            owned = self._owned
+        idle = self._idle.qsize()
+        return {
+            "size": self.size,
+            "idle": idle,
+            "in_use": max(0, owned - idle),
+            "created": self.created,
+            "retired": self.retired,
+            "overflow": self.overflow,
+            "create_errors": self.create_errors,
+        }
@@ -0,0 +1,129 @@
+"""Long-lived resources shared by every API request."""
+
+import logging
+import threading
+from typing import Optional
+
+import httpx
+from supabase import Client, ClientOptions, create_client
+
+from .config import get_settings
+from .executors import UpstreamExecutors
+from .fetchers.session_pool import TrendsSessionPool
+from .storage.keyword_cache import get_keyword_cache
+from .storage.write_buffer import get_timeseries_buffer
+
+logger = logging.getLogger(__name__)
+
+
+class ApiResources:
+    """Supabase client, source IDs, pytrends sessions and executors for the API process.
+
+    Built once per process and started/stopped by the app's lifespan, so
+    requests reuse one Supabase client (its httpx pool keeps connections to
+    PostgREST alive), a source code -> ID map loaded once, and warm pytrends
+    sessions instead of paying a TLS and cookie handshake each. Blocking
+    endpoint work runs on the per-upstream ``executors``.
+    """
+
+    # Generous read timeout: some PostgREST calls (bulk RPCs, large selects) are slow
+    HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+    def __init__(self, supabase_url: str, supabase_key: str):
+        """Initialize the resources (nothing is opened until :meth:`start`).
+
+        Args:
+            supabase_url: Supabase project URL
+            supabase_key: API key the app uses
+        """
+        settings = get_settings()
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        self.max_connections = settings.supabase_max_connections
+        self.trends = TrendsSessionPool(
+            size=settings.trends_session_pool_size,
+            max_age=settings.trends_session_max_age_seconds,
+            max_uses=settings.trends_session_max_uses,
+        )
+        self.executors = UpstreamExecutors.from_settings()
+
+        self._http: Optional[httpx.Client] = None
+        self._supabase: Optional[Client] = None
+        self._source_ids: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Open the shared client and warm the caches."""
+        self.trends.warm()
+        self.load_sources()
+        get_keyword_cache().warm(self.supabase)
+
+    def close(self):
+        """Flush deferred writes and release connections."""
+        if self._supabase is not None:
+            get_timeseries_buffer().flush(self._supabase)
+            get_keyword_cache().flush(self._supabase)
+        self.trends.close()
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+            self._http = None
+            self._supabase = None
+
+    # -------------------------------------------------------------------------
+    # Supabase
+    # -------------------------------------------------------------------------
+
+    @property
+    def supabase(self) -> Client:
+        """Shared Supabase client (created on first use if start() was skipped)."""
+        if self._supabase is None:
+            with self._lock:
+                if self._supabase is None:
+                    self._http = httpx.Client(
+                        timeout=self.HTTP_TIMEOUT,
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections,
+                        ),
+                    )
+                    self._supabase = create_client(
+                        self.supabase_url,
+                        self.supabase_key,
+                        options=ClientOptions(httpx_client=self._http),
+                    )
+        return self._supabase
+
+    def load_sources(self) -> dict[str, str]:
+        """Load every source's ID in one query.
+
+        Returns:
+            Dict mapping source code to source UUID
+        """
+        try:
+            result = self.supabase.table("sources").select("id, code").execute()
+            self._source_ids = {row["code"]: row["id"] for row in result.data or []}
+        except Exception as e:
+            logger.error(f"Error loading sources: {e}")
+        return self._source_ids
+
+    def source_id(self, code: str) -> Optional[str]:
+        """Get a source's ID (reloads the map once for unknown codes)."""
+        if code not in self._source_ids:
+            self.load_sources()
+        return self._source_ids.get(code)
+
+    def health(self) -> dict:
+        """Resource state for the health endpoint."""
+        return {
+            "supabase_connected": self._supabase is not None,
+            "sources_cached": len(self._source_ids),
+            "trends_sessions": self.trends.health(),
+            "keyword_cache": get_keyword_cache().stats(),
+            "timeseries_buffer": get_timeseries_buffer().stats(),
+            "executors": self.executors.stats(),
+        }
@@ -1,5 +1,15 @@
 """Mission runners for executing trend hunting jobs."""
 
+from .jobs import JobCancelledError, JobContext, JobRunner, JobStore, get_job_runner
 from .mission_runner import MissionRunner
+from .scheduler import MissionScheduler
 
-__all__ = ["MissionRunner"]
+__all__ = [
+    "MissionRunner",
+    "MissionScheduler",
+    "JobRunner",
+    "JobStore",
+    "JobContext",
+    "JobCancelledError",
+    "get_job_runner",
+]
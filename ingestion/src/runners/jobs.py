@@ -0,0 +1,634 @@
+"""Background jobs for long-running API operations, persisted in SQLite."""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from ..config import get_settings
+from ..executors import ExecutorBusyError
+from ..utils.sqlite import LocalSQLite
+from ..utils.versions import get_resource_versions
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("pending", "running")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+RESUMABLE_STATUSES = ("failed", "cancelled")
+
+
+class JobCancelledError(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+class JobStore:
+    """Job rows in a SQLite file shared by every API process on the host.
+
+    A job moves from ``pending`` to ``running`` when a worker claims it (an
+    atomic compare-and-set, so two processes never run the same job) and
+    ends ``succeeded``, ``failed`` or ``cancelled``. Progress and a
+    JSON checkpoint are saved as the job runs, so a failed, cancelled or
+    abandoned job can be resumed where it stopped.
+
+    Listeners added with :meth:`add_listener` are called with the job after
+    every change this process makes (not changes by other processes).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL,
+            params_key TEXT NOT NULL,
+            status TEXT NOT NULL,
+            progress_done INTEGER NOT NULL DEFAULT 0,
+            progress_total INTEGER,
+            message TEXT,
+            result TEXT,
+            error TEXT,
+            checkpoint TEXT,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            updated_at REAL NOT NULL,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+        CREATE INDEX IF NOT EXISTS idx_jobs_params ON jobs (kind, params_key);
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._db = LocalSQLite(path, self.SCHEMA)
+        self._listeners: list[Callable[[dict], None]] = []
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        """Call ``listener(job)`` after each job change made through this store."""
+        self._listeners.append(listener)
+
+    def _notify(self, job_id: str):
+        if not self._listeners:
+            return
+        job = self.get(job_id)
+        if job is None:
+            return
+        for listener in self._listeners:
+            try:
+                listener(job)
+            except Exception as e:
+                logger.error(f"Job listener failed: {e}")
+
+    @staticmethod
+    def params_key(params: dict) -> str:
+        """Stable hash of a job's parameters."""
+        raw = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @staticmethod
+    def _to_job(row, include_checkpoint: bool = False) -> dict:
+        job = {
+            "id": row["id"],
+            "kind": row["kind"],
+            "params": json.loads(row["params"]),
+            "status": row["status"],
+            "progress": {
+                "done": row["progress_done"],
+                "total": row["progress_total"],
+                "message": row["message"],
+            },
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "cancel_requested": bool(row["cancel_requested"]),
+            "attempts": row["attempts"],
+            "created_at": _iso(row["created_at"]),
+            "started_at": _iso(row["started_at"]),
+            "updated_at": _iso(row["updated_at"]),
+            "finished_at": _iso(row["finished_at"]),
+        }
+        if include_checkpoint:
+            job["checkpoint"] = json.loads(row["checkpoint"]) if row["checkpoint"] else {}
+            job["owner"] = row["owner"]
+        return job
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = self._db.connection()
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self):
+        self._connection()
+        return self._db.transaction()
+
+    @staticmethod
+    def _fetch(conn: sqlite3.Connection, job_id: str) -> Optional[sqlite3.Row]:
+        return conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def get(self, job_id: str, include_checkpoint: bool = False) -> Optional[dict]:
+        """Get a job by ID."""
+        row = self._fetch(self._connection(), job_id)
+        return self._to_job(row, include_checkpoint) if row else None
+
+    def list_jobs(
+        self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50
+    ) -> list[dict]:
+        """List jobs, newest first."""
+        clauses, args = [], []
+        if status:
+            clauses.append("status = ?")
+            args.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            args.append(kind)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*args, limit)
+        ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def count(self, status: str) -> int:
+        """Number of jobs in a status."""
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)
+        ).fetchone()[0]
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def create(self, kind: str, params: dict, max_pending: int) -> tuple[dict, bool]:
+        """Add a pending job, or return the active job with the same parameters.
+
+        Args:
+            kind: Registered job kind
+            params: JSON-serializable parameters
+            max_pending: Pending jobs allowed before rejecting
+
+        Returns:
+            Tuple of (job, created)
+
+        Raises:
+            ExecutorBusyError: If ``max_pending`` jobs are already waiting
+        """
+        key = self.params_key(params)
+        now = time.time()
+        with self._transaction() as conn:
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE kind = ? AND params_key = ? AND status IN (?, ?) "
+                "ORDER BY created_at LIMIT 1",
+                (kind, key, *ACTIVE_STATUSES),
+            ).fetchone()
+            if existing:
+                return self._to_job(self._fetch(conn, existing[0])), False
+
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'pending'"
+            ).fetchone()[0]
+            if pending >= max_pending:
+                raise ExecutorBusyError("jobs")
+
+            job_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO jobs (id, kind, params, params_key, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'pending', ?, ?)",
+                (job_id, kind, json.dumps(params, default=str), key, now, now),
+            )
+            job = self._to_job(self._fetch(conn, job_id))
+        self._notify(job_id)
+        return job, True
+
+    def claim_next(self, owner: str, kinds: list[str]) -> Optional[dict]:
+        """Claim the oldest pending job of the given kinds.
+
+        Returns:
+            The claimed job (with its checkpoint), or None if none is pending
+        """
+        if not kinds:
+            return None
+        placeholders = ",".join("?" * len(kinds))
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE status = 'pending' AND kind IN ({placeholders}) "
+                "ORDER BY created_at LIMIT 1",
+                kinds,
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1, "
+                "started_at = COALESCE(started_at, ?), updated_at = ? WHERE id = ?",
+                (owner, now, now, row[0]),
+            )
+            job = self._to_job(self._fetch(conn, row[0]), include_checkpoint=True)
+        self._notify(job["id"])
+        return job
+
+    def save_progress(
+        self,
+        job_id: str,
+        done: int,
+        total: Optional[int],
+        message: Optional[str],
+        checkpoint: dict,
+    ) -> bool:
+        """Record a running job's progress and checkpoint.
+
+        Returns:
+            True if cancellation has been requested
+        """
+        conn = self._connection()
+        conn.execute(
+            "UPDATE jobs SET progress_done = ?, progress_total = ?, message = ?, checkpoint = ?, "
+            "updated_at = ? WHERE id = ?",
+            (done, total, message, json.dumps(checkpoint, default=str), time.time(), job_id),
+        )
+        row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        self._notify(job_id)
+        return bool(row and row[0])
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        """Mark a job finished."""
+        now = time.time()
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, "
+            "updated_at = ?, finished_at = ? WHERE id = ?",
+            (
+                status,
+                json.dumps(result, default=str) if result is not None else None,
+                error,
+                now,
+                now,
+                job_id,
+            ),
+        )
+        self._notify(job_id)
+
+    def request_cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a pending job now, or ask a running one to stop at its next checkpoint."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', updated_at = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'pending'",
+                (now, now, job_id),
+            )
+            conn.execute(
+                "UPDATE jobs SET cancel_requested = 1, updated_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                (now, job_id),
+            )
+            row = self._fetch(conn, job_id)
+        if row is None:
+            return None
+        self._notify(job_id)
+        return self._to_job(row)
+
+    def resume(self, job_id: str) -> Optional[dict]:
+        """Queue a failed or cancelled job again; it continues from its checkpoint.
+
+        Raises:
+            ValueError: If the job is not failed or cancelled
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = self._fetch(conn, job_id)
+            if row is None:
+                return None
+            if row["status"] not in RESUMABLE_STATUSES:
+                raise ValueError(
+                    f"Job is {row['status']}; only failed or cancelled jobs can be resumed"
+                )
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', cancel_requested = 0, error = NULL, "
+                "finished_at = NULL, updated_at = ? WHERE id = ?",
+                (now, job_id),
+            )
+            job = self._to_job(self._fetch(conn, job_id))
+        self._notify(job_id)
+        return job
+
+    def requeue_abandoned(self, is_abandoned: Callable[[str, Optional[str]], bool]) -> int:
+        """Put running jobs whose owner process is gone back to pending.
+
+        Args:
+            is_abandoned: Called with each running job's ID and owner
+
+        Returns:
+            Number of jobs requeued
+        """
+        now = time.time()
+        requeued = []
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT id, owner FROM jobs WHERE status = 'running'").fetchall()
+            for job_id, owner in rows:
+                if is_abandoned(job_id, owner):
+                    conn.execute(
+                        "UPDATE jobs SET status = 'pending', owner = NULL, updated_at = ? "
+                        "WHERE id = ?",
+                        (now, job_id),
+                    )
+                    requeued.append(job_id)
+        for job_id in requeued:
+            self._notify(job_id)
+        return len(requeued)
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the given age."""
+        cutoff = time.time() - older_than_seconds
+        cursor = self._connection().execute(
+            f"DELETE FROM jobs WHERE status IN ({','.join('?' * len(FINISHED_STATUSES))}) "
+            "AND finished_at < ?",
+            (*FINISHED_STATUSES, cutoff),
+        )
+        return cursor.rowcount
+
+
+class JobContext:
+    """Handle a job function uses to report progress and keep its checkpoint.
+
+    ``checkpoint`` is a dict restored from the last saved progress when a job
+    is resumed; jobs record what they have finished in it and skip that work
+    on the next attempt.
+    """
+
+    def __init__(self, store: JobStore, job: dict):
+        self.store = store
+        self.job_id = job["id"]
+        self.kind = job["kind"]
+        self.params = job["params"]
+        self.checkpoint: dict = job.get("checkpoint") or {}
+        self.done = job["progress"]["done"]
+        self.total = job["progress"]["total"]
+        self.message = job["progress"]["message"]
+
+    def progress(
+        self,
+        done: Optional[int] = None,
+        total: Optional[int] = None,
+        message: Optional[str] = None,
+    ):
+        """Save progress and the checkpoint.
+
+        Raises:
+            JobCancelledError: If cancellation was requested (the checkpoint is kept)
+        """
+        if done is not None:
+            self.done = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        cancelled = self.store.save_progress(
+            self.job_id, self.done, self.total, self.message, self.checkpoint
+        )
+        if cancelled:
+            raise JobCancelledError()
+
+
+class JobRunner:
+    """Run registered job kinds on a bounded worker pool.
+
+    Submitting only writes a pending row; a dispatcher thread claims pending
+    jobs from the store (including ones submitted by other processes) while
+    a worker is free. Jobs left running by a process that died on this host
+    are put back to pending when a runner starts and resume from their
+    checkpoint.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 2,
+        max_pending: int = 20,
+        poll_seconds: float = 5.0,
+    ):
+        """Initialize the runner.
+
+        Args:
+            store: Job store
+            workers: Jobs run at once by this process
+            max_pending: Pending jobs allowed before submissions are rejected
+            poll_seconds: Longest sleep between checks for jobs from other processes
+        """
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._handlers: dict[str, Callable[[JobContext], Any]] = {}
+        self._bumps: dict[str, tuple[str, ...]] = {}
+        self._running: dict[str, JobContext] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, kind: str, bumps: tuple[str, ...] = ()) -> Callable:
+        """Decorator registering a job function ``fn(ctx: JobContext) -> result``.
+
+        Args:
+            kind: Job kind name
+            bumps: Cached API resources the job changes (bumped when it ends)
+        """
+
+        def decorator(fn: Callable[[JobContext], Any]) -> Callable[[JobContext], Any]:
+            self._handlers[kind] = fn
+            self._bumps[kind] = bumps
+            return fn
+
+        return decorator
+
+    # -------------------------------------------------------------------------
+    # API
+    # -------------------------------------------------------------------------
+
+    def submit(self, kind: str, params: dict) -> tuple[dict, bool]:
+        """Queue a job (or get the identical one already queued or running).
+
+        Returns:
+            Tuple of (job, created)
+
+        Raises:
+            KeyError: If the kind is not registered
+            ExecutorBusyError: If too many jobs are pending
+        """
+        if kind not in self._handlers:
+            raise KeyError(f"Unknown job kind: {kind}")
+        job, created = self.store.create(kind, params, self.max_pending)
+        if created:
+            logger.info(f"Queued {kind} job {job['id']}")
+            self._wake.set()
+        return job, created
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def list_jobs(
+        self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50
+    ) -> list[dict]:
+        return self.store.list_jobs(status=status, kind=kind, limit=limit)
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a job (running jobs stop at their next progress update)."""
+        return self.store.request_cancel(job_id)
+
+    def resume(self, job_id: str) -> Optional[dict]:
+        """Resume a failed or cancelled job from its checkpoint."""
+        job = self.store.resume(job_id)
+        if job:
+            self._wake.set()
+        return job
+
+    def stats(self) -> dict:
+        """Runner load."""
+        with self._lock:
+            running = list(self._running)
+        return {
+            "workers": self.workers,
+            "running": running,
+            "pending": self.store.count("pending"),
+        }
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self, retention_seconds: Optional[float] = None):
+        """Recover abandoned jobs and start dispatching."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        requeued = self.store.requeue_abandoned(self._is_abandoned)
+        if requeued:
+            logger.warning(f"Requeued {requeued} jobs abandoned by stopped processes")
+        if retention_seconds:
+            self.store.purge(retention_seconds)
+
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._thread = threading.Thread(
+            target=self._dispatch_loop, name="job-dispatch", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop claiming jobs.
+
+        Running jobs are left to finish in the background; any cut short by the
+        process exiting are requeued (and resume) on the next start.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _is_abandoned(self, job_id: str, owner: Optional[str]) -> bool:
+        """Whether a running job's owner process on this host has exited."""
+        if not owner:
+            return True
+        host, _, pid = owner.rpartition(":")
+        if host != socket.gethostname() or not pid.isdigit():
+            return False  # Owned by another host; only it can tell
+        if int(pid) == os.getpid():
+            # Still running here if this runner was stopped and started again
+            with self._lock:
+                return job_id not in self._running
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    def _dispatch_loop(self):
+        """Claim pending jobs while workers are free."""
+        while not self._stop.is_set():
+            with self._lock:
+                free = self.workers - len(self._running)
+            job = None
+            if free > 0:
+                try:
+                    job = self.store.claim_next(self.owner, list(self._handlers))
+                except Exception as e:
+                    logger.error(f"Error claiming jobs: {e}")
+            if job is None:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+                continue
+
+            ctx = JobContext(self.store, job)
+            with self._lock:
+                self._running[ctx.job_id] = ctx
+            self._executor.submit(self._run, ctx)
+
+    def _run(self, ctx: JobContext):
+        """Execute one job on a worker thread."""
+        handler = self._handlers[ctx.kind]
+        logger.info(f"Running {ctx.kind} job {ctx.job_id}")
+        try:
+            result = handler(ctx)
+            self.store.finish(ctx.job_id, "succeeded", result=result)
+            logger.info(f"Job {ctx.job_id} succeeded")
+        except JobCancelledError:
+            self.store.finish(ctx.job_id, "cancelled")
+            logger.info(f"Job {ctx.job_id} cancelled at {ctx.done}/{ctx.total}")
+        except Exception as e:
+            self.store.finish(ctx.job_id, "failed", error=str(e))
+            logger.error(f"Job {ctx.job_id} failed: {e}")
+        finally:
+            with self._lock:
+                self._running.pop(ctx.job_id, None)
+            bumps = self._bumps.get(ctx.kind)
+            if bumps:
+                get_resource_versions().bump(*bumps)
+            self._wake.set()
+
+
+@lru_cache()
+def get_job_runner() -> JobRunner:
+    """Get the process-wide job runner (call start() to begin running jobs)."""
+    settings = get_settings()
+    path = settings.jobs_path or os.path.join(tempfile.gettempdir(), "hypertrending-jobs.sqlite")
+    return JobRunner(
+        JobStore(path),
+        workers=settings.job_workers,
+        max_pending=settings.job_max_pending,
+        poll_seconds=settings.job_poll_seconds,
+    )
@@ -1,14 +1,21 @@
 """Mission runner for executing trend hunting jobs."""
 
+import asyncio
 import logging
+import os
+import socket
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Optional
 from dataclasses import dataclass, field
 
 from ..config import get_settings, SourceCode, TimeWindow, REGIONS
-from ..fetchers import GoogleTrendsFetcher, TrendData
+from ..fetchers import AsyncGoogleTrendsFetcher, GoogleTrendsFetcher, TrendData
 from ..storage import SupabaseStorage
+from .pipeline import MissionPipeline
+from .planner import MissionPlanner, PlannedMission, is_due
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +34,7 @@ class MissionConfig:
     fetch_timeseries: bool = True
     fetch_related: bool = True
     keywords_filter: Optional[dict] = None  # {"include": [], "exclude": []}
+    concurrency: dict = field(default_factory=dict)  # {source_code: regions in flight}
 
     @classmethod
     def from_dict(cls, config: dict) -> "MissionConfig":
@@ -42,6 +50,7 @@ class MissionConfig:
             fetch_timeseries=config.get("fetch_timeseries", True),
             fetch_related=config.get("fetch_related", True),
             keywords_filter=config.get("keywords_filter"),
+            concurrency=config.get("concurrency") or {},
         )
 
 
@@ -55,6 +64,7 @@ class RunStats:
     keywords_matched: int = 0
     regions_scanned: int = 0
     api_calls_made: int = 0
+    api_calls_shared: int = 0  # Responses reused from another mission's request
     errors: list[str] = field(default_factory=list)
 
     @property
@@ -75,17 +85,24 @@ class RunStats:
             "keywords_matched": self.keywords_matched,
             "regions_scanned": self.regions_scanned,
             "api_calls_made": self.api_calls_made,
+            "api_calls_shared": self.api_calls_shared,
             "errors": self.errors,
         }
 
 
 class MissionRunner:
-    """Runner for executing trend hunting missions."""
+    """Runner for executing trend hunting missions.
+
+    Every run it creates records this process as its owner, and a background
+    thread refreshes the run's heartbeat while it executes, so schedulers on
+    any host can tell a long run from an abandoned one.
+    """
 
     def __init__(self):
         """Initialize the mission runner."""
         self.settings = get_settings()
         self.storage = SupabaseStorage()
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
         self._fetchers: dict[str, GoogleTrendsFetcher] = {}
 
     def get_fetcher(self, source_code: str) -> Optional[GoogleTrendsFetcher]:
@@ -99,6 +116,14 @@ class MissionRunner:
         logger.warning(f"No fetcher available for source: {source_code}")
         return None
 
+    def get_async_fetcher(self, source_code: str) -> Optional[AsyncGoogleTrendsFetcher]:
+        """Create an async fetcher for a source (caller closes it)."""
+        if source_code == SourceCode.GOOGLE_TRENDS:
+            return AsyncGoogleTrendsFetcher()
+
+        logger.warning(f"No fetcher available for source: {source_code}")
+        return None
+
     def run_mission(
         self,
         mission_id: str,
@@ -131,126 +156,234 @@ class MissionRunner:
         logger.info(f"Starting mission: {mission['name']} (ID: {mission_id})")
 
         # Create mission run
-        run_id = self.storage.create_mission_run(mission_id, triggered_by)
+        run_id = self.storage.create_mission_run(mission_id, triggered_by, owner=self.owner)
         if not run_id:
             stats.errors.append("Failed to create mission run")
             return False, stats
 
-        # Update run status to RUNNING
-        self.storage.update_mission_run(run_id, "RUNNING")
+        with self._heartbeat([run_id]):
+            # Update run status to RUNNING
+            self.storage.update_mission_run(run_id, "RUNNING")
 
-        try:
-            # Execute mission for each source
-            all_results: list[TrendData] = []
+            try:
+                # Stream fetch -> enrich -> filter -> store; results land while
+                # regions are in flight
+                stored_count = asyncio.run(self._run_pipeline(run_id, config, stats))
+                logger.info(f"Stored {stored_count} results for run {run_id}")
 
-            for source_code in config.sources:
-                fetcher = self.get_fetcher(source_code)
-                if not fetcher:
-                    continue
+                # Mark run as completed
+                self._complete_run(run_id, stats)
+                return True, stats
 
-                # Fetch for each region
-                for region in config.regions:
-                    logger.info(f"Fetching trends for {source_code} in {region}")
-                    stats.regions_scanned += 1
+            except Exception as e:
+                self._fail_run(run_id, stats, e)
+                return False, stats
 
-                    try:
-                        # Get trending keywords
-                        trending = fetcher.fetch_trending(
-                            region=region,
-                            limit=config.max_results_per_region,
-                        )
-                        stats.api_calls_made += 1
-                        stats.keywords_scanned += len(trending)
-
-                        # Enrich with timeseries if configured
-                        if config.fetch_timeseries and trending:
-                            keywords = [t.keyword for t in trending[:5]]  # Top 5 for timeseries
-                            for time_window in config.time_windows:
-                                try:
-                                    timeseries_data = fetcher.fetch_interest_over_time(
-                                        keywords=keywords,
-                                        region=region,
-                                        timeframe=time_window,
-                                    )
-                                    stats.api_calls_made += 1
-
-                                    # Merge timeseries into trending data
-                                    for trend in trending:
-                                        if trend.keyword in timeseries_data:
-                                            ts_data = timeseries_data[trend.keyword]
-                                            trend.timeseries = ts_data.timeseries
-                                            trend.calculate_from_timeseries()
-
-                                except Exception as e:
-                                    logger.error(f"Error fetching timeseries: {e}")
-                                    stats.errors.append(f"Timeseries error: {str(e)}")
-
-                        # Fetch related queries for top keywords
-                        if config.fetch_related and trending:
-                            for trend in trending[:3]:  # Top 3 for related queries
-                                try:
-                                    top_queries, rising_queries = fetcher.fetch_related_queries(
-                                        keyword=trend.keyword,
-                                        region=region,
-                                    )
-                                    stats.api_calls_made += 1
-                                    trend.related_queries = top_queries
-                                    trend.rising_queries = rising_queries
-                                except Exception as e:
-                                    logger.error(f"Error fetching related queries: {e}")
-
-                        # Filter results
-                        filtered = self._filter_results(trending, config)
-                        stats.keywords_matched += len(filtered)
-                        all_results.extend(filtered)
+    def run_missions(
+        self,
+        missions: Optional[list[dict]] = None,
+        triggered_by: Optional[str] = None,
+        due_only: bool = True,
+    ) -> dict[str, tuple[bool, RunStats]]:
+        """Execute several missions, issuing each distinct upstream request once.
 
-                    except Exception as e:
-                        logger.error(f"Error fetching from {source_code} for {region}: {e}")
-                        stats.errors.append(f"{source_code}/{region}: {str(e)}")
+        Missions that share regions and time windows share the trending,
+        timeseries and related-query requests; each mission still gets its own
+        filters, ranking, results and ``mission_runs`` row.
 
-            # Store results
-            if all_results:
-                # Sort by trend score and take top results
-                all_results.sort(key=lambda x: x.trend_score, reverse=True)
-                top_results = all_results[:config.max_results_per_region * len(config.regions)]
+        Args:
+            missions: Mission records (default: all active missions)
+            triggered_by: User UUID who triggered the runs
+            due_only: Skip missions whose next_run_at is in the future
 
+        Returns:
+            Dict mapping mission ID to (success, stats)
+        """
+        if missions is None:
+            missions = self.storage.get_active_missions()
+        if due_only:
+            missions = [m for m in missions if is_due(m)]
+
+        outcomes: dict[str, tuple[bool, RunStats]] = {}
+        planned: list[PlannedMission] = []
+
+        for mission in missions:
+            stats = RunStats()
+            if mission.get("status") != "ACTIVE":
+                stats.errors.append("Mission is not active")
+                outcomes[mission["id"]] = (False, stats)
+                continue
+
+            run_id = self.storage.create_mission_run(
+                mission["id"], triggered_by, owner=self.owner
+            )
+            if not run_id:
+                stats.errors.append("Failed to create mission run")
+                outcomes[mission["id"]] = (False, stats)
+                continue
+
+            self.storage.update_mission_run(run_id, "RUNNING")
+            planned.append(PlannedMission(
+                mission=mission,
+                config=MissionConfig.from_dict(mission.get("config") or {}),
+                stats=stats,
+                run_id=run_id,
+            ))
+
+        if not planned:
+            return outcomes
+
+        with self._heartbeat([item.run_id for item in planned]):
+            self._run_planned(planned, outcomes)
+        return outcomes
+
+    def _run_planned(
+        self, planned: list[PlannedMission], outcomes: dict[str, tuple[bool, RunStats]]
+    ):
+        """Execute created runs through one MissionPlanner, recording outcomes."""
+        logger.info(f"Running {len(planned)} missions with shared upstream requests")
+
+        fetchers = {}
+        for item in planned:
+            for source_code in item.config.sources:
+                if source_code not in fetchers:
+                    fetcher = self.get_async_fetcher(source_code)
+                    if fetcher:
+                        fetchers[source_code] = fetcher
+
+        planner = MissionPlanner(fetchers, self.source_concurrency)
+        try:
+            asyncio.run(planner.execute(planned))
+        except Exception as e:
+            for item in planned:
+                self._fail_run(item.run_id, item.stats, e)
+                outcomes[item.mission["id"]] = (False, item.stats)
+            return
+        finally:
+            for fetcher in fetchers.values():
+                fetcher.close()
+
+        for item in planned:
+            try:
+                top_results = planner.rank(item, self._filter_results)
                 stored_count = self.storage.store_mission_run_results(
-                    run_id=run_id,
+                    run_id=item.run_id,
                     trend_data_list=top_results,
-                    time_window=config.time_windows[0] if config.time_windows else TimeWindow.H24,
+                    time_window=planner.time_window(item.config),
                 )
-                logger.info(f"Stored {stored_count} results for run {run_id}")
+                logger.info(f"Stored {stored_count} results for run {item.run_id}")
+                self._complete_run(item.run_id, item.stats)
+                outcomes[item.mission["id"]] = (True, item.stats)
+            except Exception as e:
+                self._fail_run(item.run_id, item.stats, e)
+                outcomes[item.mission["id"]] = (False, item.stats)
 
-            # Mark run as completed
-            stats.completed_at = datetime.now(timezone.utc)
-            self.storage.update_mission_run(
-                run_id=run_id,
-                status="COMPLETED",
-                keywords_scanned=stats.keywords_scanned,
-                keywords_matched=stats.keywords_matched,
-                stats=stats.to_dict(),
-            )
+    @contextmanager
+    def _heartbeat(self, run_ids: list[str]):
+        """Refresh the runs' heartbeat in the background while the block runs."""
+        interval = self.settings.mission_run_heartbeat_seconds
+        if interval <= 0:
+            yield
+            return
 
-            logger.info(
-                f"Mission completed: {stats.keywords_matched}/{stats.keywords_scanned} keywords, "
-                f"{stats.duration_ms}ms"
-            )
-            return True, stats
+        done = threading.Event()
 
-        except Exception as e:
-            logger.error(f"Mission failed: {e}")
-            stats.completed_at = datetime.now(timezone.utc)
-            stats.errors.append(str(e))
+        def beat():
+            while not done.wait(interval):
+                self.storage.heartbeat_mission_runs(run_ids)
 
-            self.storage.update_mission_run(
+        thread = threading.Thread(target=beat, name="mission-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _complete_run(self, run_id: str, stats: RunStats):
+        """Mark a run as completed with its final stats."""
+        # The run's timeseries are durable before it is reported complete
+        self.storage.flush_timeseries()
+        stats.completed_at = datetime.now(timezone.utc)
+        self.storage.update_mission_run(
+            run_id=run_id,
+            status="COMPLETED",
+            keywords_scanned=stats.keywords_scanned,
+            keywords_matched=stats.keywords_matched,
+            stats=stats.to_dict(),
+        )
+
+        logger.info(
+            f"Mission completed: {stats.keywords_matched}/{stats.keywords_scanned} keywords, "
+            f"{stats.duration_ms}ms"
+        )
+
+    def _fail_run(self, run_id: str, stats: RunStats, error: Exception):
+        """Mark a run as failed."""
+        logger.error(f"Mission failed: {error}")
+        stats.completed_at = datetime.now(timezone.utc)
+        stats.errors.append(str(error))
+
+        self.storage.update_mission_run(
+            run_id=run_id,
+            status="FAILED",
+            keywords_scanned=stats.keywords_scanned,
+            keywords_matched=stats.keywords_matched,
+            error_message=str(error),
+            stats=stats.to_dict(),
+        )
+
+    def source_concurrency(self, source_code: str, config: Optional[MissionConfig] = None) -> int:
+        """Get how many regions of a source may be fetched at once.
+
+        Args:
+            source_code: Source code
+            config: Mission configuration with per-source overrides (optional)
+
+        Returns:
+            Concurrency limit (at least 1)
+        """
+        if config and source_code in config.concurrency:
+            return max(1, int(config.concurrency[source_code]))
+        return max(1, self.settings.mission_region_concurrency)
+
+    async def _run_pipeline(self, run_id: str, config: MissionConfig, stats: RunStats) -> int:
+        """Run the mission's sources through a streaming MissionPipeline.
+
+        Args:
+            run_id: Mission run UUID
+            config: Mission configuration
+            stats: Run statistics, updated in place
+
+        Returns:
+            Number of results stored
+        """
+        fetchers = {}
+        for source_code in config.sources:
+            fetcher = self.get_async_fetcher(source_code)
+            if fetcher:
+                fetchers[source_code] = fetcher
+
+        try:
+            pipeline = MissionPipeline(
+                storage=self.storage,
+                fetchers=fetchers,
+                config=config,
+                stats=stats,
                 run_id=run_id,
-                status="FAILED",
-                keywords_scanned=stats.keywords_scanned,
-                keywords_matched=stats.keywords_matched,
-                error_message=str(e),
-                stats=stats.to_dict(),
+                time_window=config.time_windows[0] if config.time_windows else TimeWindow.H24,
+                filter_results=self._filter_results,
+                concurrency={
+                    source_code: self.source_concurrency(source_code, config)
+                    for source_code in fetchers
+                },
+                queue_size=self.settings.pipeline_queue_size,
+                store_batch_size=self.settings.pipeline_store_batch_size,
             )
-            return False, stats
+            return await pipeline.run()
+        finally:
+            for fetcher in fetchers.values():
+                fetcher.close()
 
     def _filter_results(
         self,
@@ -310,20 +443,32 @@ class MissionRunner:
             List of TrendData from all regions
         """
         regions = regions or ["US"]
-        fetcher = self.get_fetcher(SourceCode.GOOGLE_TRENDS)
+        fetcher = self.get_async_fetcher(SourceCode.GOOGLE_TRENDS)
         if not fetcher:
             return []
 
-        all_results = []
+        slots = self.source_concurrency(SourceCode.GOOGLE_TRENDS)
 
-        for region in regions:
-            try:
-                trending = fetcher.fetch_trending(region=region, limit=limit)
-                all_results.extend(trending)
-            except Exception as e:
-                logger.error(f"Error in quick scan for {region}: {e}")
+        async def scan() -> list[list[TrendData]]:
+            semaphore = asyncio.Semaphore(slots)
+
+            async def scan_region(region: str) -> list[TrendData]:
+                async with semaphore:
+                    try:
+                        return await fetcher.fetch_trending(region=region, limit=limit)
+                    except Exception as e:
+                        logger.error(f"Error in quick scan for {region}: {e}")
+                        return []
 
-        return all_results
+            # gather keeps region order regardless of completion order
+            return await asyncio.gather(*(scan_region(region) for region in regions))
+
+        try:
+            per_region = asyncio.run(scan())
+        finally:
+            fetcher.close()
+
+        return [trend for trending in per_region for trend in trending]
 
     def run_keyword_analysis(
         self,
@@ -345,27 +490,41 @@ class MissionRunner:
         if not fetcher:
             return {}
 
-        results = {}
-
-        # Fetch in batches of 5 (pytrends limit)
-        for i in range(0, len(keywords), 5):
-            batch = keywords[i : i + 5]
-            try:
-                batch_results = fetcher.fetch_interest_over_time(
-                    keywords=batch,
-                    region=region,
-                    timeframe=timeframe,
-                )
-                results.update(batch_results)
-
-                # Fetch related queries for each
-                for keyword in batch:
-                    if keyword in results:
-                        top, rising = fetcher.fetch_related_queries(keyword, region, timeframe)
-                        results[keyword].related_queries = top
-                        results[keyword].rising_queries = rising
-
-            except Exception as e:
-                logger.error(f"Error analyzing keywords {batch}: {e}")
+        # Anchored payloads keep every keyword on one comparable 0-100 scale;
+        # a failed later batch only loses its own keywords
+        try:
+            results = fetcher.fetch_interest_over_time_batched(
+                keywords=keywords,
+                region=region,
+                timeframe=timeframe,
+            )
+        except Exception as e:
+            # Without the first payload there is no anchor: fetch batches of 5
+            # on their own scales, each failing alone
+            logger.error(f"Error analyzing keywords {keywords} on one scale: {e}")
+            results = {}
+            for i in range(0, len(keywords), 5):
+                batch = keywords[i : i + 5]
+                try:
+                    results.update(
+                        fetcher.fetch_interest_over_time(
+                            keywords=batch,
+                            region=region,
+                            timeframe=timeframe,
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Error analyzing keywords {batch}: {e}")
+
+        missing = [keyword for keyword in keywords if keyword not in results]
+        if missing:
+            logger.error(f"No interest data for keywords {missing}")
+
+        # Fetch related queries for each
+        for keyword in keywords:
+            if keyword in results:
+                top, rising = fetcher.fetch_related_queries(keyword, region, timeframe)
+                results[keyword].related_queries = top
+                results[keyword].rising_queries = rising
 
         return results
@@ -0,0 +1,414 @@
+"""Streaming, staged execution of a mission run."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Generic, Optional, TypeVar
+
+from ..fetchers import AsyncGoogleTrendsFetcher, TrendData
+from ..storage import SupabaseStorage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class _Ranked:
+    """Heap entry ordered by score, then by inverse order key (worst first)."""
+
+    __slots__ = ("score", "order", "item")
+
+    def __init__(self, score: float, order: Any, item: Any):
+        self.score = score
+        self.order = order
+        self.item = item
+
+    def __lt__(self, other: "_Ranked") -> bool:
+        if self.score != other.score:
+            return self.score < other.score
+        return self.order > other.order
+
+
+class TopK(Generic[T]):
+    """Keep the K highest-scoring items seen so far in O(K) memory.
+
+    Ties are broken by an order key (lower wins), so the result matches a
+    stable descending sort of the items by that key regardless of the order
+    in which they arrive.
+    """
+
+    def __init__(self, k: int):
+        """Initialize the structure.
+
+        Args:
+            k: Number of items to keep
+        """
+        self.k = k
+        self._heap: list[_Ranked] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, score: float, item: T, order: Any = None) -> tuple[bool, Optional[T]]:
+        """Offer an item.
+
+        Args:
+            score: Ranking score (higher is better)
+            item: Payload to keep
+            order: Tie-break key, lower ranks first (default: arrival order)
+
+        Returns:
+            Tuple of (kept, evicted): whether the item made the top K, and the
+            item it displaced (if any)
+        """
+        if self.k <= 0:
+            return False, None
+
+        entry = _Ranked(score, next(self._seq) if order is None else order, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True, None
+
+        # Heap minimum is the current worst entry
+        if not self._heap[0] < entry:
+            return False, None
+
+        evicted = heapq.heapreplace(self._heap, entry)
+        return True, evicted.item
+
+    def threshold(self) -> Optional[float]:
+        """Score an item must beat to enter a full top K (None while not full)."""
+        if len(self._heap) < self.k:
+            return None
+        return self._heap[0].score
+
+    def ranked(self) -> list[T]:
+        """Items in rank order (best first)."""
+        return [entry.item for entry in sorted(self._heap, reverse=True)]
+
+
+@dataclass
+class RegionBatch:
+    """Trending keywords for one source/region moving through the pipeline."""
+
+    source_code: str
+    region: str
+    order: int = 0  # Position in the (source, region) job list
+    trending: list[TrendData] = field(default_factory=list)
+
+
+class MissionPipeline:
+    """Run a mission as a chain of stages connected by bounded queues.
+
+    Stages: fetch trending -> enrich timeseries -> enrich related -> filter ->
+    store. Each region's keywords flow to the next stage as soon as they are
+    ready, and the store stage writes results while other regions are still
+    being fetched. Queues are bounded, so a slow stage applies back-pressure
+    instead of letting fetched data pile up in memory.
+
+    Each source gets its own concurrency limit in every stage, so up to
+    ``concurrency[source]`` regions of that source are in each fetch stage at
+    once. Stages never share a limit: a stage blocked on a full queue holds
+    only its own slots, so the next stage can always drain it. The shared
+    request budget in the fetchers still caps the overall request rate. Region
+    failures are recorded per region, and errors and tie-breaks are ordered by
+    (source, region) position, so concurrent runs produce the same output as
+    sequential ones.
+
+    Results are written with provisional ranks above ``top_k`` as they arrive.
+    The final ranking is kept in a :class:`TopK`; when the run finishes the
+    kept rows are re-ranked 1..K and rows pushed out of the top K are deleted.
+    """
+
+    def __init__(
+        self,
+        storage: SupabaseStorage,
+        fetchers: dict[str, AsyncGoogleTrendsFetcher],
+        config,
+        stats,
+        run_id: str,
+        time_window: str,
+        filter_results: Callable[[list[TrendData], Any], list[TrendData]],
+        concurrency: Optional[dict[str, int]] = None,
+        queue_size: int = 16,
+        store_batch_size: int = 25,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            storage: Storage client
+            fetchers: Async fetcher per source code
+            config: MissionConfig for the run
+            stats: RunStats updated as the stages progress
+            run_id: Mission run UUID
+            time_window: Time window recorded on results
+            filter_results: Applies the mission's filters to a region's results
+            concurrency: Regions in flight per source in each stage (default 1)
+            queue_size: Capacity of each inter-stage queue
+            store_batch_size: Max results written per insert
+        """
+        self.storage = storage
+        self.fetchers = fetchers
+        self.config = config
+        self.stats = stats
+        self.run_id = run_id
+        self.time_window = time_window
+        self.filter_results = filter_results
+        self.concurrency = {
+            source: max(1, (concurrency or {}).get(source, 1)) for source in fetchers
+        }
+        self.queue_size = queue_size
+        self.store_batch_size = store_batch_size
+
+        self.top_k = config.max_results_per_region * len(config.regions)
+        self.ranking: TopK[dict] = TopK(self.top_k)
+        self.stored = 0
+        self._provisional_rank = itertools.count(self.top_k + 1)
+        self._errors: list[tuple[int, int, str]] = []
+        self._error_seq = itertools.count()
+
+    async def run(self) -> int:
+        """Execute the pipeline for every source in ``fetchers``.
+
+        Returns:
+            Number of results kept in the final ranking
+        """
+        jobs_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        trending_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        timeseries_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        related_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        store_q: asyncio.Queue = asyncio.Queue(self.queue_size * self.store_batch_size)
+
+        jobs = [(source, region) for source in self.fetchers for region in self.config.regions]
+        workers = sum(self.concurrency.values())
+
+        try:
+            await _run_all([
+                self._produce(jobs, jobs_q),
+                self._stage(jobs_q, trending_q, self._fetch_trending, workers),
+                self._stage(trending_q, timeseries_q, self._enrich_timeseries, workers),
+                self._stage(timeseries_q, related_q, self._enrich_related, workers),
+                self._stage(related_q, store_q, self._filter),
+                self._store(store_q),
+            ])
+        finally:
+            # Report errors in job order, not completion order
+            self.stats.errors.extend(message for _, _, message in sorted(self._errors))
+
+        return await asyncio.to_thread(self._finalize)
+
+    # -------------------------------------------------------------------------
+    # Plumbing
+    # -------------------------------------------------------------------------
+
+    async def _produce(self, jobs: list[tuple[str, str]], outbox: asyncio.Queue):
+        """Feed the (source, region) jobs into the first stage."""
+        for order, (source_code, region) in enumerate(jobs):
+            await outbox.put(RegionBatch(source_code=source_code, region=region, order=order))
+        await outbox.put(_DONE)
+
+    async def _stage(
+        self,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        handler: Callable[[RegionBatch, asyncio.Queue], Awaitable[None]],
+        workers: int = 1,
+    ):
+        """Apply ``handler`` to every item on ``workers`` workers until the end marker arrives.
+
+        Each item also takes a slot from its source's semaphore for this stage,
+        so one source never has more than its configured number of regions in
+        the stage. The semaphores belong to the stage: sharing them with other
+        stages would let workers blocked on a full ``outbox`` hold the slots
+        the downstream stage needs to drain it.
+        """
+        slots = {source: asyncio.Semaphore(n) for source, n in self.concurrency.items()}
+
+        async def worker():
+            while True:
+                batch = await inbox.get()
+                if batch is _DONE:
+                    # Leave the marker for sibling workers
+                    await inbox.put(_DONE)
+                    return
+                slot = slots.get(batch.source_code)
+                if slot is None:
+                    await handler(batch, outbox)
+                    continue
+                async with slot:
+                    await handler(batch, outbox)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        await outbox.put(_DONE)
+
+    def _record_error(self, batch: RegionBatch, message: str):
+        """Record an error against its region, to be reported in job order."""
+        self._errors.append(
+            (batch.order, next(self._error_seq), f"{batch.source_code}/{batch.region}: {message}")
+        )
+
+    # -------------------------------------------------------------------------
+    # Stages
+    # -------------------------------------------------------------------------
+
+    async def _fetch_trending(self, batch: RegionBatch, outbox: asyncio.Queue):
+        """Fetch the trending list for one region."""
+        logger.info(f"Fetching trends for {batch.source_code} in {batch.region}")
+        self.stats.regions_scanned += 1
+
+        try:
+            batch.trending = await self.fetchers[batch.source_code].fetch_trending(
+                region=batch.region,
+                limit=self.config.max_results_per_region,
+            )
+        except Exception as e:
+            logger.error(f"Error fetching from {batch.source_code} for {batch.region}: {e}")
+            self._record_error(batch, str(e))
+            return
+
+        self.stats.api_calls_made += 1
+        self.stats.keywords_scanned += len(batch.trending)
+        if batch.trending:
+            await outbox.put(batch)
+
+    async def _enrich_timeseries(self, batch: RegionBatch, outbox: asyncio.Queue):
+        """Attach timeseries for the region's top keywords."""
+        fetcher = self.fetchers[batch.source_code]
+        trending = batch.trending
+
+        if self.config.fetch_timeseries:
+            keywords = [t.keyword for t in trending[:5]]  # Top 5 for timeseries
+            for time_window in self.config.time_windows:
+                try:
+                    timeseries_data = await fetcher.fetch_interest_over_time(
+                        keywords=keywords,
+                        region=batch.region,
+                        timeframe=time_window,
+                    )
+                    self.stats.api_calls_made += 1
+
+                    # Merge timeseries into trending data
+                    for trend in trending:
+                        if trend.keyword in timeseries_data:
+                            trend.timeseries = timeseries_data[trend.keyword].timeseries
+                            trend.calculate_from_timeseries()
+
+                except Exception as e:
+                    logger.error(f"Error fetching timeseries: {e}")
+                    self._record_error(batch, f"Timeseries error: {str(e)}")
+
+        await outbox.put(batch)
+
+    async def _enrich_related(self, batch: RegionBatch, outbox: asyncio.Queue):
+        """Attach related queries for the region's top keywords."""
+        fetcher = self.fetchers[batch.source_code]
+        trending = batch.trending
+
+        if self.config.fetch_related:
+            # Top 3 for related queries, fetched concurrently
+            top = trending[:3]
+            related = await asyncio.gather(
+                *(
+                    fetcher.fetch_related_queries(keyword=t.keyword, region=batch.region)
+                    for t in top
+                ),
+                return_exceptions=True,
+            )
+            for trend, result in zip(top, related):
+                if isinstance(result, Exception):
+                    logger.error(f"Error fetching related queries: {result}")
+                    continue
+                self.stats.api_calls_made += 1
+                trend.related_queries, trend.rising_queries = result
+
+        await outbox.put(batch)
+
+    async def _filter(self, batch: RegionBatch, outbox: asyncio.Queue):
+        """Apply the mission filters and pass matches on one by one."""
+        filtered = self.filter_results(batch.trending, self.config)
+        self.stats.keywords_matched += len(filtered)
+        for position, trend in enumerate(filtered):
+            await outbox.put(((batch.order, position), trend))
+
+    async def _store(self, inbox: asyncio.Queue):
+        """Write results in small batches as they arrive."""
+        done = False
+        while not done:
+            pending = [await inbox.get()]
+            while len(pending) < self.store_batch_size and not inbox.empty():
+                pending.append(inbox.get_nowait())
+
+            if pending[-1] is _DONE:
+                pending.pop()
+                done = True
+
+            candidates = [(order, t) for order, t in pending if self._ranks(t)]
+            if candidates:
+                await asyncio.to_thread(self._write, candidates)
+
+    # -------------------------------------------------------------------------
+    # Ranking and writes
+    # -------------------------------------------------------------------------
+
+    def _ranks(self, trend: TrendData) -> bool:
+        """Whether a result could still make the final top K."""
+        threshold = self.ranking.threshold()
+        return threshold is None or trend.trend_score >= threshold
+
+    def _write(self, trends: list[tuple[tuple[int, int], TrendData]]):
+        """Store keywords, timeseries and provisional result rows."""
+        built = self.storage.build_mission_results(
+            run_id=self.run_id,
+            trend_data_list=[trend for _, trend in trends],
+            time_window=self.time_window,
+            ranks=[next(self._provisional_rank) for _ in trends],
+        )
+
+        rows = []
+        for (order, trend), row in zip(trends, built):
+            if not row:
+                continue
+
+            kept, evicted = self.ranking.push(trend.trend_score, row, order)
+            if kept:
+                rows.append(row)
+            if evicted is not None:
+                # Rows already written are removed in _finalize
+                rows = [r for r in rows if r is not evicted]
+
+        if rows:
+            self.stored += self.storage.upsert_mission_results(rows)
+            logger.info(
+                f"Streamed {len(rows)} results for run {self.run_id} ({self.stored} so far)"
+            )
+
+    def _finalize(self) -> int:
+        """Assign final ranks and drop rows that fell out of the top K."""
+        ranked = self.ranking.ranked()
+        for rank, row in enumerate(ranked, start=1):
+            row["rank_position"] = rank
+
+        if ranked:
+            self.storage.upsert_mission_results(ranked)
+        self.storage.delete_mission_results(self.run_id, min_rank=self.top_k + 1)
+
+        logger.info(f"Stored {len(ranked)} results for run {self.run_id}")
+        return len(ranked)
+
+
+async def _run_all(coroutines: list[Awaitable[Any]]):
+    """Run coroutines concurrently; if one fails, cancel the rest and re-raise."""
+    tasks = [asyncio.ensure_future(coro) for coro in coroutines]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
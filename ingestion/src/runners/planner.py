@@ -0,0 +1,281 @@
+"""Shared execution of upstream requests across concurrently due missions."""
+
+import asyncio
+import dataclasses
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Hashable, Optional
+
+from ..config import TimeWindow
+from ..fetchers import AsyncGoogleTrendsFetcher, TrendData
+from .pipeline import TopK
+
+logger = logging.getLogger(__name__)
+
+
+def is_due(mission: dict, now: Optional[datetime] = None) -> bool:
+    """Whether a mission's next_run_at has passed (missions never scheduled are due)."""
+    next_run_at = mission.get("next_run_at")
+    if not next_run_at:
+        return True
+    now = now or datetime.now(timezone.utc)
+    return datetime.fromisoformat(str(next_run_at).replace("Z", "+00:00")) <= now
+
+
+@dataclass
+class PlannedMission:
+    """One mission's share of a fetch plan."""
+
+    mission: dict
+    config: Any  # MissionConfig
+    stats: Any  # RunStats
+    run_id: Optional[str] = None
+    results: list[tuple[str, list[TrendData]]] = field(default_factory=list)  # (region, trending)
+
+
+@dataclass
+class FetchPlan:
+    """Distinct upstream requests needed by a set of missions.
+
+    Trending lists are fetched once per (source, region) at the largest limit
+    any mission asked for; each mission then reads a prefix of that list,
+    which is what a smaller limit would have returned. Timeseries and related
+    queries are keyed by their exact payload, so two missions only share a
+    request when they would have sent the same one.
+    """
+
+    missions: list[PlannedMission]
+    # (source, region) -> limit
+    trending: dict[tuple[str, str], int] = field(default_factory=dict)
+    # (source, region, window, keywords) -> None
+    interest: dict[tuple[str, str, str, tuple[str, ...]], None] = field(default_factory=dict)
+    # (source, region, keyword) -> None
+    related: dict[tuple[str, str, str], None] = field(default_factory=dict)
+
+    @property
+    def requests_planned(self) -> int:
+        """Upstream requests in the plan."""
+        return len(self.trending) + len(self.interest) + len(self.related)
+
+
+class MissionPlanner:
+    """Run many missions while issuing each distinct upstream request once.
+
+    Planning happens in two phases because timeseries and related-query
+    payloads depend on the trending lists: first every distinct trending list
+    is fetched, then the missions' timeseries and related requests are
+    derived from those lists, deduplicated and executed. Each mission then
+    gets its own copy of the results, enriched exactly as a standalone
+    ``run_mission`` would have enriched them, and goes through its own
+    filters, ranking and ``mission_runs`` row.
+    """
+
+    def __init__(
+        self,
+        fetchers: dict[str, AsyncGoogleTrendsFetcher],
+        concurrency: Callable[[str], int],
+    ):
+        """Initialize the planner.
+
+        Args:
+            fetchers: Async fetcher per source code
+            concurrency: Requests in flight allowed per source
+        """
+        self.fetchers = fetchers
+        self.concurrency = concurrency
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._responses: dict[Hashable, Any] = {}
+        self._failures: dict[Hashable, str] = {}
+
+    # -------------------------------------------------------------------------
+    # Planning
+    # -------------------------------------------------------------------------
+
+    def plan_trending(self, planned: list[PlannedMission]) -> FetchPlan:
+        """Collect the distinct trending requests for the missions."""
+        plan = FetchPlan(missions=planned)
+        for item in planned:
+            for source_code in item.config.sources:
+                if source_code not in self.fetchers:
+                    continue
+                for region in item.config.regions:
+                    key = (source_code, region)
+                    plan.trending[key] = max(
+                        plan.trending.get(key, 0), item.config.max_results_per_region
+                    )
+        return plan
+
+    def plan_enrichment(self, plan: FetchPlan):
+        """Collect the distinct timeseries and related requests, given trending lists."""
+        for item in plan.missions:
+            for source_code, region, trending in self._mission_trending(item):
+                if item.config.fetch_timeseries and trending:
+                    keywords = tuple(t.keyword for t in trending[:5])  # Top 5 for timeseries
+                    for window in item.config.time_windows:
+                        plan.interest[(source_code, region, window, keywords)] = None
+
+                if item.config.fetch_related:
+                    for trend in trending[:3]:  # Top 3 for related queries
+                        plan.related[(source_code, region, trend.keyword)] = None
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    async def execute(self, planned: list[PlannedMission]) -> FetchPlan:
+        """Fetch everything the missions need and build each mission's results.
+
+        Args:
+            planned: Missions with their configs and (already created) runs
+
+        Returns:
+            The executed plan; each PlannedMission has ``results`` and ``stats`` filled in
+        """
+        self._slots = {
+            source: asyncio.Semaphore(max(1, self.concurrency(source))) for source in self.fetchers
+        }
+
+        plan = self.plan_trending(planned)
+        await asyncio.gather(*(
+            self._fetch(
+                ("trending", source, region),
+                source,
+                lambda f, region=region, limit=limit: f.fetch_trending(region=region, limit=limit),
+            )
+            for (source, region), limit in plan.trending.items()
+        ))
+
+        self.plan_enrichment(plan)
+        await asyncio.gather(
+            *(
+                self._fetch(
+                    ("interest", source, region, window, keywords),
+                    source,
+                    lambda f, k=list(keywords), region=region, window=window: (
+                        f.fetch_interest_over_time(keywords=k, region=region, timeframe=window)
+                    ),
+                )
+                for source, region, window, keywords in plan.interest
+            ),
+            *(
+                self._fetch(
+                    ("related", source, region, keyword),
+                    source,
+                    lambda f, keyword=keyword, region=region: (
+                        f.fetch_related_queries(keyword=keyword, region=region)
+                    ),
+                )
+                for source, region, keyword in plan.related
+            ),
+        )
+
+        used: set[Hashable] = set()
+        for item in plan.missions:
+            self._assemble(item, used)
+
+        logger.info(
+            f"Executed {plan.requests_planned} upstream requests for {len(planned)} missions"
+        )
+        return plan
+
+    async def _fetch(self, key: Hashable, source_code: str, call: Callable):
+        """Run one planned request under its source's concurrency limit."""
+        async with self._slots[source_code]:
+            try:
+                self._responses[key] = await call(self.fetchers[source_code])
+            except Exception as e:
+                logger.error(f"Planned request {key} failed: {e}")
+                self._failures[key] = str(e)
+
+    def _mission_trending(self, item: PlannedMission):
+        """Yield (source, region, trending prefix) for a mission, in job order."""
+        for source_code in item.config.sources:
+            if source_code not in self.fetchers:
+                continue
+            for region in item.config.regions:
+                trending = self._responses.get(("trending", source_code, region))
+                if trending is None:
+                    continue
+                yield source_code, region, trending[: item.config.max_results_per_region]
+
+    def _use(self, item: PlannedMission, key: Hashable, used: set) -> Any:
+        """Look up a response for a mission, attributing the request to the first user."""
+        if key not in self._responses:
+            return None
+        if key in used:
+            item.stats.api_calls_shared += 1
+        else:
+            used.add(key)
+            item.stats.api_calls_made += 1
+        return self._responses[key]
+
+    def _assemble(self, item: PlannedMission, used: set):
+        """Build one mission's enriched, filtered results from the shared responses."""
+        config, stats = item.config, item.stats
+
+        for source_code in config.sources:
+            if source_code not in self.fetchers:
+                continue
+            for region in config.regions:
+                stats.regions_scanned += 1
+                key = ("trending", source_code, region)
+                if key in self._failures:
+                    stats.errors.append(f"{source_code}/{region}: {self._failures[key]}")
+                    continue
+
+                shared = self._use(item, key, used) or []
+                # Copies, so enrichment for this mission never leaks into another's
+                trending = [
+                    dataclasses.replace(t) for t in shared[: config.max_results_per_region]
+                ]
+                stats.keywords_scanned += len(trending)
+
+                if config.fetch_timeseries and trending:
+                    keywords = tuple(t.keyword for t in trending[:5])
+                    for window in config.time_windows:
+                        key = ("interest", source_code, region, window, keywords)
+                        if key in self._failures:
+                            stats.errors.append(
+                                f"{source_code}/{region}: Timeseries error: {self._failures[key]}"
+                            )
+                            continue
+                        timeseries_data = self._use(item, key, used) or {}
+                        for trend in trending:
+                            if trend.keyword in timeseries_data:
+                                trend.timeseries = timeseries_data[trend.keyword].timeseries
+                                trend.calculate_from_timeseries()
+
+                if config.fetch_related:
+                    for trend in trending[:3]:
+                        key = ("related", source_code, region, trend.keyword)
+                        related = self._use(item, key, used)
+                        if related is not None:
+                            trend.related_queries, trend.rising_queries = related
+
+                item.results.append((region, trending))
+
+    @staticmethod
+    def rank(item: PlannedMission, filter_results: Callable) -> list[TrendData]:
+        """Filter and rank a mission's results as ``run_mission`` would.
+
+        Args:
+            item: Assembled mission
+            filter_results: The runner's filter function
+
+        Returns:
+            Top results, best first
+        """
+        config = item.config
+        ranking: TopK[TrendData] = TopK(config.max_results_per_region * len(config.regions))
+        for region_index, (_, trending) in enumerate(item.results):
+            filtered = filter_results(trending, config)
+            item.stats.keywords_matched += len(filtered)
+            for position, trend in enumerate(filtered):
+                ranking.push(trend.trend_score, trend, (region_index, position))
+        return ranking.ranked()
+
+    @staticmethod
+    def time_window(config) -> str:
+        """Time window recorded on a mission's results."""
+        return config.time_windows[0] if config.time_windows else TimeWindow.H24
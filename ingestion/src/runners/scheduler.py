@@ -0,0 +1,293 @@
+"""Long-running scheduler that executes missions when their next_run_at comes due."""
+
+import heapq
+import logging
+import signal
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import schedule
+
+from ..config import get_settings
+from ..storage import SupabaseStorage
+from ..utils.cron import next_run_time
+from .mission_runner import MissionRunner
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    """Parse a timestamptz string from PostgREST."""
+    if not value:
+        return None
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class MissionScheduler:
+    """Run active missions on their schedules from a single process.
+
+    Missions are held in a priority queue ordered by ``next_run_at`` (missions
+    that were never scheduled are due immediately). Before a run starts its
+    ``next_run_at`` is advanced with a compare-and-set, which doubles as a
+    claim so several daemons can share one database without running a mission
+    twice. The missions claimed together are handed to a bounded worker pool
+    as one batch and run through :meth:`MissionRunner.run_missions`, so
+    missions due at the same time share their upstream requests.
+
+    Housekeeping runs on the ``schedule`` library: the queue is periodically
+    refreshed from the database (new, edited and paused missions), and runs
+    whose heartbeat is older than ``stale_run_minutes`` - their owner, a
+    daemon or CLI process on any host, stopped - are marked FAILED and their
+    missions made due again.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        poll_seconds: Optional[int] = None,
+        refresh_seconds: Optional[int] = None,
+        stale_run_minutes: Optional[int] = None,
+        runner_factory: Callable[[], MissionRunner] = MissionRunner,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            workers: Missions run at once (default from settings)
+            poll_seconds: Longest sleep between queue checks (default from settings)
+            refresh_seconds: Interval for reloading missions (default from settings)
+            stale_run_minutes: Heartbeat age after which PENDING/RUNNING runs are
+                recovered
+            runner_factory: Creates a MissionRunner per worker thread
+        """
+        self.settings = get_settings()
+        self.workers = workers or self.settings.scheduler_workers
+        self.poll_seconds = poll_seconds or self.settings.scheduler_poll_seconds
+        self.refresh_seconds = refresh_seconds or self.settings.scheduler_refresh_seconds
+        self.stale_run_minutes = stale_run_minutes or self.settings.scheduler_stale_run_minutes
+        self.runner_factory = runner_factory
+
+        self.storage = SupabaseStorage()
+        self._heap: list[tuple[datetime, str]] = []
+        self._missions: dict[str, dict] = {}  # mission_id -> latest scheduling row
+        self._running: dict[str, Future] = {}  # mission_id -> its batch
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mission")
+        self._housekeeping = schedule.Scheduler()
+
+    # -------------------------------------------------------------------------
+    # Queue
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def due_at(mission: dict) -> datetime:
+        """When a mission is next due (epoch start if never scheduled)."""
+        return _parse_ts(mission.get("next_run_at")) or datetime.min.replace(tzinfo=timezone.utc)
+
+    def refresh(self):
+        """Reload active missions and rebuild the priority queue."""
+        missions = self.storage.get_scheduled_missions()
+        with self._lock:
+            self._missions = {m["id"]: m for m in missions}
+            self._heap = [(self.due_at(m), m["id"]) for m in missions]
+            heapq.heapify(self._heap)
+        logger.debug(f"Scheduler tracking {len(missions)} active missions")
+
+    def _pop_due(self, now: datetime) -> Optional[dict]:
+        """Pop the most overdue mission that is not already running."""
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, mission_id = heapq.heappop(self._heap)
+                mission = self._missions.get(mission_id)
+                # Skip entries superseded by a refresh, and missions still running
+                if mission is None or self.due_at(mission) != due or mission_id in self._running:
+                    continue
+                return mission
+        return None
+
+    def _reschedule(self, mission: dict, next_run_at: datetime):
+        """Record a mission's new next_run_at in the local queue."""
+        with self._lock:
+            updated = {**mission, "next_run_at": next_run_at.isoformat()}
+            self._missions[mission["id"]] = updated
+            heapq.heappush(self._heap, (next_run_at, mission["id"]))
+
+    def seconds_until_next(self, now: datetime) -> float:
+        """Seconds until the earliest queued mission is due, capped at poll_seconds."""
+        with self._lock:
+            if not self._heap:
+                return float(self.poll_seconds)
+            wait = (self._heap[0][0] - now).total_seconds()
+        return max(0.0, min(wait, float(self.poll_seconds)))
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> int:
+        """Claim every due mission and start them as one batch on a free worker.
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            Number of missions started
+        """
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            busy = len(set(self._running.values()))
+        if busy >= self.workers:
+            return 0
+
+        batch: list[dict] = []
+        while True:
+            mission = self._pop_due(now)
+            if mission is None:
+                break
+
+            next_run_at = self._next_run(mission, now)
+            claimed = self.storage.claim_mission(
+                mission["id"], mission.get("next_run_at"), next_run_at
+            )
+            if not claimed:
+                # Another daemon took it (or it was edited); pick up the new state on refresh
+                logger.debug(f"Mission {mission['id']} was claimed elsewhere")
+                continue
+
+            self._reschedule(mission, next_run_at)
+            batch.append(mission)
+            logger.info(
+                f"Dispatched mission {mission.get('name', mission['id'])}; "
+                f"next run at {next_run_at.isoformat()}"
+            )
+
+        if not batch:
+            return 0
+
+        mission_ids = [mission["id"] for mission in batch]
+        future = self._executor.submit(self._run, mission_ids)
+        with self._lock:
+            for mission_id in mission_ids:
+                self._running[mission_id] = future
+        future.add_done_callback(lambda _: self._finished(mission_ids))
+        return len(batch)
+
+    def _next_run(self, mission: dict, now: datetime) -> datetime:
+        """Next run time after ``now`` for a mission's schedule."""
+        try:
+            return next_run_time(
+                mission.get("schedule_cron"), now, self.settings.fetch_interval_minutes
+            )
+        except ValueError as e:
+            logger.warning(
+                f"Invalid schedule_cron for mission {mission['id']} ({e}); "
+                f"using {self.settings.fetch_interval_minutes} minute interval"
+            )
+            return next_run_time(None, now, self.settings.fetch_interval_minutes)
+
+    def _runner(self) -> MissionRunner:
+        """Get this worker thread's MissionRunner."""
+        runner = getattr(self._local, "runner", None)
+        if runner is None:
+            runner = self.runner_factory()
+            self._local.runner = runner
+        return runner
+
+    def _run(self, mission_ids: list[str]):
+        """Execute a batch of claimed missions on a worker thread."""
+        try:
+            # The queue only holds scheduling fields; runs use the current config
+            missions = self.storage.get_missions(mission_ids)
+            outcomes = self._runner().run_missions(missions, due_only=False)
+            for mission in missions:
+                success, stats = outcomes[mission["id"]]
+                logger.info(
+                    f"Mission {mission.get('name', mission['id'])} "
+                    f"{'completed' if success else 'failed'} in {stats.duration_ms}ms"
+                )
+        except Exception as e:
+            logger.error(f"Missions {mission_ids} raised: {e}")
+
+    def _finished(self, mission_ids: list[str]):
+        """Release a batch's slot when its runs end."""
+        with self._lock:
+            for mission_id in mission_ids:
+                self._running.pop(mission_id, None)
+
+    # -------------------------------------------------------------------------
+    # Recovery
+    # -------------------------------------------------------------------------
+
+    def recover_stale_runs(self) -> int:
+        """Fail runs abandoned in PENDING/RUNNING and make their missions due again.
+
+        A run is abandoned when its owner has not refreshed its heartbeat for
+        ``stale_run_minutes``; runs still executing anywhere keep theirs fresh
+        however long they take. The update re-checks the heartbeat, so a run
+        that reports in meanwhile is left alone.
+
+        Returns:
+            Number of runs recovered
+        """
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(minutes=self.stale_run_minutes)
+
+        recovered = 0
+        for run in self.storage.get_stale_runs(cutoff):
+            if not self.storage.abandon_mission_run(run, cutoff):
+                continue
+            self.storage.set_mission_next_run(run["mission_id"], now)
+            recovered += 1
+
+        if recovered:
+            logger.warning(f"Recovered {recovered} abandoned mission runs")
+            self.refresh()
+        return recovered
+
+    # -------------------------------------------------------------------------
+    # Main loop
+    # -------------------------------------------------------------------------
+
+    def stop(self, *_):
+        """Ask the loop to exit after in-flight missions finish."""
+        if not self._stop.is_set():
+            logger.info("Scheduler stopping; waiting for running missions")
+        self._stop.set()
+
+    def run_forever(self):
+        """Run the scheduler until SIGINT/SIGTERM."""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        logger.info(
+            f"Scheduler started: {self.workers} workers, poll {self.poll_seconds}s, "
+            f"refresh {self.refresh_seconds}s"
+        )
+
+        self.recover_stale_runs()
+        self.refresh()
+        self._housekeeping.every(self.refresh_seconds).seconds.do(self.refresh)
+        self._housekeeping.every(max(1, self.stale_run_minutes // 4)).minutes.do(
+            self.recover_stale_runs
+        )
+
+        try:
+            while not self._stop.is_set():
+                self._housekeeping.run_pending()
+                now = datetime.now(timezone.utc)
+                self.dispatch_due(now)
+
+                wait = self.seconds_until_next(now)
+                idle = self._housekeeping.idle_seconds
+                if idle is not None:
+                    wait = min(wait, max(0.0, idle))
+                # Wake at least once a second so finished workers free their slot promptly
+                self._stop.wait(min(max(wait, 0.1), 1.0))
+        finally:
+            self._executor.shutdown(wait=True)
+            self._housekeeping.clear()
+            logger.info("Scheduler stopped")
@@ -1,5 +1,15 @@
 """Storage layer for persisting data to Supabase."""
 
+from .keyword_cache import KeywordIdCache, get_keyword_cache
+from .pg_copy import PostgresCopyWriter
 from .supabase_client import SupabaseStorage
+from .write_buffer import TimeseriesWriteBuffer, get_timeseries_buffer
 
-__all__ = ["SupabaseStorage"]
+__all__ = [
+    "SupabaseStorage",
+    "KeywordIdCache",
+    "get_keyword_cache",
+    "PostgresCopyWriter",
+    "TimeseriesWriteBuffer",
+    "get_timeseries_buffer",
+]
@@ -0,0 +1,385 @@
+"""Process-wide keyword ID cache with deferred last_seen_at touches."""
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from supabase import Client
+
+from ..config import get_settings
+from ..utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordIdCache:
+    """Map (normalized_keyword, language) to keyword IDs without a lookup per write.
+
+    A keyword's ID never changes while it exists, so entries only go stale
+    when the keyword is deleted: whoever deletes keywords must call
+    :meth:`invalidate` (``SupabaseStorage.delete_keywords`` does), or writes
+    with the cached ID are rejected by the foreign key. The cache is bounded
+    in size (LRU) and can be warmed in bulk with the most recently seen
+    keywords.
+
+    Every write path used to bump ``keywords.last_seen_at`` with its own
+    UPDATE. Those touches are now collected and flushed as one
+    ``UPDATE ... WHERE id IN (...)`` when ``flush_batch_size`` IDs are pending,
+    when the oldest pending touch is ``flush_interval`` seconds old (a timer
+    fires even if nothing else is touched), or at process exit. Metadata
+    updates for known keywords are deferred the same way and written with one
+    ``upsert_keywords`` call, so writers keep using cached IDs.
+    ``last_seen_at`` and metadata may therefore lag by up to the flush
+    interval.
+    """
+
+    WARM_PAGE_SIZE = 1000
+
+    def __init__(
+        self,
+        max_size: int = 50_000,
+        warm_size: int = 10_000,
+        flush_interval: float = 30.0,
+        flush_batch_size: int = 200,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum keyword IDs kept
+            warm_size: Keywords loaded by :meth:`warm` by default
+            flush_interval: Max seconds a last_seen_at touch is deferred
+            flush_batch_size: Pending touches that trigger an immediate flush
+        """
+        self.max_size = max_size
+        self.warm_size = warm_size
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self._ids: LRUCache[tuple[str, str], str] = LRUCache(max_size)
+        self._pending: set[str] = set()
+        self._metadata: dict[str, dict] = {}
+        self._pending_since: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._client: Optional[Client] = None
+        self._lock = threading.Lock()
+        self._warmed = False
+
+    @staticmethod
+    def key(keyword: str, language: str = "en") -> tuple[str, str]:
+        """Cache key for a keyword (same normalization as keywords.normalized_keyword)."""
+        return keyword.lower().strip(), language or "en"
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def get(self, keyword: str, language: str = "en") -> Optional[str]:
+        """Get a cached keyword ID."""
+        return self._ids.get(self.key(keyword, language))
+
+    def put(self, keyword: str, keyword_id: str, language: str = "en"):
+        """Cache a keyword ID."""
+        self._ids.put(self.key(keyword, language), keyword_id)
+
+    def invalidate(self, keyword_ids: list[str]) -> int:
+        """Forget deleted keywords, including their pending touches and metadata.
+
+        Pending metadata would otherwise re-create the keyword on the next
+        flush (``upsert_keywords`` inserts missing keywords).
+
+        Args:
+            keyword_ids: Keyword UUIDs
+
+        Returns:
+            Number of cache entries removed
+        """
+        ids = set(keyword_ids)
+        with self._lock:
+            self._pending -= ids
+            for keyword_id in ids:
+                self._metadata.pop(keyword_id, None)
+        return self._ids.pop_values(ids)
+
+    def warm(self, client: Client, limit: Optional[int] = None, force: bool = False) -> int:
+        """Load the most recently seen keywords in bulk.
+
+        Args:
+            client: Supabase client
+            limit: Max keywords to load (default: ``warm_size``)
+            force: Reload even if this process already warmed the cache
+
+        Returns:
+            Number of keyword IDs loaded
+        """
+        if self._warmed and not force:
+            return 0
+        self._warmed = True
+        self._client = self._client or client
+
+        limit = min(limit or self.warm_size, self.max_size)
+        rows: list[dict] = []
+        try:
+            while len(rows) < limit:
+                start = len(rows)
+                end = min(start + self.WARM_PAGE_SIZE, limit) - 1
+                page = (
+                    client.table("keywords")
+                    .select("id, normalized_keyword, language")
+                    .order("last_seen_at", desc=True)
+                    .range(start, end)
+                    .execute()
+                ).data or []
+                rows.extend(page)
+                if len(page) < end - start + 1:
+                    break
+        except Exception as e:
+            logger.warning(f"Keyword cache warm-up stopped after {len(rows)} keywords: {e}")
+
+        # Insert least recent first so the most recent end up most recently used
+        self._ids.put_many(
+            ((row["normalized_keyword"], row.get("language") or "en"), row["id"])
+            for row in reversed(rows)
+        )
+        logger.info(f"Warmed keyword cache with {len(rows)} keywords")
+        return len(rows)
+
+    def get_or_create(self, client: Client, keyword: str, language: str = "en") -> Optional[str]:
+        """Resolve a keyword's ID, inserting the keyword if it does not exist.
+
+        Cache hits cost no round trip; the last_seen_at bump is deferred.
+
+        Args:
+            client: Supabase client
+            keyword: Keyword text
+            language: Language code
+
+        Returns:
+            Keyword UUID, or None if the insert returned nothing
+        """
+        keyword_id = self.get(keyword, language)
+        if keyword_id:
+            self.touch(keyword_id, client)
+            return keyword_id
+
+        normalized, language = self.key(keyword, language)
+        result = (
+            client.table("keywords")
+            .select("id")
+            .eq("normalized_keyword", normalized)
+            .eq("language", language)
+            .execute()
+        )
+        if result.data:
+            keyword_id = result.data[0]["id"]
+            self.touch(keyword_id, client)
+        else:
+            inserted = client.table("keywords").insert({
+                "keyword": keyword,
+                "language": language,
+            }).execute()
+            keyword_id = inserted.data[0]["id"] if inserted.data else None
+
+        if keyword_id:
+            self.put(keyword, keyword_id, language)
+        return keyword_id
+
+    def get_or_create_many(
+        self, client: Client, keywords: list[str], language: str = "en"
+    ) -> dict[str, str]:
+        """Resolve many keywords' IDs, inserting missing ones in one round trip.
+
+        Cache misses go through the ``upsert_keywords`` RPC; if it is
+        unavailable, each miss falls back to :meth:`get_or_create`.
+
+        Args:
+            client: Supabase client
+            keywords: Keyword texts
+            language: Language code
+
+        Returns:
+            Dict mapping each keyword (as given) to its UUID
+        """
+        ids: dict[str, str] = {}
+        missing: dict[str, str] = {}
+        for keyword in keywords:
+            keyword_id = self.get(keyword, language)
+            if keyword_id:
+                self.touch(keyword_id, client)
+                ids[keyword] = keyword_id
+            else:
+                missing.setdefault(self.key(keyword, language)[0], keyword)
+
+        if not missing:
+            return ids
+
+        try:
+            items = [{"keyword": keyword, "language": language} for keyword in missing.values()]
+            result = client.rpc("upsert_keywords", {"items": items}).execute()
+            for row in result.data or []:
+                self.put(row["normalized_keyword"], row["id"], row.get("language") or language)
+        except Exception as e:
+            logger.warning(f"Bulk keyword upsert failed, resolving keywords one by one: {e}")
+
+        for keyword in keywords:
+            if keyword not in ids:
+                keyword_id = self.get(keyword, language) or self.get_or_create(
+                    client, keyword, language
+                )
+                if keyword_id:
+                    ids[keyword] = keyword_id
+        return ids
+
+    # -------------------------------------------------------------------------
+    # Deferred last_seen_at touches
+    # -------------------------------------------------------------------------
+
+    def touch(self, keyword_id: str, client: Optional[Client] = None):
+        """Schedule a last_seen_at bump for a keyword.
+
+        Args:
+            keyword_id: Keyword UUID
+            client: Supabase client to flush with (the last one given is kept)
+        """
+        with self._lock:
+            if client is not None:
+                self._client = client
+            self._pending.add(keyword_id)
+            due = self._schedule()
+
+        if due:
+            self.flush()
+
+    def set_metadata(
+        self,
+        keyword_id: str,
+        keyword: str,
+        metadata: dict,
+        language: str = "en",
+        client: Optional[Client] = None,
+    ):
+        """Schedule a metadata update (and last_seen_at bump) for a known keyword.
+
+        Only the latest metadata per keyword is written.
+
+        Args:
+            keyword_id: Keyword UUID
+            keyword: Keyword text (the upsert key)
+            metadata: Metadata to store
+            language: Language code
+            client: Supabase client to flush with (the last one given is kept)
+        """
+        with self._lock:
+            if client is not None:
+                self._client = client
+            self._metadata[keyword_id] = {
+                "keyword": keyword,
+                "language": language or "en",
+                "metadata": metadata,
+            }
+            due = self._schedule()
+
+        if due:
+            self.flush()
+
+    def _schedule(self) -> bool:
+        """Start the flush timer for new pending writes (call with the lock held).
+
+        Returns:
+            Whether enough writes are pending to flush now
+        """
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        if self._timer is None and self.flush_interval > 0:
+            self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+        return len(self._pending) + len(self._metadata) >= self.flush_batch_size
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self, client: Optional[Client] = None) -> int:
+        """Write all pending metadata updates and last_seen_at touches.
+
+        Metadata goes out in one ``upsert_keywords`` call (which also bumps
+        last_seen_at), the remaining touches in one UPDATE.
+
+        Args:
+            client: Supabase client (default: the last one seen)
+
+        Returns:
+            Number of keywords written
+        """
+        with self._lock:
+            metadata = self._metadata
+            ids = [keyword_id for keyword_id in self._pending if keyword_id not in metadata]
+            self._metadata = {}
+            self._pending = set()
+            self._pending_since = None
+            client = client or self._client
+
+        if client is None:
+            return 0
+
+        written = 0
+        if metadata:
+            try:
+                client.rpc("upsert_keywords", {"items": list(metadata.values())}).execute()
+                logger.debug(f"Updated metadata for {len(metadata)} keywords")
+                written += len(metadata)
+            except Exception as e:
+                logger.error(f"Error updating metadata for {len(metadata)} keywords: {e}")
+                # Keep them for the next flush (newer updates win)
+                with self._lock:
+                    self._metadata = {**metadata, **self._metadata}
+                    self._schedule()
+
+        if ids:
+            try:
+                client.table("keywords").update(
+                    {"last_seen_at": datetime.now(timezone.utc).isoformat()}
+                ).in_("id", ids).execute()
+                logger.debug(f"Touched last_seen_at for {len(ids)} keywords")
+                written += len(ids)
+            except Exception as e:
+                logger.error(f"Error touching {len(ids)} keywords: {e}")
+                # Keep them for the next flush
+                with self._lock:
+                    self._pending.update(ids)
+                    self._schedule()
+
+        return written
+
+    @property
+    def pending(self) -> int:
+        """Touches and metadata updates waiting to be flushed."""
+        return len(self._pending | self._metadata.keys())
+
+    def stats(self) -> dict:
+        """Size and hit counters."""
+        return {
+            "entries": len(self._ids),
+            "max_size": self.max_size,
+            "hits": self._ids.hits,
+            "misses": self._ids.misses,
+            "pending_touches": self.pending,
+        }
+
+
+@lru_cache()
+def get_keyword_cache() -> KeywordIdCache:
+    """Get the process-wide keyword ID cache (pending touches are flushed at exit)."""
+    settings = get_settings()
+    cache = KeywordIdCache(
+        max_size=settings.keyword_cache_size,
+        warm_size=settings.keyword_cache_warm_size,
+        flush_interval=settings.keyword_touch_flush_seconds,
+        flush_batch_size=settings.keyword_touch_batch_size,
+    )
+    atexit.register(cache.flush)
+    return cache
@@ -0,0 +1,295 @@
+"""Bulk keyword_timeseries loads over a direct PostgreSQL connection using binary COPY."""
+
+import logging
+import struct
+import time
+from typing import Iterable, Iterator
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+from ..fetchers.series import TrendSeries
+
+try:
+    import psycopg2
+except ImportError:  # Optional: pip install "hypertrending-ingestion[postgres]"
+    psycopg2 = None
+
+logger = logging.getLogger(__name__)
+
+# PGCOPY binary header: signature, flags, header extension length
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+
+# Postgres timestamps count microseconds from 2000-01-01 UTC
+_PG_EPOCH_SECONDS = 946_684_800
+
+_STAGE_COLUMNS = "keyword_id, source_id, region, granularity, ts, interest_value, is_partial"
+
+_CREATE_STAGE = """
+create temp table if not exists keyword_timeseries_stage (
+    seq             bigint generated always as identity,
+    keyword_id      uuid not null,
+    source_id       uuid not null,
+    region          text not null,
+    granularity     text not null,
+    ts              timestamptz not null,
+    interest_value  smallint not null,
+    is_partial      boolean not null
+) on commit delete rows
+"""
+
+_COPY_STAGE = f"copy keyword_timeseries_stage ({_STAGE_COLUMNS}) from stdin with (format binary)"
+
+# Later rows for the same point win, matching the REST upsert
+_MERGE_STAGE = f"""
+insert into public.keyword_timeseries ({_STAGE_COLUMNS})
+select distinct on (keyword_id, source_id, region, granularity, ts)
+    keyword_id, source_id, region, granularity::public.time_granularity,
+    ts, interest_value, is_partial
+from keyword_timeseries_stage
+order by keyword_id, source_id, region, granularity, ts, seq desc
+on conflict on constraint keyword_timeseries_unique do update
+    set interest_value = excluded.interest_value,
+        is_partial = excluded.is_partial
+"""
+
+
+def encode_series(
+    keyword_id: str,
+    source_id: str,
+    region: str,
+    granularity: str,
+    series: TrendSeries,
+) -> bytes:
+    """Encode one series as PGCOPY binary tuples for the staging table.
+
+    The four leading columns are identical for every point of a series, so
+    they are encoded once and the tuples are laid out with a NumPy structured
+    array instead of per-row ``struct.pack`` calls.
+
+    Args:
+        keyword_id: Keyword UUID
+        source_id: Source UUID
+        region: Region code
+        granularity: Time granularity ('hour', 'day', ...)
+        series: Points to encode
+
+    Returns:
+        Binary tuples (without the COPY header/trailer)
+    """
+    return _encode(
+        keyword_id,
+        source_id,
+        region,
+        granularity,
+        (series.ts - _PG_EPOCH_SECONDS) * 1_000_000,
+        series.values,
+        series.partial,
+    )
+
+
+def encode_records(records: list[dict]) -> Iterator[tuple[int, bytes]]:
+    """Encode keyword_timeseries row dicts (as built by TrendSeries.to_records).
+
+    Args:
+        records: Row dicts with ISO ``ts`` strings
+
+    Yields:
+        (row count, binary tuples) per (keyword, source, region, granularity) group
+    """
+    groups: dict[tuple, list[dict]] = {}
+    for row in records:
+        key = (row["keyword_id"], row["source_id"], row["region"], row["granularity"])
+        groups.setdefault(key, []).append(row)
+
+    for (keyword_id, source_id, region, granularity), rows in groups.items():
+        micros = pd.to_datetime([r["ts"] for r in rows], utc=True).as_unit("us").asi8
+        yield len(rows), _encode(
+            keyword_id,
+            source_id,
+            region,
+            granularity,
+            micros - _PG_EPOCH_SECONDS * 1_000_000,
+            np.array([r["interest_value"] for r in rows]),
+            np.array([bool(r.get("is_partial")) for r in rows]),
+        )
+
+
+def _encode(
+    keyword_id: str,
+    source_id: str,
+    region: str,
+    granularity: str,
+    pg_micros: np.ndarray,
+    values: np.ndarray,
+    partial: np.ndarray,
+) -> bytes:
+    """Lay out binary COPY tuples for points sharing their key columns."""
+    region_bytes = region.encode()
+    granularity_bytes = str(granularity).encode()
+    prefix = b"".join([
+        struct.pack(">h", 7),
+        struct.pack(">i", 16), UUID(str(keyword_id)).bytes,
+        struct.pack(">i", 16), UUID(str(source_id)).bytes,
+        struct.pack(">i", len(region_bytes)), region_bytes,
+        struct.pack(">i", len(granularity_bytes)), granularity_bytes,
+    ])
+
+    rows = np.empty(len(pg_micros), dtype=np.dtype([
+        ("prefix", f"V{len(prefix)}"),
+        ("ts_len", ">i4"), ("ts", ">i8"),
+        ("value_len", ">i4"), ("value", ">i2"),
+        ("partial_len", ">i4"), ("partial", "u1"),
+    ]))
+    rows["prefix"] = np.void(prefix)
+    rows["ts_len"] = 8
+    rows["ts"] = pg_micros
+    rows["value_len"] = 2
+    rows["value"] = values
+    rows["partial_len"] = 1
+    rows["partial"] = partial
+    return rows.tobytes()
+
+
+class _CopyStream:
+    """File-like reader over encoded chunks, so a batch is never joined in memory."""
+
+    def __init__(self, chunks: list[bytes]):
+        self._chunks = iter([_COPY_HEADER, *chunks, _COPY_TRAILER])
+        self._current = memoryview(b"")
+        self._offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        parts: list[bytes] = []
+        wanted = size
+        while size < 0 or wanted > 0:
+            if self._offset >= len(self._current):
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._current, self._offset = memoryview(chunk), 0
+                continue
+            end = len(self._current) if size < 0 else min(len(self._current), self._offset + wanted)
+            parts.append(bytes(self._current[self._offset : end]))
+            wanted -= end - self._offset
+            self._offset = end
+        return b"".join(parts)
+
+
+class PostgresCopyWriter:
+    """Write keyword_timeseries rows with binary COPY into a staging table.
+
+    Each batch is one transaction: the rows are streamed into a temporary
+    staging table with ``COPY ... (FORMAT binary)`` and merged into
+    ``keyword_timeseries`` with a single ``INSERT ... SELECT ... ON CONFLICT``,
+    which deduplicates points within the batch (later rows win). Requires
+    ``psycopg2`` and a ``DATABASE_URL`` with direct database access.
+    """
+
+    def __init__(self, dsn: str, batch_rows: int = 200_000):
+        """Initialize the writer.
+
+        Args:
+            dsn: PostgreSQL connection string
+            batch_rows: Rows per COPY/merge transaction
+
+        Raises:
+            RuntimeError: If psycopg2 is not installed or no DSN is given
+        """
+        if psycopg2 is None:
+            raise RuntimeError(
+                "The COPY timeseries backend needs psycopg2 "
+                "(pip install 'hypertrending-ingestion[postgres]')"
+            )
+        if not dsn:
+            raise RuntimeError("The COPY timeseries backend needs DATABASE_URL")
+
+        self.dsn = dsn
+        self.batch_rows = batch_rows
+        self._conn = None
+
+    @property
+    def conn(self):
+        """Lazily opened connection (reopened if closed)."""
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(self.dsn)
+            with self._conn, self._conn.cursor() as cur:
+                cur.execute(_CREATE_STAGE)
+        return self._conn
+
+    def close(self):
+        """Close the connection."""
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self._conn = None
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def write_series(
+        self,
+        items: Iterable[tuple[str, str, str, str, TrendSeries]],
+    ) -> int:
+        """Load many series.
+
+        Args:
+            items: (keyword_id, source_id, region, granularity, series) tuples
+
+        Returns:
+            Number of rows merged
+        """
+        return self._write(
+            (len(series), encode_series(keyword_id, source_id, region, granularity, series))
+            for keyword_id, source_id, region, granularity, series in items
+            if len(series)
+        )
+
+    def write_records(self, records: list[dict]) -> int:
+        """Load keyword_timeseries row dicts.
+
+        Args:
+            records: Row dicts as built by TrendSeries.to_records
+
+        Returns:
+            Number of rows merged
+        """
+        return self._write(encode_records(records))
+
+    def _write(self, encoded: Iterable[tuple[int, bytes]]) -> int:
+        """Group encoded chunks into batches and load each one."""
+        merged = 0
+        chunks: list[bytes] = []
+        pending = 0
+        for count, chunk in encoded:
+            chunks.append(chunk)
+            pending += count
+            if pending >= self.batch_rows:
+                merged += self._load(chunks, pending)
+                chunks, pending = [], 0
+        if chunks:
+            merged += self._load(chunks, pending)
+        return merged
+
+    def _load(self, chunks: list[bytes], rows: int) -> int:
+        """COPY one batch into staging and merge it, in one transaction."""
+        started = time.perf_counter()
+        conn = self.conn
+        try:
+            with conn.cursor() as cur:
+                cur.copy_expert(_COPY_STAGE, _CopyStream(chunks))
+                cur.execute(_MERGE_STAGE)
+                merged = cur.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.debug(
+            f"COPY loaded {rows} timeseries rows ({merged} merged) "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return merged
+
@@ -2,13 +2,18 @@
 
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional, Union
 from uuid import UUID
 
 from supabase import create_client, Client
 
 from ..config import get_settings, SourceCode, TimeGranularity, TimeWindow
-from ..fetchers.base import TrendData, TimeseriesPoint
+from ..fetchers.base import TrendData
+from ..fetchers.series import TimeseriesPoint, TrendSeries
+from ..utils.versions import get_resource_versions
+from .keyword_cache import KeywordIdCache, get_keyword_cache
+from .pg_copy import PostgresCopyWriter
+from .write_buffer import TimeseriesWriteBuffer, get_timeseries_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +21,47 @@ logger = logging.getLogger(__name__)
 class SupabaseStorage:
     """Storage client for Supabase database operations."""
 
+    # Max keyword_timeseries rows per upsert request
+    TIMESERIES_BATCH_SIZE = 5000
+
     def __init__(self):
         """Initialize the Supabase client."""
         self.settings = get_settings()
         self._client: Optional[Client] = None
         self._source_cache: dict[str, str] = {}  # source_code -> source_id
+        self._copy_writer: Optional[PostgresCopyWriter] = None
+
+    @property
+    def keyword_cache(self) -> KeywordIdCache:
+        """Process-wide keyword ID cache, warmed from the database on first use."""
+        cache = get_keyword_cache()
+        cache.warm(self.client)
+        return cache
+
+    @property
+    def timeseries_buffer(self) -> TimeseriesWriteBuffer:
+        """Process-wide write-behind buffer for keyword_timeseries rows."""
+        return get_timeseries_buffer()
+
+    def flush_timeseries(self) -> int:
+        """Write any buffered timeseries rows now.
+
+        Returns:
+            Number of rows written
+        """
+        if not self.settings.timeseries_buffer_enabled:
+            return 0
+        return self.timeseries_buffer.flush(self.client)
+
+    @property
+    def copy_writer(self) -> PostgresCopyWriter:
+        """Direct-connection COPY writer for ``TIMESERIES_BACKEND=copy``."""
+        if self._copy_writer is None:
+            self._copy_writer = PostgresCopyWriter(
+                self.settings.database_url or "",
+                batch_rows=self.settings.timeseries_copy_batch_rows,
+            )
+        return self._copy_writer
 
     @property
     def client(self) -> Client:
@@ -97,28 +138,39 @@ class SupabaseStorage:
             Keyword UUID as string, or None on error
         """
         normalized = keyword.lower().strip()
+        cache = self.keyword_cache
+        keyword_id = cache.get(keyword, language)
 
         try:
-            # Try to find existing keyword
-            result = (
-                self.client.table("keywords")
-                .select("id")
-                .eq("normalized_keyword", normalized)
-                .eq("language", language)
-                .maybe_single()
-                .execute()
-            )
-
-            if result.data:
+            # Try to find existing keyword (cache hits skip the lookup)
+            if keyword_id is None:
+                result = (
+                    self.client.table("keywords")
+                    .select("id")
+                    .eq("normalized_keyword", normalized)
+                    .eq("language", language)
+                    .maybe_single()
+                    .execute()
+                )
+                if result and result.data:
+                    keyword_id = result.data["id"]
+
+            if keyword_id:
                 # Update existing
-                keyword_id = result.data["id"]
-                update_data = {"last_seen_at": datetime.now(timezone.utc).isoformat()}
+                update_data = {}
                 if category:
                     update_data["category"] = category
                 if metadata:
                     update_data["metadata"] = metadata
 
-                self.client.table("keywords").update(update_data).eq("id", keyword_id).execute()
+                if update_data:
+                    update_data["last_seen_at"] = datetime.now(timezone.utc).isoformat()
+                    self.client.table("keywords").update(update_data).eq("id", keyword_id).execute()
+                else:
+                    # Plain sightings are batched into one deferred UPDATE
+                    cache.touch(keyword_id, self.client)
+
+                cache.put(keyword, keyword_id, language)
                 return keyword_id
             else:
                 # Insert new
@@ -133,13 +185,108 @@ class SupabaseStorage:
 
                 result = self.client.table("keywords").insert(insert_data).execute()
                 if result.data:
-                    return result.data[0]["id"]
+                    keyword_id = result.data[0]["id"]
+                    cache.put(keyword, keyword_id, language)
+                    return keyword_id
 
         except Exception as e:
             logger.error(f"Error upserting keyword '{keyword}': {e}")
 
         return None
 
+    def upsert_keywords(self, items: list[dict]) -> dict[str, str]:
+        """Insert or touch many keywords in one round trip.
+
+        Uses the ``upsert_keywords`` RPC (one INSERT ... ON CONFLICT statement).
+        Falls back to :meth:`upsert_keyword` per item if the RPC is unavailable.
+
+        Args:
+            items: Dicts with ``keyword`` and optional ``language`` (default 'en'),
+                ``category`` and ``metadata``
+
+        Returns:
+            Dict mapping normalized keyword to keyword UUID
+        """
+        # Deduplicate on the unique key; the last occurrence wins
+        unique: dict[tuple[str, str], dict] = {}
+        for item in items:
+            normalized = item["keyword"].lower().strip()
+            if not normalized:
+                continue
+            payload = {"keyword": item["keyword"], "language": item.get("language") or "en"}
+            if item.get("category"):
+                payload["category"] = item["category"]
+            if item.get("metadata"):
+                payload["metadata"] = item["metadata"]
+            unique[(normalized, payload["language"])] = payload
+
+        cache = self.keyword_cache
+        ids: dict[str, str] = {}
+
+        # Known keywords only need a deferred last_seen_at touch (or metadata update)
+        for (normalized, language), payload in list(unique.items()):
+            if "category" in payload:
+                continue
+            keyword_id = cache.get(normalized, language)
+            if not keyword_id:
+                continue
+            if "metadata" in payload:
+                cache.set_metadata(
+                    keyword_id, payload["keyword"], payload["metadata"], language, self.client
+                )
+            else:
+                cache.touch(keyword_id, self.client)
+            ids[normalized] = keyword_id
+            del unique[(normalized, language)]
+
+        if not unique:
+            return ids
+
+        try:
+            result = self.client.rpc("upsert_keywords", {"items": list(unique.values())}).execute()
+            for row in result.data or []:
+                ids[row["normalized_keyword"]] = row["id"]
+                cache.put(row["normalized_keyword"], row["id"], row.get("language") or "en")
+            return ids
+
+        except Exception as e:
+            logger.warning(f"Bulk keyword upsert failed, falling back to per-keyword upserts: {e}")
+
+        for (normalized, language), payload in unique.items():
+            keyword_id = self.upsert_keyword(
+                keyword=payload["keyword"],
+                language=language,
+                category=payload.get("category"),
+                metadata=payload.get("metadata"),
+            )
+            if keyword_id:
+                ids[normalized] = keyword_id
+        return ids
+
+    def delete_keywords(self, keyword_ids: list[str]) -> int:
+        """Delete keywords (their timeseries and results cascade).
+
+        The keywords are also evicted from the keyword ID cache, so later
+        writes resolve (or re-create) them instead of using a dead ID.
+
+        Args:
+            keyword_ids: Keyword UUIDs
+
+        Returns:
+            Number of keywords deleted
+        """
+        if not keyword_ids:
+            return 0
+
+        get_keyword_cache().invalidate(keyword_ids)
+        try:
+            result = self.client.table("keywords").delete().in_("id", keyword_ids).execute()
+            return len(result.data) if result.data else 0
+
+        except Exception as e:
+            logger.error(f"Error deleting {len(keyword_ids)} keywords: {e}")
+            return 0
+
     def search_keywords(self, query: str, limit: int = 20) -> list[dict]:
         """Search keywords by text similarity.
 
@@ -174,7 +321,7 @@ class SupabaseStorage:
         source_id: str,
         region: str,
         granularity: str,
-        points: list[TimeseriesPoint],
+        points: Union[TrendSeries, list[TimeseriesPoint]],
     ) -> int:
         """Insert timeseries data points.
 
@@ -183,26 +330,24 @@ class SupabaseStorage:
             source_id: Source UUID
             region: Region code
             granularity: Time granularity ('hour', 'day', etc.)
-            points: List of TimeseriesPoint objects
+            points: TrendSeries (or a list of TimeseriesPoint objects)
 
         Returns:
-            Number of points inserted
+            Number of points inserted (or queued, when the write buffer is enabled)
         """
         if not points:
             return 0
 
-        records = []
-        for point in points:
-            records.append({
-                "keyword_id": keyword_id,
-                "source_id": source_id,
-                "region": region,
-                "granularity": granularity,
-                "ts": point.timestamp.isoformat(),
-                "interest_value": point.value,
-                "is_partial": point.is_partial,
-                "metadata": point.metadata,
-            })
+        series = points if isinstance(points, TrendSeries) else TrendSeries.from_points(points)
+        records = series.to_records(
+            keyword_id=keyword_id,
+            source_id=source_id,
+            region=region,
+            granularity=granularity,
+        )
+
+        if self.settings.timeseries_buffer_enabled:
+            return self.timeseries_buffer.add(records, self.client)
 
         try:
             # Use upsert to handle duplicates
@@ -213,12 +358,93 @@ class SupabaseStorage:
             )
             count = len(result.data) if result.data else 0
             logger.debug(f"Inserted {count} timeseries points for keyword {keyword_id}")
+            get_resource_versions().bump("trends")
             return count
 
         except Exception as e:
             logger.error(f"Error inserting timeseries: {e}")
             return 0
 
+    def upsert_timeseries_records(self, records: list[dict]) -> int:
+        """Upsert keyword_timeseries rows for many keywords in as few requests as possible.
+
+        Rows are deduplicated on the table's unique key (last row wins), since
+        one INSERT ... ON CONFLICT cannot update the same row twice, then sent
+        in chunks of ``TIMESERIES_BATCH_SIZE``. With ``TIMESERIES_BACKEND=copy``
+        they are loaded with binary COPY instead (see :class:`PostgresCopyWriter`).
+
+        Args:
+            records: Row dicts as built by TrendSeries.to_records
+
+        Returns:
+            Number of rows written
+        """
+        if not records:
+            return 0
+
+        if self.settings.timeseries_backend == "copy":
+            try:
+                count = self.copy_writer.write_records(records)
+                get_resource_versions().bump("trends")
+                return count
+            except Exception as e:
+                logger.error(f"COPY timeseries load failed, falling back to REST: {e}")
+
+        unique = {
+            (r["keyword_id"], r["source_id"], r["region"], r["granularity"], r["ts"]): r
+            for r in records
+        }
+        rows = list(unique.values())
+
+        count = 0
+        for i in range(0, len(rows), self.TIMESERIES_BATCH_SIZE):
+            chunk = rows[i : i + self.TIMESERIES_BATCH_SIZE]
+            try:
+                self.client.table("keyword_timeseries").upsert(
+                    chunk,
+                    on_conflict="keyword_id,source_id,region,granularity,ts",
+                    returning="minimal",
+                ).execute()
+                count += len(chunk)
+            except Exception as e:
+                logger.error(f"Error upserting {len(chunk)} timeseries rows: {e}")
+
+        logger.debug(f"Upserted {count} timeseries rows")
+        if count:
+            get_resource_versions().bump("trends")
+        return count
+
+    def load_timeseries(
+        self,
+        items: Iterable[tuple[str, str, str, str, TrendSeries]],
+    ) -> int:
+        """Bulk-load many series, e.g. for historical backfills.
+
+        Uses the configured backend directly (never the write-behind buffer):
+        binary COPY streams the columns without building row dicts, REST goes
+        through :meth:`upsert_timeseries_records`.
+
+        Args:
+            items: (keyword_id, source_id, region, granularity, series) tuples
+
+        Returns:
+            Number of rows written
+        """
+        if self.settings.timeseries_backend == "copy":
+            count = self.copy_writer.write_series(items)
+            get_resource_versions().bump("trends")
+            return count
+
+        records: list[dict] = []
+        for keyword_id, source_id, region, granularity, series in items:
+            records.extend(series.to_records(
+                keyword_id=keyword_id,
+                source_id=source_id,
+                region=region,
+                granularity=granularity,
+            ))
+        return self.upsert_timeseries_records(records)
+
     def get_timeseries(
         self,
         keyword_id: str,
@@ -304,6 +530,85 @@ class SupabaseStorage:
             logger.error(f"Error fetching active missions: {e}")
             return []
 
+    def get_missions(self, mission_ids: list[str]) -> list[dict]:
+        """Get several missions by ID (missing IDs are left out)."""
+        if not mission_ids:
+            return []
+        try:
+            result = (
+                self.client.table("missions")
+                .select("*")
+                .in_("id", mission_ids)
+                .execute()
+            )
+            return result.data or []
+        except Exception as e:
+            logger.error(f"Error fetching missions {mission_ids}: {e}")
+            return []
+
+    def get_scheduled_missions(self) -> list[dict]:
+        """Get the scheduling fields of all active missions."""
+        try:
+            result = (
+                self.client.table("missions")
+                .select("id, name, schedule_cron, next_run_at")
+                .eq("status", "ACTIVE")
+                .order("next_run_at", nullsfirst=True)
+                .execute()
+            )
+            return result.data or []
+
+        except Exception as e:
+            logger.error(f"Error fetching scheduled missions: {e}")
+            return []
+
+    def claim_mission(
+        self,
+        mission_id: str,
+        expected_next_run_at: Optional[str],
+        next_run_at: datetime,
+    ) -> bool:
+        """Advance a mission's next_run_at if nobody else has since it was read.
+
+        The compare-and-set on next_run_at makes the advance a claim: when
+        several daemons see the same due mission, only one update matches.
+
+        Args:
+            mission_id: Mission UUID
+            expected_next_run_at: next_run_at value as read (None if unset)
+            next_run_at: New next run time
+
+        Returns:
+            True if this caller claimed the run
+        """
+        try:
+            query = (
+                self.client.table("missions")
+                .update({"next_run_at": next_run_at.isoformat()})
+                .eq("id", mission_id)
+                .eq("status", "ACTIVE")
+            )
+            if expected_next_run_at is None:
+                query = query.is_("next_run_at", "null")
+            else:
+                query = query.eq("next_run_at", expected_next_run_at)
+
+            result = query.execute()
+            return bool(result.data)
+
+        except Exception as e:
+            logger.error(f"Error claiming mission {mission_id}: {e}")
+            return False
+
+    def set_mission_next_run(self, mission_id: str, next_run_at: datetime):
+        """Set a mission's next_run_at unconditionally."""
+        try:
+            self.client.table("missions").update(
+                {"next_run_at": next_run_at.isoformat()}
+            ).eq("id", mission_id).execute()
+        except Exception as e:
+            logger.error(f"Error updating next_run_at for mission {mission_id}: {e}")
+
     # -------------------------------------------------------------------------
     # Mission Runs
     # -------------------------------------------------------------------------
@@ -312,24 +617,30 @@ class SupabaseStorage:
         self,
         mission_id: str,
         triggered_by: Optional[str] = None,
+        owner: Optional[str] = None,
     ) -> Optional[str]:
         """Create a new mission run.
 
         Args:
             mission_id: Mission UUID
             triggered_by: User UUID who triggered the run (optional)
+            owner: Process executing the run, which keeps its heartbeat fresh
 
         Returns:
             Run UUID as string, or None on error
         """
         try:
+            now = datetime.now(timezone.utc).isoformat()
             insert_data = {
                 "mission_id": mission_id,
                 "status": "PENDING",
-                "started_at": datetime.now(timezone.utc).isoformat(),
+                "started_at": now,
+                "heartbeat_at": now,
             }
             if triggered_by:
                 insert_data["triggered_by"] = triggered_by
+            if owner:
+                insert_data["owner"] = owner
 
             result = self.client.table("mission_runs").insert(insert_data).execute()
             if result.data:
@@ -350,6 +661,7 @@ class SupabaseStorage:
         keywords_matched: int = 0,
         error_message: Optional[str] = None,
         stats: Optional[dict] = None,
+        error_code: Optional[str] = None,
     ):
         """Update a mission run's status and stats.
 
@@ -360,6 +672,7 @@ class SupabaseStorage:
             keywords_matched: Number of keywords that matched criteria
             error_message: Error message if failed
             stats: Additional stats dict
+            error_code: Short machine-readable error code if failed
         """
         try:
             update_data = {
@@ -374,6 +687,9 @@ class SupabaseStorage:
             if error_message:
                 update_data["error_message"] = error_message
 
+            if error_code:
+                update_data["error_code"] = error_code
+
             if stats:
                 update_data["stats"] = stats
 
@@ -383,6 +699,80 @@ class SupabaseStorage:
         except Exception as e:
             logger.error(f"Error updating mission run {run_id}: {e}")
 
+    def heartbeat_mission_runs(self, run_ids: list[str]):
+        """Refresh the heartbeat of runs this process is executing."""
+        try:
+            self.client.table("mission_runs").update(
+                {"heartbeat_at": datetime.now(timezone.utc).isoformat()}
+            ).in_("id", run_ids).in_("status", ["PENDING", "RUNNING"]).execute()
+        except Exception as e:
+            logger.warning(f"Error refreshing heartbeat of mission runs {run_ids}: {e}")
+
+    @staticmethod
+    def _expired_heartbeat(heartbeat_before: datetime) -> str:
+        """PostgREST ``or`` filter for runs whose heartbeat is older than a cutoff.
+
+        Runs created before heartbeats were recorded fall back on started_at.
+        """
+        cutoff = heartbeat_before.isoformat()
+        return f"heartbeat_at.lt.{cutoff},and(heartbeat_at.is.null,started_at.lt.{cutoff})"
+
+    def get_stale_runs(self, heartbeat_before: datetime) -> list[dict]:
+        """Get runs still PENDING/RUNNING whose heartbeat has expired.
+
+        Args:
+            heartbeat_before: Runs whose owner has not reported since are abandoned
+
+        Returns:
+            List of run records (id, mission_id, status, owner, heartbeat_at)
+        """
+        try:
+            result = (
+                self.client.table("mission_runs")
+                .select("id, mission_id, status, owner, heartbeat_at")
+                .in_("status", ["PENDING", "RUNNING"])
+                .or_(self._expired_heartbeat(heartbeat_before))
+                .execute()
+            )
+            return result.data or []
+
+        except Exception as e:
+            logger.error(f"Error fetching stale runs: {e}")
+            return []
+
+    def abandon_mission_run(self, run: dict, heartbeat_before: datetime) -> bool:
+        """Mark a stale run FAILED unless its owner has reported since it was read.
+
+        Args:
+            run: Run record from :meth:`get_stale_runs`
+            heartbeat_before: Cutoff the run was found stale with
+
+        Returns:
+            True if this caller marked the run abandoned
+        """
+        try:
+            result = (
+                self.client.table("mission_runs")
+                .update({
+                    "status": "FAILED",
+                    "completed_at": datetime.now(timezone.utc).isoformat(),
+                    "error_code": "ABANDONED",
+                    "error_message": (
+                        f"Run abandoned in {run['status']} "
+                        f"(owner {run.get('owner') or 'unknown'} stopped reporting)"
+                    ),
+                })
+                .eq("id", run["id"])
+                .in_("status", ["PENDING", "RUNNING"])
+                .or_(self._expired_heartbeat(heartbeat_before))
+                .execute()
+            )
+            return bool(result.data)
+
+        except Exception as e:
+            logger.error(f"Error abandoning mission run {run['id']}: {e}")
+            return False
+
     def get_latest_run(self, mission_id: str) -> Optional[dict]:
         """Get the latest run for a mission."""
         try:
@@ -436,6 +826,57 @@ class SupabaseStorage:
             logger.error(f"Error inserting mission results: {e}")
             return 0
 
+    def upsert_mission_results(self, results: list[dict]) -> int:
+        """Insert or update mission results on (run, keyword, source, region, window).
+
+        Args:
+            results: Result dicts as for :meth:`insert_mission_results`
+
+        Returns:
+            Number of results written
+        """
+        if not results:
+            return 0
+
+        try:
+            result = (
+                self.client.table("mission_results")
+                .upsert(
+                    results,
+                    on_conflict="mission_run_id,keyword_id,source_id,region,time_window",
+                )
+                .execute()
+            )
+            return len(result.data) if result.data else 0
+
+        except Exception as e:
+            logger.error(f"Error upserting mission results: {e}")
+            return 0
+
+    def delete_mission_results(self, run_id: str, min_rank: int) -> int:
+        """Delete a run's results ranked at or below ``min_rank``.
+
+        Args:
+            run_id: Mission run UUID
+            min_rank: Lowest rank position to delete (inclusive)
+
+        Returns:
+            Number of results deleted
+        """
+        try:
+            result = (
+                self.client.table("mission_results")
+                .delete()
+                .eq("mission_run_id", run_id)
+                .gte("rank_position", min_rank)
+                .execute()
+            )
+            return len(result.data) if result.data else 0
+
+        except Exception as e:
+            logger.error(f"Error deleting mission results for run {run_id}: {e}")
+            return 0
+
     def get_mission_results(
         self,
         run_id: str,
@@ -519,6 +960,52 @@ class SupabaseStorage:
 
         return keyword_id
 
+    def store_trend_data_batch(
+        self,
+        trend_data_list: list[TrendData],
+        granularity: str = "hour",
+    ) -> list[Optional[str]]:
+        """Store many TrendData objects with one keyword upsert and one timeseries upsert.
+
+        Args:
+            trend_data_list: TrendData objects with keyword and timeseries
+            granularity: Time granularity for timeseries
+
+        Returns:
+            Keyword ID per input item (None where storing failed), in input order
+        """
+        if not trend_data_list:
+            return []
+
+        keyword_ids = self.upsert_keywords([
+            {"keyword": t.keyword, "metadata": t.metadata} for t in trend_data_list
+        ])
+
+        ids: list[Optional[str]] = []
+        records: list[dict] = []
+        for trend_data in trend_data_list:
+            keyword_id = keyword_ids.get(trend_data.keyword.lower().strip())
+            source_id = self.get_source_id(trend_data.source)
+            if not source_id:
+                logger.error(f"Source not found: {trend_data.source}")
+                keyword_id = None
+
+            ids.append(keyword_id)
+            if keyword_id and trend_data.timeseries:
+                records.extend(trend_data.timeseries.to_records(
+                    keyword_id=keyword_id,
+                    source_id=source_id,
+                    region=trend_data.region,
+                    granularity=granularity,
+                ))
+
+        if records and self.settings.timeseries_buffer_enabled:
+            self.timeseries_buffer.add(records, self.client)
+        elif records:
+            self.upsert_timeseries_records(records)
+
+        return ids
+
     def store_mission_run_results(
         self,
         run_id: str,
@@ -535,24 +1022,40 @@ class SupabaseStorage:
         Returns:
             Number of results stored
         """
-        results = []
+        ranks = range(1, len(trend_data_list) + 1)
+        results = self.build_mission_results(run_id, trend_data_list, time_window, ranks)
+        return self.insert_mission_results([r for r in results if r])
 
-        for rank, trend_data in enumerate(trend_data_list, start=1):
-            # Store keyword and timeseries
-            keyword_id = self.store_trend_data(trend_data)
-            if not keyword_id:
-                continue
+    def build_mission_results(
+        self,
+        run_id: str,
+        trend_data_list: list[TrendData],
+        time_window: str,
+        ranks: Iterable[int],
+    ) -> list[Optional[dict]]:
+        """Store results' keywords and timeseries in bulk and build their mission_results rows.
 
-            # Get source ID
-            source_id = self.get_source_id(trend_data.source)
-            if not source_id:
+        Args:
+            run_id: Mission run UUID
+            trend_data_list: TrendData for the results
+            time_window: Time window for analysis
+            ranks: Rank position per result
+
+        Returns:
+            Result record per input item (None where the keyword could not be stored)
+        """
+        keyword_ids = self.store_trend_data_batch(trend_data_list)
+
+        rows: list[Optional[dict]] = []
+        for trend_data, keyword_id, rank in zip(trend_data_list, keyword_ids, ranks):
+            if not keyword_id:
+                rows.append(None)
                 continue
 
-            # Build result record
-            result = {
+            rows.append({
                 "mission_run_id": run_id,
                 "keyword_id": keyword_id,
-                "source_id": source_id,
+                "source_id": self.get_source_id(trend_data.source),
                 "region": trend_data.region,
                 "time_window": time_window,
                 "current_interest": trend_data.current_interest,
@@ -563,7 +1066,26 @@ class SupabaseStorage:
                 "metrics": {
                     "rising_queries": trend_data.rising_queries[:5] if trend_data.rising_queries else [],
                 },
-            }
-            results.append(result)
+            })
+
+        return rows
+
+    def build_mission_result(
+        self,
+        run_id: str,
+        trend_data: TrendData,
+        time_window: str,
+        rank: int,
+    ) -> Optional[dict]:
+        """Store one result's keyword and timeseries and build its mission_results row.
 
-        return self.insert_mission_results(results)
+        Args:
+            run_id: Mission run UUID
+            trend_data: TrendData for the result
+            time_window: Time window for analysis
+            rank: Rank position to record
+
+        Returns:
+            Result record, or None if the keyword could not be stored
+        """
+        return self.build_mission_results(run_id, [trend_data], time_window, [rank])[0]
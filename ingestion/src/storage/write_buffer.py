@@ -0,0 +1,332 @@
+"""Write-behind buffer that batches keyword_timeseries upserts across keywords."""
+
+import atexit
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Optional
+
+from supabase import Client
+
+from ..config import get_settings
+from ..utils.versions import get_resource_versions
+
+logger = logging.getLogger(__name__)
+
+# Unique key of keyword_timeseries (the upsert's on_conflict target)
+TIMESERIES_CONFLICT_KEY = ("keyword_id", "source_id", "region", "granularity", "ts")
+
+# Error codes a retry cannot fix: SQLSTATE data exceptions (22), constraint
+# violations (23) and undefined objects (42), and PostgREST request (PGRST1xx)
+# and schema (PGRST2xx) errors
+PERMANENT_ERROR_CODES = ("22", "23", "42", "PGRST1", "PGRST2")
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Whether a failed write would fail again with the same rows."""
+    code = getattr(error, "code", None)
+    return isinstance(code, str) and code.startswith(PERMANENT_ERROR_CODES)
+
+
+class TimeseriesWriteBuffer:
+    """Collect keyword_timeseries rows and write them in large upserts.
+
+    Rows from any number of keywords, sources and regions are merged on the
+    table's conflict key (a later row for the same point replaces the earlier
+    one, as the upsert would have). The buffer is flushed when ``max_rows``
+    rows are pending, when the oldest pending row is ``max_age`` seconds old
+    (checked by a background thread), and at process exit, so the number of
+    requests depends on the row volume rather than on how many keywords
+    were written.
+
+    Chunks that fail to write for a transient reason (network, timeouts,
+    server errors) are put back (unless newer rows for the same points arrived
+    meanwhile) and retried with exponential backoff, up to ``max_backoff``
+    seconds between attempts. Rows the database rejects (constraint
+    violations, bad values) would fail every retry: the chunk is split until
+    they are isolated, and they are logged and dropped while the rest is
+    written. At most ``max_pending`` rows are held; beyond that the oldest are
+    dropped with an error so an unreachable database cannot exhaust memory.
+
+    Callers that need to know when their rows have landed (summaries are only
+    updated by the write) pass ``on_written`` to :meth:`add`.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = 5000,
+        max_age: float = 5.0,
+        max_pending: Optional[int] = None,
+        max_backoff: float = 60.0,
+        client: Optional[Client] = None,
+    ):
+        """Initialize the buffer.
+
+        Args:
+            max_rows: Pending rows that trigger a flush (also the rows per request)
+            max_age: Max seconds a row waits before being written
+            max_pending: Max rows held while writes fail (default: 10x max_rows)
+            max_backoff: Max seconds between retries while writes keep failing
+            client: Supabase client to write with (can also be passed to add())
+        """
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.max_pending = max_pending or max_rows * 10
+        self.max_backoff = max_backoff
+        self._client = client
+        self._rows: dict[tuple, dict] = {}
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Keeps flushes (and their row order) sequential
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0  # Consecutive flushes with a transient failure
+        self._retry_at: Optional[float] = None
+        self._callbacks: list[tuple[frozenset, Callable[[], None]]] = []
+
+        self.rows_added = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.rows_rejected = 0
+        self.flushes = 0
+
+    @staticmethod
+    def key(row: dict) -> tuple:
+        """Conflict key of a keyword_timeseries row."""
+        return tuple(row[column] for column in TIMESERIES_CONFLICT_KEY)
+
+    # -------------------------------------------------------------------------
+    # Buffering
+    # -------------------------------------------------------------------------
+
+    def add(
+        self,
+        records: list[dict],
+        client: Optional[Client] = None,
+        on_written: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """Queue rows for writing.
+
+        Args:
+            records: Row dicts as built by TrendSeries.to_records
+            client: Supabase client to flush with (the last one given is kept)
+            on_written: Called from the flushing thread once none of these rows
+                is pending any more (written, or rejected/dropped with an error).
+                A later add of the same points delays it until those land too.
+
+        Returns:
+            Number of rows queued
+        """
+        if not records:
+            return 0
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Timeseries buffer is closed")
+            if client is not None:
+                self._client = client
+            keys = [self.key(row) for row in records]
+            for key, row in zip(keys, records):
+                # Re-inserting moves the point to the end, so eviction drops the oldest
+                self._rows.pop(key, None)
+                self._rows[key] = row
+            if on_written is not None:
+                self._callbacks.append((frozenset(keys), on_written))
+            self.rows_added += len(records)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            # While backing off, the background thread retries when it is time
+            full = len(self._rows) >= self.max_rows and not self._backing_off()
+            self._ensure_thread()
+
+        if full:
+            self.flush()
+        return len(records)
+
+    @property
+    def pending(self) -> int:
+        """Rows waiting to be written."""
+        return len(self._rows)
+
+    def stats(self) -> dict:
+        """Buffer counters."""
+        return {
+            "pending": self.pending,
+            "rows_added": self.rows_added,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "rows_rejected": self.rows_rejected,
+            "flushes": self.flushes,
+        }
+
+    # -------------------------------------------------------------------------
+    # Flushing
+    # -------------------------------------------------------------------------
+
+    def flush(self, client: Optional[Client] = None) -> int:
+        """Write every pending row now.
+
+        Args:
+            client: Supabase client (default: the last one seen)
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows = self._rows
+                self._rows = {}
+                self._oldest = None
+                client = client or self._client
+
+            if not rows:
+                return 0
+            if client is None:
+                logger.error(f"No Supabase client to flush {len(rows)} timeseries rows with")
+                self._requeue(rows)
+                return 0
+
+            items = list(rows.items())
+            written = 0
+            failed = False
+            for i in range(0, len(items), self.max_rows):
+                chunk = items[i : i + self.max_rows]
+                try:
+                    written += self._write(client, chunk)
+                except Exception as e:
+                    logger.error(f"Error writing {len(chunk)} buffered timeseries rows: {e}")
+                    self._requeue(dict(chunk))
+                    failed = True
+
+            self._schedule_retry(failed)
+            self.rows_written += written
+            self.flushes += 1
+            if written:
+                get_resource_versions().bump("trends")
+            logger.debug(f"Flushed {written} timeseries rows")
+            self._notify_written()
+            return written
+
+    def _notify_written(self):
+        """Run the ``on_written`` callbacks of adds with no rows left pending."""
+        with self._lock:
+            done, waiting = [], []
+            for keys, callback in self._callbacks:
+                pending = not self._rows.keys().isdisjoint(keys)
+                (waiting if pending else done).append((keys, callback))
+            self._callbacks = waiting
+
+        for _, callback in done:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Timeseries on_written callback failed: {e}")
+
+    def _write(self, client: Client, chunk: list[tuple[tuple, dict]]) -> int:
+        """Upsert a chunk, dropping rows the database rejects.
+
+        One bad row fails the whole upsert, so on a permanent error the chunk
+        is split in halves until the bad rows are isolated. Transient errors
+        are raised for the caller to requeue the chunk.
+
+        Returns:
+            Number of rows written
+        """
+        try:
+            client.table("keyword_timeseries").upsert(
+                [row for _, row in chunk],
+                on_conflict=",".join(TIMESERIES_CONFLICT_KEY),
+                returning="minimal",
+            ).execute()
+            return len(chunk)
+        except Exception as e:
+            if not is_permanent_error(e):
+                raise
+            if len(chunk) == 1:
+                self.rows_rejected += 1
+                logger.error(f"Dropping timeseries row rejected by the database {chunk[0][1]}: {e}")
+                return 0
+
+        middle = len(chunk) // 2
+        return self._write(client, chunk[:middle]) + self._write(client, chunk[middle:])
+
+    def _schedule_retry(self, failed: bool):
+        """Back off exponentially while flushes keep failing, reset on success."""
+        with self._lock:
+            if not failed:
+                self._failures = 0
+                self._retry_at = None
+                return
+            self._failures += 1
+            delay = min(self.max_backoff, self.max_age * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + delay
+        logger.warning(f"Retrying buffered timeseries writes in {delay:.0f}s")
+
+    def _backing_off(self) -> bool:
+        """Whether automatic flushes wait for a retry (caller holds the lock)."""
+        return self._retry_at is not None and time.monotonic() < self._retry_at
+
+    def _requeue(self, rows: dict[tuple, dict]):
+        """Put rows back after a failed write, keeping any newer values."""
+        with self._lock:
+            merged = dict(rows)
+            merged.update(self._rows)
+            overflow = len(merged) - self.max_pending
+            if overflow > 0:
+                for key in list(merged)[:overflow]:
+                    del merged[key]
+                self.rows_dropped += overflow
+                logger.error(f"Timeseries buffer full; dropped {overflow} unwritten rows")
+            self._rows = merged
+            if merged and self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def _ensure_thread(self):
+        """Start the age-based flusher (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._flush_loop, name="timeseries-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _flush_loop(self):
+        """Flush whenever the oldest pending row reaches max_age (or a retry is due)."""
+        while not self._closed:
+            with self._lock:
+                oldest = self._oldest
+                retry_at = self._retry_at
+            now = time.monotonic()
+            wait = self.max_age if oldest is None else self.max_age - (now - oldest)
+            if oldest is not None and retry_at is not None:
+                wait = max(wait, retry_at - now)
+            if wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Background timeseries flush failed: {e}")
+
+    def close(self):
+        """Stop the background flusher and write everything still pending."""
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.max_age + 1)
+        self.flush()
+
+
+@lru_cache()
+def get_timeseries_buffer() -> TimeseriesWriteBuffer:
+    """Get the process-wide timeseries write buffer (flushed and closed at exit)."""
+    settings = get_settings()
+    buffer = TimeseriesWriteBuffer(
+        max_rows=settings.timeseries_buffer_rows,
+        max_age=settings.timeseries_buffer_seconds,
+    )
+    atexit.register(buffer.close)
+    return buffer
@@ -1,5 +1,16 @@
 """Utility functions for the ingestion service."""
 
 from .logging import setup_logging
+from .lru import LRUCache
+from .singleflight import SingleFlight
+from .sqlite import LocalSQLite
+from .versions import ResourceVersions, get_resource_versions
 
-__all__ = ["setup_logging"]
+__all__ = [
+    "setup_logging",
+    "LRUCache",
+    "SingleFlight",
+    "LocalSQLite",
+    "ResourceVersions",
+    "get_resource_versions",
+]
@@ -0,0 +1,143 @@
+"""Minimal cron expression parsing for mission schedules."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# Nicknames accepted in missions.schedule_cron
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+
+# (min, max) per field: minute, hour, day of month, month, day of week
+_BOUNDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(spec: str, low: int, high: int) -> set[int]:
+    """Expand one cron field (``*``, ``*/n``, ``a-b``, ``a-b/n``, lists) into values."""
+    values: set[int] = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {step_text}")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field '{spec}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A five-field cron expression (minute hour day-of-month month day-of-week).
+
+    Supports ``*``, ranges, steps, lists and the ``@hourly``-style aliases.
+    Day of week 7 is accepted as Sunday. As in cron, when both day fields are
+    restricted a day matches if either matches. All times are UTC.
+    """
+
+    def __init__(self, expression: str):
+        """Parse a cron expression.
+
+        Args:
+            expression: Cron expression or alias
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        self.expression = expression.strip()
+        fields = ALIASES.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Expected 5 cron fields, got {len(fields)}: '{expression}'")
+
+        self.minutes = _parse_field(fields[0], *_BOUNDS[0])
+        self.hours = _parse_field(fields[1], *_BOUNDS[1])
+        self.days = _parse_field(fields[2], *_BOUNDS[2])
+        self.months = _parse_field(fields[3], *_BOUNDS[3])
+        self.weekdays = {day % 7 for day in _parse_field(fields[4], *_BOUNDS[4])}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """Apply cron's day-of-month / day-of-week rule."""
+        in_days = moment.day in self.days
+        # Python: Monday=0; cron: Sunday=0
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Get the first matching minute strictly after ``moment``.
+
+        Args:
+            moment: Reference time (naive values are taken as UTC)
+
+        Returns:
+            Next run time (UTC)
+        """
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        candidate = moment.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        candidate += timedelta(minutes=1)
+
+        # Skip whole months/days/hours at a time; bounded to guard against impossible dates
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+
+def next_run_time(
+    expression: Optional[str],
+    after: datetime,
+    default_interval_minutes: int,
+) -> datetime:
+    """Get the next run time for a mission schedule.
+
+    Args:
+        expression: missions.schedule_cron (None/empty uses the default interval)
+        after: Reference time
+        default_interval_minutes: Interval for unscheduled missions
+
+    Returns:
+        Next run time (UTC)
+    """
+    if expression:
+        return CronSchedule(expression).next_after(after)
+    if after.tzinfo is None:
+        after = after.replace(tzinfo=timezone.utc)
+    return after + timedelta(minutes=default_interval_minutes)
@@ -0,0 +1,96 @@
+"""JSON encoding and body compression for API responses."""
+
+import gzip
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from pydantic import BaseModel
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install "hypertrending-ingestion[brotli]"
+    brotli = None
+
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not encode natively (as FastAPI's jsonable_encoder would)."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON.
+
+    Handles dicts, lists, str/int/float/bool/None, datetimes, UUIDs and
+    NumPy arrays natively; Decimals, pydantic models, sets and bytes are
+    converted first.
+    """
+    return orjson.dumps(content, default=_default, option=JSON_OPTIONS)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Content encodings this process can produce, preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``"gzip, deflate, br;q=0.9"``
+
+    Returns:
+        "br", "gzip" or None (send uncompressed)
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available_encodings():
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 5, brotli_quality: int = 4) -> bytes:
+    """Compress a response body.
+
+    Args:
+        body: Raw bytes
+        encoding: "br" or "gzip"
+        gzip_level: zlib level (1-9)
+        brotli_quality: Brotli quality (0-11; 4-5 is near gzip's speed)
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == "br":
+        if brotli is None:
+            raise RuntimeError("Brotli is not installed (pip install brotli)")
+        return brotli.compress(body, quality=brotli_quality)
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic for identical bodies
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
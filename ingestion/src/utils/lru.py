@@ -0,0 +1,84 @@
+"""Thread-safe, size-bounded LRU mapping."""
+
+import threading
+from collections import OrderedDict
+from typing import Container, Generic, Hashable, Iterable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping that evicts the least recently used entry beyond ``max_size``.
+
+    Unlike ``functools.lru_cache`` it holds explicit key/value pairs, so
+    callers can fill it in bulk and invalidate single keys.
+    """
+
+    def __init__(self, max_size: int):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def get(self, key: K) -> Optional[V]:
+        """Get a value and mark it most recently used."""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: K, value: V):
+        """Insert or replace a value, evicting the LRU entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def put_many(self, items: Iterable[tuple[K, V]]):
+        """Insert many values (later items count as more recently used)."""
+        for key, value in items:
+            self.put(key, value)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove a key, returning its value if present."""
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def pop_values(self, values: Container[V]) -> int:
+        """Remove every key whose value is in ``values``.
+
+        Scans the whole cache, so it is meant for rare invalidations.
+
+        Returns:
+            Number of keys removed
+        """
+        with self._lock:
+            keys = [key for key, value in self._data.items() if value in values]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,73 @@
+"""Coalescing of concurrent identical calls."""
+
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running block and receive the leader's result, or have
+    the leader's exception re-raised. Once the call finishes the key is
+    forgotten, so later calls run again. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn`` once per key across concurrent callers.
+
+        Args:
+            key: Identity of the call (e.g., normalized keyword and region)
+            fn: Function to run if no identical call is in flight
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            The result of the leader's call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                call.followers += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
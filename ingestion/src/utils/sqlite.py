@@ -0,0 +1,54 @@
+"""Helpers for small SQLite files shared between threads and processes."""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class LocalSQLite:
+    """Per-thread SQLite connections to one database file.
+
+    sqlite3 connections must not be shared across threads, so each thread
+    lazily opens its own. Connections run in autocommit mode with WAL
+    journaling; use :meth:`transaction` for read-modify-write sequences that
+    must be atomic across processes.
+    """
+
+    def __init__(self, path: str, schema: str = "", timeout: float = 30.0):
+        """Initialize the database handle.
+
+        Args:
+            path: Database file (parent directories are created on first use)
+            schema: SQL script run once per connection (use IF NOT EXISTS)
+            timeout: Seconds to wait for another process's lock
+        """
+        self.path = path
+        self.schema = schema
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if self.schema:
+                conn.executescript(self.schema)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block under ``BEGIN IMMEDIATE``, committing or rolling back."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -0,0 +1,142 @@
+"""Host-wide version stamps for cacheable API resources."""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from ..config import get_settings
+from .sqlite import LocalSQLite
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceVersions:
+    """Version counter per resource name ("trends", "markets", ...), shared via SQLite.
+
+    Write paths :meth:`bump` the resources they change and read endpoints
+    derive their ETag from the current versions, so a poll whose ETag still
+    matches can be answered with 304 without querying Supabase. The state
+    lives in a SQLite file so API workers, mission runners and the CLI on one
+    host all see each other's bumps.
+
+    Versions are millisecond timestamps (or the previous version + 1 if
+    that is larger), so they never repeat even if the file is deleted. Writers
+    on other hosts cannot bump the file: resources whose changes can be read
+    from the database are :meth:`track`-ed, so their ETag also follows that
+    shared position; for the rest ``revalidate_seconds`` bounds how long a
+    client can be served 304s for data those writers changed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS resource_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, revalidate_seconds: int = 300):
+        """Initialize the version store.
+
+        Args:
+            path: SQLite database file
+            revalidate_seconds: Max age of an ETag before it changes regardless
+                of bumps (0 disables)
+        """
+        self.path = path
+        self.revalidate_seconds = revalidate_seconds
+        self._db = LocalSQLite(path, self.SCHEMA)
+        self._tracked: dict[str, tuple[Callable[[], Any], float]] = {}
+        self._positions: dict[str, tuple[float, str]] = {}  # name -> (read at, token)
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> int:
+        """Current version of a resource (0 if never bumped)."""
+        row = self._db.connection().execute(
+            "SELECT version FROM resource_versions WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, *names: str):
+        """Mark resources as changed."""
+        now_ms = int(time.time() * 1000)
+        with self._db.transaction() as conn:
+            for name in names:
+                conn.execute(
+                    "INSERT INTO resource_versions (name, version) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET "
+                    "version = MAX(excluded.version, resource_versions.version + 1)",
+                    (name, now_ms),
+                )
+
+    def track(self, name: str, read: Callable[[], Any], max_age: float = 2.0):
+        """Also version a resource by a position every host's writes move.
+
+        Args:
+            name: Resource name
+            read: Returns a value that changes whenever the resource changes,
+                wherever it was written (e.g. the newest row's key)
+            max_age: Seconds a read position is reused by this process
+        """
+        with self._lock:
+            self._tracked[name] = (read, max_age)
+            self._positions.pop(name, None)
+
+    def position(self, name: str) -> str:
+        """Short token for a tracked resource's shared position ("" if untracked).
+
+        A failed read also yields "", so the ETag changes and clients get a
+        full response rather than a stale 304.
+        """
+        with self._lock:
+            tracked = self._tracked.get(name)
+            cached = self._positions.get(name)
+        if tracked is None:
+            return ""
+        read, max_age = tracked
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < max_age:
+            return cached[1]
+
+        try:
+            token = format(zlib.crc32(repr(read()).encode()), "08x")
+        except Exception as e:
+            logger.warning(f"Could not read the shared position of {name}: {e}")
+            token = ""
+        with self._lock:
+            self._positions[name] = (now, token)
+        return token
+
+    def etag(self, *names: str) -> str:
+        """Weak ETag for a response built from the given resources."""
+        parts = []
+        for name in names:
+            position = self.position(name)
+            parts.append(f"{name}.{self.get(name)}" + (f".{position}" if position else ""))
+        if self.revalidate_seconds > 0:
+            parts.append(str(int(time.time() // self.revalidate_seconds)))
+        return f'W/"{"-".join(parts)}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+@lru_cache()
+def get_resource_versions() -> ResourceVersions:
+    """Get the host-wide resource version store."""
+    settings = get_settings()
+    path = settings.api_versions_path or os.path.join(
+        tempfile.gettempdir(), "hypertrending-versions.sqlite"
+    )
+    return ResourceVersions(path, revalidate_seconds=settings.api_cache_revalidate_seconds)
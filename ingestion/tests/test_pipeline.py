@@ -0,0 +1,131 @@
+"""Tests for the streaming mission pipeline."""
+
+import asyncio
+from dataclasses import dataclass, field
+
+import pytest
+
+from src.fetchers import TrendData
+from src.runners.pipeline import MissionPipeline
+
+
+@dataclass
+class FakeConfig:
+    regions: list[str]
+    max_results_per_region: int = 3
+    fetch_timeseries: bool = True
+    fetch_related: bool = True
+    time_windows: list[str] = field(default_factory=lambda: ["now 7-d"])
+
+
+@dataclass
+class FakeStats:
+    keywords_scanned: int = 0
+    keywords_matched: int = 0
+    regions_scanned: int = 0
+    api_calls_made: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class FakeFetcher:
+    """Answers every call after yielding to the event loop."""
+
+    def __init__(self, source: str, failing_regions: frozenset = frozenset()):
+        self.source = source
+        self.failing_regions = failing_regions
+
+    async def fetch_trending(self, region: str, limit: int) -> list[TrendData]:
+        await asyncio.sleep(0)
+        if region in self.failing_regions:
+            raise RuntimeError("upstream error")
+        return [
+            TrendData(keyword=f"{region}-{i}", region=region, source=self.source, trend_score=i)
+            for i in range(limit)
+        ]
+
+    async def fetch_interest_over_time(self, keywords, region, timeframe):
+        await asyncio.sleep(0)
+        return {}
+
+    async def fetch_related_queries(self, keyword, region):
+        await asyncio.sleep(0)
+        return [], []
+
+
+class FakeStorage:
+    """Keeps mission result rows in memory."""
+
+    def __init__(self):
+        self.rows: dict[str, dict] = {}
+
+    def build_mission_results(self, run_id, trend_data_list, time_window, ranks):
+        return [
+            {"keyword": t.keyword, "trend_score": t.trend_score, "rank_position": rank}
+            for t, rank in zip(trend_data_list, ranks)
+        ]
+
+    def upsert_mission_results(self, rows):
+        for row in rows:
+            self.rows[row["keyword"]] = row
+        return len(rows)
+
+    def delete_mission_results(self, run_id, min_rank):
+        self.rows = {k: r for k, r in self.rows.items() if r["rank_position"] < min_rank}
+
+
+def run_pipeline(regions, queue_size, concurrency, sources=("GOOGLE_TRENDS",), **fetcher_args):
+    storage = FakeStorage()
+    stats = FakeStats()
+    pipeline = MissionPipeline(
+        storage=storage,
+        fetchers={source: FakeFetcher(source, **fetcher_args) for source in sources},
+        config=FakeConfig(regions=regions),
+        stats=stats,
+        run_id="run",
+        time_window="now 7-d",
+        filter_results=lambda trending, config: trending,
+        concurrency={source: concurrency for source in sources},
+        queue_size=queue_size,
+    )
+
+    async def main():
+        # A deadlocked pipeline never returns
+        return await asyncio.wait_for(pipeline.run(), timeout=10)
+
+    return asyncio.run(main()), storage, stats
+
+
+@pytest.mark.parametrize(
+    "queue_size, concurrency, region_count",
+    [(16, 4, 100), (4, 4, 20), (1, 4, 40), (1, 1, 10)],
+)
+def test_more_regions_than_queue_capacity(queue_size, concurrency, region_count):
+    regions = [f"R{i:03d}" for i in range(region_count)]
+
+    kept, storage, stats = run_pipeline(regions, queue_size, concurrency)
+
+    assert kept == region_count * 3
+    assert stats.regions_scanned == region_count
+    assert stats.keywords_matched == region_count * 3
+    assert sorted(r["rank_position"] for r in storage.rows.values()) == list(range(1, kept + 1))
+
+
+def test_several_sources_share_nothing_but_the_store():
+    regions = [f"R{i:03d}" for i in range(30)]
+
+    kept, _, stats = run_pipeline(regions, 2, 3, sources=("GOOGLE_TRENDS", "YOUTUBE"))
+
+    # Two sources compete for a top K sized for one
+    assert kept == 30 * 3
+    assert stats.regions_scanned == 60
+
+
+def test_region_errors_are_reported_in_job_order():
+    regions = [f"R{i:03d}" for i in range(20)]
+
+    _, _, stats = run_pipeline(regions, 1, 4, failing_regions=frozenset({"R015", "R003"}))
+
+    assert stats.errors == [
+        "GOOGLE_TRENDS/R003: upstream error",
+        "GOOGLE_TRENDS/R015: upstream error",
+    ]
@@ -0,0 +1,36 @@
+-- ============================================================================
+-- BULK KEYWORD UPSERT
+-- ============================================================================
+-- Upserts many keywords in one statement and returns their IDs, replacing the
+-- per-keyword SELECT + UPDATE/INSERT round trips made by the ingestion service.
+--
+-- Usage (PostgREST):
+--   POST /rpc/upsert_keywords
+--   {"items": [{"keyword": "AI agents", "language": "en", "metadata": {...}}, ...]}
+-- ============================================================================
+
+create or replace function public.upsert_keywords(items jsonb)
+returns table (id uuid, normalized_keyword text, language text)
+language sql
+volatile
+as $$
+    insert into public.keywords as k (keyword, language, category, metadata, last_seen_at)
+    select distinct on (lower(trim(i.keyword)), coalesce(i.language, 'en'))
+        i.keyword,
+        coalesce(i.language, 'en'),
+        i.category,
+        i.metadata,
+        now()
+    from jsonb_to_recordset(items) as i(keyword text, language text, category text, metadata jsonb)
+    where i.keyword is not null and char_length(trim(i.keyword)) > 0
+    -- One row per key: ON CONFLICT cannot update the same row twice in one statement
+    order by lower(trim(i.keyword)), coalesce(i.language, 'en')
+    on conflict on constraint keywords_normalized_unique do update
+    set last_seen_at = excluded.last_seen_at,
+        category = coalesce(excluded.category, k.category),
+        metadata = coalesce(excluded.metadata, k.metadata)
+    returning k.id, k.normalized_keyword, k.language;
+$$;
+
+comment on function public.upsert_keywords(jsonb) is
+    'Bulk insert-or-touch keywords; returns (id, normalized_keyword, language) for every item.';
@@ -0,0 +1,111 @@
+-- ============================================================================
+-- TRENDS PAGE
+-- ============================================================================
+-- Returns one page of tracked keywords with their sparkline, current interest
+-- and trend score, computed and sorted in a single set-based query. Replaces
+-- the per-keyword keyword_timeseries queries made by GET /api/trends.
+--
+-- Pagination is keyset based: pass the last row's (sort_value, keyword_id)
+-- as (p_after_value, p_after_id) to get the next page.
+--
+-- Usage (PostgREST):
+--   POST /rpc/get_trends_page
+--   {"p_region": "US", "p_sort": "trend_score", "p_limit": 50}
+-- ============================================================================
+
+create or replace function public.get_trends_page(
+    p_region text default null,            -- null = all regions
+    p_sort text default 'trend_score',     -- trend_score | current_interest | last_seen_at | data_points
+    p_ascending boolean default false,
+    p_limit integer default 50,
+    p_after_value numeric default null,
+    p_after_id uuid default null
+)
+returns table (
+    keyword_id uuid,
+    keyword text,
+    last_seen_at timestamptz,
+    sparkline smallint[],
+    data_points integer,
+    current_interest smallint,
+    trend_score numeric,
+    sort_value numeric
+)
+language sql
+stable
+as $$
+    with series as (
+        select
+            kt.keyword_id,
+            array_agg(kt.interest_value order by kt.ts) as sparkline
+        from public.keyword_timeseries kt
+        where p_region is null or kt.region = p_region
+        group by kt.keyword_id
+    ),
+    stats as (
+        select
+            s.keyword_id,
+            s.sparkline,
+            cardinality(s.sparkline) as data_points,
+            s.sparkline[cardinality(s.sparkline)] as current_interest,
+            -- Average of the first half of the series
+            coalesce(
+                (select sum(v) from unnest(s.sparkline[1:cardinality(s.sparkline) / 2]) as v),
+                0
+            )::numeric / greatest(1, cardinality(s.sparkline) / 2) as baseline
+        from series s
+    ),
+    scored as (
+        select
+            st.keyword_id,
+            k.keyword,
+            k.last_seen_at,
+            st.sparkline,
+            st.data_points,
+            st.current_interest,
+            round(
+                case
+                    when st.baseline > 0
+                        then (st.current_interest - st.baseline) / greatest(1, st.baseline) * 100
+                    else st.current_interest
+                end,
+                1
+            ) as trend_score
+        from stats st
+        join public.keywords k on k.id = st.keyword_id
+    ),
+    keyed as (
+        select
+            sc.*,
+            case p_sort
+                when 'current_interest' then sc.current_interest::numeric
+                -- Millisecond precision keeps the value exact through JSON doubles
+                when 'last_seen_at' then extract(epoch from date_trunc('milliseconds', sc.last_seen_at))::numeric
+                when 'data_points' then sc.data_points::numeric
+                else sc.trend_score
+            end as sort_value
+        from scored sc
+    )
+    select
+        keyword_id,
+        keyword,
+        last_seen_at,
+        sparkline,
+        data_points,
+        current_interest,
+        trend_score,
+        sort_value
+    from keyed
+    where p_after_id is null
+       or (not p_ascending and (sort_value, keyword_id) < (p_after_value, p_after_id))
+       or (p_ascending and (sort_value, keyword_id) > (p_after_value, p_after_id))
+    order by
+        case when p_ascending then sort_value end asc,
+        case when not p_ascending then sort_value end desc,
+        case when p_ascending then keyword_id end asc,
+        case when not p_ascending then keyword_id end desc
+    limit greatest(1, least(p_limit, 500));
+$$;
+
+comment on function public.get_trends_page(text, text, boolean, integer, numeric, uuid) is
+    'One keyset-paginated page of keywords with sparkline, current interest and trend score.';
@@ -0,0 +1,261 @@
+-- ============================================================================
+-- TREND SUMMARY READ MODEL
+-- ============================================================================
+-- One row per (keyword, source, region) with the latest interest value, the
+-- baseline, the trend score, a downsampled sparkline and the point count.
+-- Maintained by statement-level triggers on keyword_timeseries, so every
+-- writer (REST upserts, the write-behind buffer, COPY merges) keeps it
+-- current and only the keys touched by a statement are recomputed.
+--
+-- The summary covers the 7 days up to the key's latest point, at the
+-- granularity of that point. get_trends_page now reads from this table.
+-- ============================================================================
+
+create table if not exists public.keyword_trend_summary (
+    keyword_id          uuid not null references public.keywords (id) on delete cascade,
+    source_id           uuid not null references public.sources (id) on delete cascade,
+    region              text not null,
+    granularity         public.time_granularity not null,
+    latest_ts           timestamptz not null,
+    current_interest    smallint not null,
+    baseline            numeric not null,
+    trend_score         numeric not null,
+    sparkline           smallint[] not null,
+    data_points         integer not null,
+    updated_at          timestamptz not null default now(),
+    primary key (keyword_id, source_id, region)
+);
+
+create index if not exists idx_trend_summary_region_score
+    on public.keyword_trend_summary (region, trend_score desc, keyword_id desc);
+create index if not exists idx_trend_summary_score
+    on public.keyword_trend_summary (trend_score desc, keyword_id desc);
+
+alter table public.keyword_trend_summary enable row level security;
+
+create policy "Anyone can view trend summaries"
+    on public.keyword_trend_summary for select
+    using (true);
+
+-- ----------------------------------------------------------------------------
+-- Recompute one key
+-- ----------------------------------------------------------------------------
+
+create or replace function public.refresh_trend_summary(
+    p_keyword_id uuid,
+    p_source_id uuid,
+    p_region text,
+    p_window interval default interval '7 days',
+    p_sparkline_points integer default 168
+)
+returns void
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_latest_ts timestamptz;
+    v_granularity public.time_granularity;
+    v_values smallint[];
+    v_count integer;
+    v_half integer;
+    v_current smallint;
+    v_baseline numeric;
+    v_score numeric;
+    v_sparkline smallint[];
+begin
+    select kt.ts, kt.granularity
+    into v_latest_ts, v_granularity
+    from public.keyword_timeseries kt
+    where kt.keyword_id = p_keyword_id
+      and kt.source_id = p_source_id
+      and kt.region = p_region
+    order by kt.ts desc
+    limit 1;
+
+    if v_latest_ts is null then
+        delete from public.keyword_trend_summary
+        where keyword_id = p_keyword_id and source_id = p_source_id and region = p_region;
+        return;
+    end if;
+
+    select array_agg(kt.interest_value order by kt.ts)
+    into v_values
+    from public.keyword_timeseries kt
+    where kt.keyword_id = p_keyword_id
+      and kt.source_id = p_source_id
+      and kt.region = p_region
+      and kt.granularity = v_granularity
+      and kt.ts > v_latest_ts - p_window;
+
+    -- Same formula as the API: % change of the latest value vs. the first-half average
+    v_count := cardinality(v_values);
+    v_half := v_count / 2;
+    v_current := v_values[v_count];
+    v_baseline := coalesce((select sum(v) from unnest(v_values[1:v_half]) as v), 0)::numeric
+        / greatest(1, v_half);
+    v_score := round(
+        case
+            when v_baseline > 0 then (v_current - v_baseline) / greatest(1, v_baseline) * 100
+            else v_current
+        end,
+        1
+    );
+
+    -- Bucket-average long windows (e.g. minute data) down to the sparkline size
+    if v_count > p_sparkline_points then
+        select array_agg(bucket_value order by bucket)
+        into v_sparkline
+        from (
+            select b.bucket, round(avg(b.value))::smallint as bucket_value
+            from (
+                select ntile(p_sparkline_points) over (order by u.ord) as bucket, u.value
+                from unnest(v_values) with ordinality as u(value, ord)
+            ) b
+            group by b.bucket
+        ) buckets;
+    else
+        v_sparkline := v_values;
+    end if;
+
+    insert into public.keyword_trend_summary (
+        keyword_id, source_id, region, granularity, latest_ts, current_interest,
+        baseline, trend_score, sparkline, data_points, updated_at
+    )
+    values (
+        p_keyword_id, p_source_id, p_region, v_granularity, v_latest_ts, v_current,
+        round(v_baseline, 2), v_score, v_sparkline, v_count, now()
+    )
+    on conflict (keyword_id, source_id, region) do update
+    set granularity = excluded.granularity,
+        latest_ts = excluded.latest_ts,
+        current_interest = excluded.current_interest,
+        baseline = excluded.baseline,
+        trend_score = excluded.trend_score,
+        sparkline = excluded.sparkline,
+        data_points = excluded.data_points,
+        updated_at = excluded.updated_at;
+end;
+$$;
+
+comment on function public.refresh_trend_summary is
+    'Recompute the keyword_trend_summary row for one (keyword, source, region).';
+
+-- ----------------------------------------------------------------------------
+-- Triggers: recompute each key touched by a statement once
+-- ----------------------------------------------------------------------------
+
+create or replace function public.handle_timeseries_changed()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.refresh_trend_summary(k.keyword_id, k.source_id, k.region)
+    from (select distinct keyword_id, source_id, region from changed_rows) k;
+    return null;
+end;
+$$;
+
+-- Transition tables allow a single event per trigger, hence three triggers.
+-- INSERT ... ON CONFLICT DO UPDATE fires the insert and update ones.
+drop trigger if exists on_timeseries_inserted on public.keyword_timeseries;
+create trigger on_timeseries_inserted
+    after insert on public.keyword_timeseries
+    referencing new table as changed_rows
+    for each statement execute function public.handle_timeseries_changed();
+
+drop trigger if exists on_timeseries_updated on public.keyword_timeseries;
+create trigger on_timeseries_updated
+    after update on public.keyword_timeseries
+    referencing new table as changed_rows
+    for each statement execute function public.handle_timeseries_changed();
+
+drop trigger if exists on_timeseries_deleted on public.keyword_timeseries;
+create trigger on_timeseries_deleted
+    after delete on public.keyword_timeseries
+    referencing old table as changed_rows
+    for each statement execute function public.handle_timeseries_changed();
+
+-- Build summaries for existing data
+select public.refresh_trend_summary(k.keyword_id, k.source_id, k.region)
+from (select distinct keyword_id, source_id, region from public.keyword_timeseries) k;
+
+-- ----------------------------------------------------------------------------
+-- get_trends_page: indexed reads from the summary
+-- ----------------------------------------------------------------------------
+-- Same signature and columns as before. With a region filter each keyword's
+-- row for that region is used; without one, its most recently updated row.
+
+create or replace function public.get_trends_page(
+    p_region text default null,            -- null = all regions
+    p_sort text default 'trend_score',     -- trend_score | current_interest | last_seen_at | data_points
+    p_ascending boolean default false,
+    p_limit integer default 50,
+    p_after_value numeric default null,
+    p_after_id uuid default null
+)
+returns table (
+    keyword_id uuid,
+    keyword text,
+    last_seen_at timestamptz,
+    sparkline smallint[],
+    data_points integer,
+    current_interest smallint,
+    trend_score numeric,
+    sort_value numeric
+)
+language sql
+stable
+as $$
+    with summary as (
+        select distinct on (s.keyword_id)
+            s.keyword_id,
+            s.sparkline,
+            s.data_points,
+            s.current_interest,
+            s.trend_score
+        from public.keyword_trend_summary s
+        where p_region is null or s.region = p_region
+        order by s.keyword_id, s.latest_ts desc
+    ),
+    keyed as (
+        select
+            su.keyword_id,
+            k.keyword,
+            k.last_seen_at,
+            su.sparkline,
+            su.data_points,
+            su.current_interest,
+            su.trend_score,
+            case p_sort
+                when 'current_interest' then su.current_interest::numeric
+                -- Millisecond precision keeps the value exact through JSON doubles
+                when 'last_seen_at' then extract(epoch from date_trunc('milliseconds', k.last_seen_at))::numeric
+                when 'data_points' then su.data_points::numeric
+                else su.trend_score
+            end as sort_value
+        from summary su
+        join public.keywords k on k.id = su.keyword_id
+    )
+    select
+        keyword_id,
+        keyword,
+        last_seen_at,
+        sparkline,
+        data_points,
+        current_interest,
+        trend_score,
+        sort_value
+    from keyed
+    where p_after_id is null
+       or (not p_ascending and (sort_value, keyword_id) < (p_after_value, p_after_id))
+       or (p_ascending and (sort_value, keyword_id) > (p_after_value, p_after_id))
+    order by
+        case when p_ascending then sort_value end asc,
+        case when not p_ascending then sort_value end desc,
+        case when p_ascending then keyword_id end asc,
+        case when not p_ascending then keyword_id end desc
+    limit greatest(1, least(p_limit, 500));
+$$;
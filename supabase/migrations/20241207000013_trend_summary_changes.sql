@@ -0,0 +1,74 @@
+-- ============================================================================
+-- TREND SUMMARY CHANGE FEED
+-- ============================================================================
+-- Lets the API stream keyword_trend_summary changes to clients: one reader
+-- pages through the rows updated since its last position, whichever process
+-- wrote them (API refreshes, mission runs, COPY merges).
+--
+-- Rows written by one statement share updated_at, so the position is the
+-- full (updated_at, keyword_id, source_id, region) key. updated_at is the
+-- writing transaction's start time, so a row can commit after rows with a
+-- later updated_at; readers re-read a window behind their newest change.
+-- ============================================================================
+
+create index if not exists idx_trend_summary_updated
+    on public.keyword_trend_summary (updated_at, keyword_id, source_id, region);
+
+create or replace function public.get_trend_summary_changes(
+    p_after timestamptz default null,      -- from get_trend_summary_position() or the last row
+    p_after_keyword_id uuid default null,
+    p_after_source_id uuid default null,
+    p_after_region text default null,
+    p_limit integer default 500
+)
+returns table (
+    keyword_id uuid,
+    keyword text,
+    source_id uuid,
+    region text,
+    current_interest smallint,
+    trend_score numeric,
+    sparkline smallint[],
+    data_points integer,
+    latest_ts timestamptz,
+    updated_at timestamptz
+)
+language sql
+stable
+as $$
+    select
+        s.keyword_id,
+        k.keyword,
+        s.source_id,
+        s.region,
+        s.current_interest,
+        s.trend_score,
+        s.sparkline,
+        s.data_points,
+        s.latest_ts,
+        s.updated_at
+    from public.keyword_trend_summary s
+    join public.keywords k on k.id = s.keyword_id
+    where p_after is not null
+      and (s.updated_at, s.keyword_id, s.source_id, s.region)
+          > (p_after, p_after_keyword_id, p_after_source_id, p_after_region)
+    order by s.updated_at, s.keyword_id, s.source_id, s.region
+    limit greatest(1, least(p_limit, 1000));
+$$;
+
+-- Starting position for a new reader: the most recent change
+create or replace function public.get_trend_summary_position()
+returns table (
+    updated_at timestamptz,
+    keyword_id uuid,
+    source_id uuid,
+    region text
+)
+language sql
+stable
+as $$
+    select s.updated_at, s.keyword_id, s.source_id, s.region
+    from public.keyword_trend_summary s
+    order by s.updated_at desc, s.keyword_id desc, s.source_id desc, s.region desc
+    limit 1;
+$$;
@@ -0,0 +1,227 @@
+-- ============================================================================
+-- INDEXED TRENDS PAGE
+-- ============================================================================
+-- get_trends_page picked each keyword's row with DISTINCT ON over the whole
+-- summary and sorted on a computed sort_value, so every page scanned and
+-- sorted every row. The row it picks is now flagged when the summary
+-- changes:
+--
+--   latest_in_region   the keyword's most recently updated row in its region
+--   latest_overall     the keyword's most recently updated row in any region
+--
+-- and each page is one walk down a partial index on the flag, the sort
+-- column and keyword_id. Sorting by last_seen_at (a keywords column) still
+-- sorts the flagged rows.
+-- ============================================================================
+
+alter table public.keyword_trend_summary
+    add column if not exists latest_in_region boolean not null default false,
+    add column if not exists latest_overall boolean not null default false;
+
+-- ----------------------------------------------------------------------------
+-- Flags
+-- ----------------------------------------------------------------------------
+
+create or replace function public.mark_latest_trend_summary(p_keyword_id uuid)
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+    with ranked as (
+        select
+            s.source_id,
+            s.region,
+            row_number() over (
+                partition by s.region order by s.latest_ts desc, s.source_id desc
+            ) = 1 as latest_in_region,
+            row_number() over (
+                order by s.latest_ts desc, s.region desc, s.source_id desc
+            ) = 1 as latest_overall
+        from public.keyword_trend_summary s
+        where s.keyword_id = p_keyword_id
+    )
+    update public.keyword_trend_summary s
+    set latest_in_region = r.latest_in_region,
+        latest_overall = r.latest_overall
+    from ranked r
+    where s.keyword_id = p_keyword_id
+      and s.source_id = r.source_id
+      and s.region = r.region
+      and (s.latest_in_region, s.latest_overall)
+          is distinct from (r.latest_in_region, r.latest_overall);
+$$;
+
+comment on function public.mark_latest_trend_summary is
+    'Recompute the latest_in_region / latest_overall flags of one keyword''s summary rows.';
+
+create or replace function public.handle_trend_summary_changed()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    if tg_op = 'DELETE' then
+        perform public.mark_latest_trend_summary(old.keyword_id);
+    else
+        perform public.mark_latest_trend_summary(new.keyword_id);
+    end if;
+    return null;
+end;
+$$;
+
+-- Flag updates do not set latest_ts, so they do not fire this trigger again
+drop trigger if exists on_trend_summary_changed on public.keyword_trend_summary;
+create trigger on_trend_summary_changed
+    after insert or delete or update of latest_ts on public.keyword_trend_summary
+    for each row execute function public.handle_trend_summary_changed();
+
+-- Flag existing rows
+with ranked as (
+    select
+        s.keyword_id,
+        s.source_id,
+        s.region,
+        row_number() over (
+            partition by s.keyword_id, s.region order by s.latest_ts desc, s.source_id desc
+        ) = 1 as latest_in_region,
+        row_number() over (
+            partition by s.keyword_id order by s.latest_ts desc, s.region desc, s.source_id desc
+        ) = 1 as latest_overall
+    from public.keyword_trend_summary s
+)
+update public.keyword_trend_summary s
+set latest_in_region = r.latest_in_region,
+    latest_overall = r.latest_overall
+from ranked r
+where s.keyword_id = r.keyword_id
+  and s.source_id = r.source_id
+  and s.region = r.region;
+
+-- ----------------------------------------------------------------------------
+-- Indexes: one per sort column, for the region and all-regions pages
+-- ----------------------------------------------------------------------------
+
+drop index if exists public.idx_trend_summary_region_score;
+drop index if exists public.idx_trend_summary_score;
+
+create index if not exists idx_trend_summary_region_score
+    on public.keyword_trend_summary (region, trend_score desc, keyword_id desc)
+    where latest_in_region;
+create index if not exists idx_trend_summary_region_interest
+    on public.keyword_trend_summary (region, current_interest desc, keyword_id desc)
+    where latest_in_region;
+create index if not exists idx_trend_summary_region_points
+    on public.keyword_trend_summary (region, data_points desc, keyword_id desc)
+    where latest_in_region;
+
+create index if not exists idx_trend_summary_score
+    on public.keyword_trend_summary (trend_score desc, keyword_id desc)
+    where latest_overall;
+create index if not exists idx_trend_summary_interest
+    on public.keyword_trend_summary (current_interest desc, keyword_id desc)
+    where latest_overall;
+create index if not exists idx_trend_summary_points
+    on public.keyword_trend_summary (data_points desc, keyword_id desc)
+    where latest_overall;
+
+-- ----------------------------------------------------------------------------
+-- get_trends_page
+-- ----------------------------------------------------------------------------
+-- Same arguments and cursor values as before. The query is built for the
+-- requested sort so the planner sees the plain column (and the cursor cast
+-- to its type) and can use the matching index. Rows also carry the region,
+-- source and latest point they were read from, so clients can tell which
+-- live changes apply to them.
+
+drop function if exists public.get_trends_page(text, text, boolean, integer, numeric, uuid);
+
+create function public.get_trends_page(
+    p_region text default null,            -- null = all regions
+    p_sort text default 'trend_score',     -- trend_score | current_interest | last_seen_at | data_points
+    p_ascending boolean default false,
+    p_limit integer default 50,
+    p_after_value numeric default null,
+    p_after_id uuid default null
+)
+returns table (
+    keyword_id uuid,
+    keyword text,
+    last_seen_at timestamptz,
+    sparkline smallint[],
+    data_points integer,
+    current_interest smallint,
+    trend_score numeric,
+    sort_value numeric,
+    region text,
+    source_id uuid,
+    latest_ts timestamptz
+)
+language plpgsql
+stable
+as $$
+declare
+    v_sort_column text;
+    v_after_value text;
+    v_direction text := case when p_ascending then 'asc' else 'desc' end;
+    v_filter text;
+begin
+    case p_sort
+        when 'current_interest' then
+            v_sort_column := 's.current_interest';
+            v_after_value := '$3::smallint';
+        when 'data_points' then
+            v_sort_column := 's.data_points';
+            v_after_value := '$3::integer';
+        when 'last_seen_at' then
+            -- Millisecond precision keeps the value exact through JSON doubles
+            v_sort_column := 'extract(epoch from date_trunc(''milliseconds'', k.last_seen_at))::numeric';
+            v_after_value := '$3';
+        else
+            v_sort_column := 's.trend_score';
+            v_after_value := '$3';
+    end case;
+
+    if p_region is null then
+        v_filter := 's.latest_overall';
+    else
+        v_filter := 's.latest_in_region and s.region = $1';
+    end if;
+
+    if p_after_id is not null then
+        v_filter := v_filter || format(
+            ' and (%s, s.keyword_id) %s (%s, $4)',
+            v_sort_column,
+            case when p_ascending then '>' else '<' end,
+            v_after_value
+        );
+    end if;
+
+    return query execute format(
+        $sql$
+        select
+            s.keyword_id,
+            k.keyword,
+            k.last_seen_at,
+            s.sparkline,
+            s.data_points,
+            s.current_interest,
+            s.trend_score,
+            (%1$s)::numeric as sort_value,
+            s.region,
+            s.source_id,
+            s.latest_ts
+        from public.keyword_trend_summary s
+        join public.keywords k on k.id = s.keyword_id
+        where %2$s
+        order by %1$s %3$s, s.keyword_id %3$s
+        limit $2
+        $sql$,
+        v_sort_column,
+        v_filter,
+        v_direction
+    )
+    using p_region, greatest(1, least(p_limit, 500)), p_after_value, p_after_id;
+end;
+$$;
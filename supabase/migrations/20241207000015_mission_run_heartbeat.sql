@@ -0,0 +1,22 @@
+-- ============================================================================
+-- MISSION RUN HEARTBEATS
+-- ============================================================================
+-- Missions run in scheduler daemons, the CLI and the API, possibly on several
+-- hosts. Each PENDING/RUNNING run now records the process executing it and
+-- a heartbeat that process refreshes while the run is in progress, so a run
+-- is only recovered as abandoned once its heartbeat has expired, however long
+-- it has been running.
+-- ============================================================================
+
+alter table public.mission_runs
+    add column if not exists owner text,
+    add column if not exists heartbeat_at timestamptz;
+
+comment on column public.mission_runs.owner is
+    'Process executing the run (host:pid).';
+comment on column public.mission_runs.heartbeat_at is
+    'Last sign of life from the owner while the run is PENDING/RUNNING.';
+
+create index if not exists idx_mission_runs_heartbeat
+    on public.mission_runs (heartbeat_at)
+    where status in ('PENDING', 'RUNNING');